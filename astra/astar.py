@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+
+"""
+@file    astar.py
+@author  ASTra team
+@date    16/10/2026
+
+A* algorithm for shortest paths over a routing graph (See routingGraph.py)
+
+The heuristic of a vertex is the straight line distance between its end junction and the end junction
+of the target, multiplied by the heuristic scale of the graph (minimum weight per straight line unit).
+With length weights this scale is close to 1, with travel time weights it is close to 1 / the network max speed.
+This heuristic is admissible and consistent, so a vertex is final once popped from the heap.
+"""
+
+from array import array
+from heapq import heappush
+from heapq import heappop
+from math import hypot
+from dijkstra import INFINITY
+
+
+def AStar(graph, start, end, closed=None):
+    """
+    Find a shortest path from the start vertex index to the end vertex index, without entering the closed vertices.
+    The output is a pair (D, P) of arrays, with the same conventions as dijkstra.Dijkstra().
+    Only the distance of the end vertex and the predecessors along its path are final
+    """
+    verticesNumber = graph.getVerticesNumber()
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
+    xs = graph.xs
+    ys = graph.ys
+    scale = graph.heuristicScale
+    endX = xs[end]
+    endY = ys[end]
+
+    D = array('d', [INFINITY]) * verticesNumber
+    P = array('i', [-1]) * verticesNumber
+    settled = bytearray(verticesNumber)
+    D[start] = 0.0
+    heap = [(scale * hypot(xs[start] - endX, ys[start] - endY), start)]
+
+    while heap:
+        v = heappop(heap)[1]
+        if settled[v]:
+            continue
+        settled[v] = 1
+        if v == end:
+            break
+
+        distance = D[v]
+        for i in xrange(offsets[v], offsets[v + 1]):
+            w = targets[i]
+            if closed is not None and closed[w]:
+                continue
+            vwLength = distance + weights[i]
+            if vwLength < D[w]:
+                D[w] = vwLength
+                P[w] = v
+                heappush(heap, (vwLength + scale * hypot(xs[w] - endX, ys[w] - endY), w))
+
+    return (D, P)
+
+
+def shortestPath(graph, start, end, closed=None):
+    """
+    Find a single shortest path from the given start vertex index
+    to the given end vertex index (See idRegistry.py), avoiding the closed vertices.
+    The output is a list of the vertices index in order along
+    the shortest path. A ValueError is raised if no path exists.
+    """
+    D, P = AStar(graph, start, end, closed)
+    if D[end] == INFINITY:
+        raise ValueError("A*: no path from {} to {}".format(start, end))
+
+    return graph.getPath(P, start, end)
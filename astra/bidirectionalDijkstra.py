@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+
+"""
+@file    bidirectionalDijkstra.py
+@author  ASTra team
+@date    16/10/2026
+
+Bidirectional Dijkstra's algorithm for shortest paths over a routing graph (See routingGraph.py)
+
+A forward search from the start vertex over the graph and a backward search from the end vertex
+over the reverse graph are run alternately, the search with the smallest heap top being expanded first.
+Each time an arc reaches a vertex already labelled by the other search, the length of the path
+going through this arc is compared with the best path found so far (meeting vertex).
+
+Stopping criterion (meet in the middle):
+    The searches stop as soon as topForward + topBackward >= best, where topX is the smallest distance
+    of the X heap. Any path shorter than the best one would have to go through a vertex settled by neither search,
+    hence its length would be at least topForward + topBackward
+"""
+
+from array import array
+from heapq import heappush
+from heapq import heappop
+from dijkstra import INFINITY
+
+
+def BidirectionalDijkstra(graph, start, end, closed=None):
+    """
+    Find a shortest path from the start vertex index to the end vertex index, without entering the closed vertices
+    (the start vertex is left even if it is closed).
+    The output is a tuple (distance, meeting, PF, PB) where distance is the length of the shortest path
+    (INFINITY if the end vertex cannot be reached), meeting is a vertex of this path (-1 if there is no path),
+    PF the predecessors array of the forward search and PB the successors array of the backward search
+    """
+    reverseGraph = graph.getReverseGraph()
+    verticesNumber = graph.getVerticesNumber()
+
+    DF = array('d', [INFINITY]) * verticesNumber
+    DB = array('d', [INFINITY]) * verticesNumber
+    PF = array('i', [-1]) * verticesNumber
+    PB = array('i', [-1]) * verticesNumber
+    settledF = bytearray(verticesNumber)
+    settledB = bytearray(verticesNumber)
+    DF[start] = 0.0
+    DB[end] = 0.0
+    heapF = [(0.0, start)]
+    heapB = [(0.0, end)]
+
+    best = INFINITY
+    meeting = -1
+    if start == end:
+        best = 0.0
+        meeting = start
+
+    while heapF and heapB:
+        if heapF[0][0] + heapB[0][0] >= best:
+            break
+
+        # Expanding the search with the smallest heap top
+        if heapF[0][0] <= heapB[0][0]:
+            heap, D, P, settled, otherD, searchGraph = heapF, DF, PF, settledF, DB, graph
+        else:
+            heap, D, P, settled, otherD, searchGraph = heapB, DB, PB, settledB, DF, reverseGraph
+
+        distance, v = heappop(heap)
+        if settled[v]:
+            continue
+        settled[v] = 1
+
+        offsets = searchGraph.offsets
+        targets = searchGraph.targets
+        weights = searchGraph.weights
+        for i in xrange(offsets[v], offsets[v + 1]):
+            w = targets[i]
+            if closed is not None and closed[w] and w != start:
+                continue
+            vwLength = distance + weights[i]
+            if vwLength < D[w]:
+                D[w] = vwLength
+                P[w] = v
+                heappush(heap, (vwLength, w))
+            if otherD[w] != INFINITY and vwLength + otherD[w] < best and D[w] == vwLength:
+                best = vwLength + otherD[w]
+                meeting = w
+
+    return (best, meeting, PF, PB)
+
+
+def shortestPath(graph, start, end, closed=None):
+    """
+    Find a single shortest path from the given start vertex index
+    to the given end vertex index (See idRegistry.py), avoiding the closed vertices.
+    The output is a list of the vertices index in order along
+    the shortest path. A ValueError is raised if no path exists.
+    """
+    distance, meeting, PF, PB = BidirectionalDijkstra(graph, start, end, closed)
+    if distance == INFINITY or (closed is not None and closed[end] and start != end):
+        raise ValueError("Bidirectional Dijkstra: no path from {} to {}".format(start, end))
+
+    path = graph.getPath(PF, start, meeting)
+    v = meeting
+    while v != end:
+        v = PB[v]
+        path.append(v)
+    return path
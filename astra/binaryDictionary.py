@@ -0,0 +1,365 @@
+#!/usr/bin/env python
+
+"""
+@file    binaryDictionary.py
+@author  ASTra team
+@date    16/10/2026
+
+This file contains the binary format of the dictionaries cached in the dictionaries directory (See graph.py, trafficLights.py and landmarks.py).
+
+Binary dictionary file:
+    First line (text): formatMagic formatVersion byteOrder stringsNumber stringsSize typecode1:length1 ... typecodeN:lengthN
+    Followed by:
+        - The strings table: int32 offsets (stringsNumber + 1), then the strings bytes (stringsSize).
+          The strings are sorted (or made of sorted parts, See idRegistry.py), so that a string index is found by a binary search
+        - The N arrays (int32 indexes or CSR offsets, float64 lengths and coordinates, float32 landmarks distances)
+
+Loading:
+    The file is memory-mapped (when mmap is available) and the arrays are copied at once.
+    The strings and the dictionary values are only decoded when they are accessed (See MappedDictionary),
+    so importing a dictionary takes a few milliseconds whatever the network size.
+
+The network dictionaries (See graph.py) do not store any edge or junction ID: their rows and values are the dense
+edges and junctions index of the ID registry (See idRegistry.py), whose file holds the only copy of these ID.
+"""
+
+import sys
+import constants
+from abc import ABCMeta
+from abc import abstractmethod
+from array import array
+from bisect import bisect_left
+from bisect import bisect_right
+from collections import Mapping
+from sharedFunctions import getTemporaryDictionaryFile
+from sharedFunctions import commitDictionaryFile
+
+try:
+    import mmap
+except ImportError:
+    mmap = None
+
+
+"""
+============================================================================================================================================
+===                                                             FILE FORMAT                                                              ===
+============================================================================================================================================
+"""
+def exportDictionary(path, strings, arrays, settings=()):
+    """
+    Writes a sorted strings list and a list of arrays in a binary dictionary file.
+    The file is written in a temporary file first, then moved to its path with a manifest recording the generator settings (See sharedFunctions.py)
+    """
+    offsets = array('i', [0])
+    for string in strings:
+        offsets.append(offsets[-1] + len(string))
+
+    header = [constants.DICTIONARY_FORMAT_MAGIC, str(constants.DICTIONARY_FORMAT_VERSION), sys.byteorder, str(len(strings)), str(offsets[-1])]
+    for values in arrays:
+        header.append("{}:{}".format(values.typecode, len(values)))
+
+    dictionaryFile = open(getTemporaryDictionaryFile(path), 'wb')
+    dictionaryFile.write(constants.SEPARATOR.join(header))
+    dictionaryFile.write(constants.END_OF_LINE)
+    offsets.tofile(dictionaryFile)
+    dictionaryFile.write(''.join(strings))
+    for values in arrays:
+        values.tofile(dictionaryFile)
+    dictionaryFile.close()
+    commitDictionaryFile(path, constants.SUMO_NETWORK_FILE, settings)
+
+
+def readHeader(dictionaryFile):
+    """
+    Returns the header fields of a binary dictionary file, None if the file does not use the current format
+    """
+    header = dictionaryFile.readline()[0:-1].split(constants.SEPARATOR)
+    if len(header) < 5 or header[0] != constants.DICTIONARY_FORMAT_MAGIC or header[1] != str(constants.DICTIONARY_FORMAT_VERSION):
+        return None
+    return header
+
+
+def readArray(data, position, typecode, length, swap):
+    """
+    Returns an array read from the file data at the given position, and the position following it
+    """
+    values = array(typecode)
+    end = position + length * values.itemsize
+    values.fromstring(data[position:end])
+    if swap:
+        values.byteswap()
+    return values, end
+
+
+def importDictionary(path):
+    """
+    Reads a binary dictionary file. Returns its strings table and its arrays
+    """
+    dictionaryFile = open(path, 'rb')
+    header = readHeader(dictionaryFile)
+    if header is None:
+        dictionaryFile.close()
+        raise ValueError("{} is not a binary dictionary file (version {})".format(path, constants.DICTIONARY_FORMAT_VERSION))
+
+    position = dictionaryFile.tell()
+    if mmap is not None:
+        data = mmap.mmap(dictionaryFile.fileno(), 0, access=mmap.ACCESS_READ)
+    else:
+        dictionaryFile.seek(0)
+        data = dictionaryFile.read()
+    dictionaryFile.close()
+
+    swap = header[2] != sys.byteorder
+    stringsNumber = int(header[3])
+    stringsSize = int(header[4])
+    offsets, position = readArray(data, position, 'i', stringsNumber + 1, swap)
+    strings = StringsTable(data, position, offsets)
+    position += stringsSize
+
+    arrays = []
+    for field in header[5:]:
+        typecode, length = field.split(':')
+        values, position = readArray(data, position, typecode, int(length), swap)
+        arrays.append(values)
+
+    return strings, arrays
+
+
+
+"""
+============================================================================================================================================
+===                                                           LAZY DICTIONARIES                                                          ===
+============================================================================================================================================
+"""
+class StringsTable(object):
+    """
+    Sorted strings table, decoded on access
+    """
+    def __init__(self, data, position, offsets):
+        self.data = data
+        self.position = position
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.data[self.position + self.offsets[i]:self.position + self.offsets[i + 1]]
+
+    def index(self, string):
+        """
+        Returns the index of a string. A KeyError is raised if the string is not in the table
+        """
+        i = bisect_left(self, string)
+        if i == len(self) or self[i] != string:
+            raise KeyError(string)
+        return i
+
+    def getSlice(self, start, end):
+        """
+        Returns the table of the strings start to end - 1, sharing the data of the current table
+        """
+        return StringsTable(self.data, self.position, self.offsets[start:end + 1])
+
+
+def getStringsTable(strings):
+    """
+    Returns a sorted list of strings, and a dictionary as {Key=string, Value=index in this list}
+    """
+    strings = sorted(strings)
+    return strings, dict((string, i) for i, string in enumerate(strings))
+
+
+class MappedDictionary(Mapping):
+    """
+    Read only dictionary whose keys are the first rowsNumber strings of a table: the row of a key is its index in the table.
+    The value of a key is decoded (See decode) each time it is accessed
+    """
+    __metaclass__ = ABCMeta
+
+    def __init__(self, ids, rowsNumber):
+        self.ids = ids
+        self.rowsNumber = rowsNumber
+
+    def __len__(self):
+        return self.rowsNumber
+
+    def __iter__(self):
+        for row in xrange(self.rowsNumber):
+            yield self.getKey(row)
+
+    def __getitem__(self, key):
+        return self.decode(self.getRow(key))
+
+    def __contains__(self, key):
+        try:
+            self.getRow(key)
+        except KeyError:
+            return False
+        return True
+
+    def getKey(self, row):
+        return self.ids[row]
+
+    def getRow(self, key):
+        """
+        Returns the row of a key. A KeyError is raised if the key is not in the dictionary
+        """
+        row = self.ids.index(key)
+        if row >= self.rowsNumber:
+            raise KeyError(key)
+        return row
+
+    @abstractmethod
+    def decode(self, row):
+        """
+        Returns the value of a row
+        """
+
+
+class MappedGraph(MappedDictionary):
+    """
+    Graph (See graph.py (21) and (23)) over the edges of the ID registry (See idRegistry.py):
+    the successors of the edge index v are targets[offsets[v]:offsets[v + 1]]
+    """
+    def __init__(self, registry, offsets, targets, weights):
+        MappedDictionary.__init__(self, registry.edgeIds, len(offsets) - 1)
+        self.registry = registry
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+    def decode(self, row):
+        edgeIds = self.registry.edgeIds
+        return dict((edgeIds[self.targets[i]], self.weights[i]) for i in xrange(self.offsets[row], self.offsets[row + 1]))
+
+
+class MappedJunctions(MappedDictionary):
+    """
+    Junctions dictionary (See graph.py (19)) over the junctions of the ID registry (See idRegistry.py):
+    two CSR lists, the predecessors and the successors edges index of each junction index
+    """
+    def __init__(self, registry, predecessorsOffsets, predecessors, successorsOffsets, successors):
+        MappedDictionary.__init__(self, registry.junctionIds, len(predecessorsOffsets) - 1)
+        self.registry = registry
+        self.predecessorsOffsets = predecessorsOffsets
+        self.predecessors = predecessors
+        self.successorsOffsets = successorsOffsets
+        self.successors = successors
+
+    def decode(self, row):
+        edgeIds = self.registry.edgeIds
+        return [set(edgeIds[v] for v in self.getPredecessors(row)), set(edgeIds[v] for v in self.getSuccessors(row))]
+
+    def getPredecessors(self, junction):
+        """
+        Returns the edges index entering a junction index
+        """
+        return self.predecessors[self.predecessorsOffsets[junction]:self.predecessorsOffsets[junction + 1]]
+
+    def getSuccessors(self, junction):
+        """
+        Returns the edges index leaving a junction index
+        """
+        return self.successors[self.successorsOffsets[junction]:self.successorsOffsets[junction + 1]]
+
+
+class MappedEdges(MappedDictionary):
+    """
+    Edges dictionary (See graph.py (20)) over the edges of the ID registry (See idRegistry.py):
+    the from and to junctions index of each edge index
+    """
+    def __init__(self, registry, junctionsFrom, junctionsTo):
+        MappedDictionary.__init__(self, registry.edgeIds, len(junctionsFrom))
+        self.registry = registry
+        self.junctionsFrom = junctionsFrom
+        self.junctionsTo = junctionsTo
+
+    def decode(self, row):
+        return [self.registry.junctionIds[self.junctionsFrom[row]], self.registry.junctionIds[self.junctionsTo[row]]]
+
+
+class MappedStrings(MappedDictionary):
+    """
+    Dictionary whose keys and values are strings of the file strings table (See trafficLights.py (9)).
+    The keys are stored as their sorted indexes in this table
+    """
+    def __init__(self, strings, keys, values):
+        MappedDictionary.__init__(self, strings, len(keys))
+        self.keys_ = keys
+        self.stringValues = values
+
+    def getKey(self, row):
+        return self.ids[self.keys_[row]]
+
+    def getRow(self, key):
+        stringIndex = self.ids.index(key)
+        row = bisect_left(self.keys_, stringIndex)
+        if row == len(self.keys_) or self.keys_[row] != stringIndex:
+            raise KeyError(key)
+        return row
+
+    def decode(self, row):
+        return self.ids[self.stringValues[row]]
+
+
+class MappedCoordinates(MappedDictionary):
+    """
+    Coordinates dictionary (See graph.py (22) and (24)) over the junctions of the ID registry (See idRegistry.py):
+    the (x, y) coordinates of each junction index. This one is empty if no coordinates are stored
+    """
+    def __init__(self, registry, xs, ys):
+        MappedDictionary.__init__(self, registry.junctionIds, len(xs))
+        self.xs = xs
+        self.ys = ys
+
+    def decode(self, row):
+        return (self.xs[row], self.ys[row])
+
+
+class MappedEdgesAttributes(MappedDictionary):
+    """
+    Edges attributes dictionary (See graph.py (25)) over the edges of the ID registry (See idRegistry.py):
+    the (length, lanes number, speed limit, priority, function) of each edge index. The functions are indexes in the file strings table
+    """
+    def __init__(self, registry, functionsNames, lengths, lanesNumbers, speeds, priorities, functions):
+        MappedDictionary.__init__(self, registry.edgeIds, len(lengths))
+        self.functionsNames = functionsNames
+        self.lengths = lengths
+        self.lanesNumbers = lanesNumbers
+        self.speeds = speeds
+        self.priorities = priorities
+        self.functions = functions
+
+    def decode(self, row):
+        return (self.lengths[row], self.lanesNumbers[row], self.speeds[row], self.priorities[row], self.functionsNames[self.functions[row]])
+
+
+class MappedLanesLinks(MappedDictionary):
+    """
+    Lanes links dictionary (See graph.py (28)) over the edges of the ID registry (See idRegistry.py), whose keys are (edgeId, lane index):
+    the lanes of the edge index e are the rows lanesOffsets[e] to lanesOffsets[e + 1] - 1. The links of the lane row r are the
+    out lanes (edge index and lane index) and traffic light link indexes linksOffsets[r] to linksOffsets[r + 1] - 1
+    """
+    def __init__(self, registry, lanesOffsets, linksOffsets, outEdges, outLanes, linkIndexes):
+        MappedDictionary.__init__(self, registry.edgeIds, len(linksOffsets) - 1)
+        self.lanesOffsets = lanesOffsets
+        self.linksOffsets = linksOffsets
+        self.outEdges = outEdges
+        self.outLanes = outLanes
+        self.linkIndexes = linkIndexes
+
+    def getKey(self, row):
+        edgeIndex = bisect_right(self.lanesOffsets, row) - 1
+        return (self.ids[edgeIndex], row - self.lanesOffsets[edgeIndex])
+
+    def getRow(self, key):
+        edgeIndex = self.ids.index(key[0])
+        row = self.lanesOffsets[edgeIndex] + key[1]
+        if key[1] < 0 or row >= self.lanesOffsets[edgeIndex + 1]:
+            raise KeyError(key)
+        return row
+
+    def decode(self, row):
+        edgeIds = self.ids
+        return [(edgeIds[self.outEdges[i]] + '_' + str(self.outLanes[i]), self.linkIndexes[i]) for i in xrange(self.linksOffsets[row], self.linksOffsets[row + 1])]
@@ -123,6 +123,68 @@ in one of the previous messages
 IGNORED_VEHICLES = "^(MOC*)$"
 
 
+""" ===== ROUTING ===== """
+"""
+If True, Dijkstra routing requests are resolved by a contraction hierarchy query engine. The contraction hierarchy
+is built then exported in the dictionaries directory when starting ASTra, or when new map data are detected.
+This can take a few minutes on a large network and delays the start of the router thread. Disabled by default since
+the queries are only 1.6 times as fast as the Dijkstra ones on a grid of 3000 edges (2.9 ms instead of 4.7 ms),
+for a preprocessing of 40 seconds. Worth enabling on a large network, whose main roads give a deeper hierarchy
+"""
+CONTRACTION_HIERARCHY_ENABLED = False
+"""
+Number of vertices a witness search may settle before giving up (See contractionHierarchy.py). A higher limit finds more
+witnesses, so fewer shortcuts are added and the queries explore fewer arcs, but makes every contraction longer.
+Lower limits made the preprocessing longer on the grids tested since the extra shortcuts densify the remaining graph
+"""
+CH_WITNESS_SETTLED_LIMIT = 1000
+
+"""
+The A* heuristic scale is the smallest arc weight per straight line unit of the routing graph (See routingGraph.py).
+A warning is logged if this one is below this ratio of the median arc weight per straight line unit: the A* heuristic
+then underestimates most distances, so the A* routing requests explore nearly as many edges as the Dijkstra ones
+"""
+ASTAR_HEURISTIC_SCALE_WARNING_RATIO = 0.5
+
+"""
+Number of landmarks used by the ALT routing algorithm and the distance lower bounds.
+Two float32 distance tables per landmark are built then exported in the dictionaries directory (a binary dictionary, See binaryDictionary.py)
+"""
+LANDMARKS_NUMBER = 16
+
+"""
+Number of landmarks used by an ALT query: the ones giving the best lower bounds between its start and end edges.
+Each landmark used tightens the lower bounds, so fewer edges are explored, but makes every lower bound computation longer
+"""
+ALT_ACTIVE_LANDMARKS = 4
+
+"""
+Maximum number of routes kept by the router cache (least recently used routes are evicted first). 0 disables the cache.
+The cached routes going through an edge are dropped when this one is blocked
+"""
+ROUTE_CACHE_SIZE = 1024
+
+"""
+Number of Duarouter subprocesses which can be run simultaneously in order to process DUA routing requests,
+and maximum number of DUA routing requests waiting for a Duarouter worker
+"""
+DUAROUTER_WORKERS_NUMBER = 4
+DUAROUTER_QUEUE_SIZE = 64
+
+"""
+Travel time routing (TIM): edges speed (m/s) used until the first simulation step, minimum edges speed (m/s),
+and occupancy (%) from which an edge is considered as jammed, hence travelled at the minimum speed
+"""
+TRAVEL_TIME_DEFAULT_SPEED = 13.89
+TRAVEL_TIME_MIN_SPEED = 1.0
+TRAVEL_TIME_JAM_OCCUPANCY = 90.0
+
+"""
+Size (m) of the cells of the lanes spatial index, used to find the edge nearest to geographic coordinates (See spatialIndex.py)
+"""
+SPATIAL_INDEX_CELL_SIZE = 100.0
+
+
 """ ===== SIMULATION REGULAR MESSAGES ===== """
 """ Send regular messages even if these ones are empty ? (except the header) """
 SEND_MSG_EVEN_IF_EMPTY = False
@@ -171,6 +233,22 @@ SUMO_JUNCTIONS_DICTIONARY_FILE = DICT_DIRECTORY + "/{}JunctionsDictionary".forma
 SUMO_EDGES_DICTIONARY_FILE = DICT_DIRECTORY + "/{}EdgesDictionary".format(SUMO_CHOSEN_NETWORK)
 SUMO_TLL_DICTIONARY_FILE = DICT_DIRECTORY + "/{}TrafficLightsDictionary".format(SUMO_CHOSEN_NETWORK)
 SUMO_GRAPH_FILE = DICT_DIRECTORY + "/{}GraphDictionary".format(SUMO_CHOSEN_NETWORK)
+SUMO_JUNCTIONS_COORDS_DICTIONARY_FILE = DICT_DIRECTORY + "/{}JunctionsCoordinatesDictionary".format(SUMO_CHOSEN_NETWORK)
+SUMO_REVERSE_GRAPH_FILE = DICT_DIRECTORY + "/{}ReverseGraphDictionary".format(SUMO_CHOSEN_NETWORK)
+SUMO_EDGES_ATTRIBUTES_DICTIONARY_FILE = DICT_DIRECTORY + "/{}EdgesAttributesDictionary".format(SUMO_CHOSEN_NETWORK)
+SUMO_SPATIAL_INDEX_FILE = DICT_DIRECTORY + "/{}SpatialIndexDictionary".format(SUMO_CHOSEN_NETWORK)
+SUMO_IDS_DICTIONARY_FILE = DICT_DIRECTORY + "/{}IdsDictionary".format(SUMO_CHOSEN_NETWORK)
+SUMO_LANES_LINKS_DICTIONARY_FILE = DICT_DIRECTORY + "/{}LanesLinksDictionary".format(SUMO_CHOSEN_NETWORK)
+SUMO_JUNCTIONS_GEO_COORDS_DICTIONARY_FILE = DICT_DIRECTORY + "/{}JunctionsGeographicCoordinatesDictionary".format(SUMO_CHOSEN_NETWORK)
+SUMO_CONTRACTION_HIERARCHY_FILE = DICT_DIRECTORY + "/{}ContractionHierarchyDictionary".format(SUMO_CHOSEN_NETWORK)
+SUMO_LANDMARKS_FILE = DICT_DIRECTORY + "/{}LandmarksDictionary".format(SUMO_CHOSEN_NETWORK)
+""" Binary dictionaries format (See binaryDictionary.py). The version is also recorded in the dictionaries manifest (See sharedFunctions.py),
+it must be incremented when the format or the content of any dictionary changes """
+DICTIONARY_FORMAT_MAGIC = "ASTRADICT"
+DICTIONARY_FORMAT_VERSION = 3
+DICTIONARY_MANIFEST_EXTENSION = ".manifest"
+DICTIONARY_TEMPORARY_EXTENSION = ".tmp"
+NETWORK_HASH_CHUNK_SIZE = 1048576
 
 
 """ Shared constants """
@@ -191,6 +269,7 @@ INVALID_MESSAGE = 40
 
 GRAPH_UNKNOWN_EDGE = 30
 GRAPH_INVALID_BLOCK_MSG = 31
+GRAPH_BLOCK_FAILED = 32  # Error code returned when SUMO refuses a blocking vehicle or its stop
 
 ROUTE_ERROR_CONNECTION = 1
 DUAROUTER_ERROR_LAUNCH = 2
@@ -198,11 +277,14 @@ ROUTE_TIMEOUT_ERROR = 6
 ROUTE_INVALID_ALGORITHM = 7
 ROUTE_INVALID_GEO = 8
 ROUTE_ROUTING_REQUEST_FAILED = 10
+ROUTE_DUAROUTER_QUEUE_FULL = 12
+ROUTE_UNKNOWN_EDGE = 13
 
 VEHICLE_INVALID_ROUTE = 4
 VEHICLE_EMPTY_ROUTE = 5
 VEHICLE_MOCK_FAILED = 9
 VEHICLE_DELETE_FAILED_UNKNOWN = 11
+VEHICLE_ADD_FAILED = 14
 
 TLL_PHASE_INDEX_ERROR = 21
 TLL_PHASE_STATE_ERROR = 22  # Error code returned when a phase state is invalid, or if the current phase index is invalid
@@ -277,6 +359,21 @@ ROUTING_REQUEST_HEADER = "GET"
 ROUTING_RESPONSE_HEADER = "ROU"
 DIJKSTRA_REQUEST = "DIJ"
 DUAROUTER_REQUEST = "DUA"
+ASTAR_REQUEST = "AST"
+ALT_REQUEST = "ALT"
+BIDIRECTIONAL_DIJKSTRA_REQUEST = "BID"
+TRAVEL_TIME_REQUEST = "TIM"
+ROUTE_CACHE_REQUEST_HEADER = "CAC"
+ROUTE_CACHE_RESPONSE_HEADER = "CAC"
+MATRIX_REQUEST_HEADER = "MAT"
+MATRIX_RESPONSE_HEADER = "MAT"
+MATRIX_END = "END"
+""" Prefix of a request whose responses may be sent before the ones of the previous requests, prefixed the same way (See orderedReplies.py) """
+TAGGED_REQUEST_HEADER = "TAG"
+TAGGED_RESPONSE_HEADER = "TAG"
+MATRIX_ROWS_SEPARATOR = ","
+MATRIX_ROWS_PER_MESSAGE = 500  # If -1, the whole message will be sent
+MATRIX_UNREACHABLE_COST = -1
 EDGES_ID = 0
 GEOGRAPHIC_COORDS = 1
 ERROR_HEADER = "ERR"
@@ -288,9 +385,30 @@ XML_EDGE_ELEMENT = "edge"
 XML_EDGE_ID = "id"
 XML_EDGE_FROM_JUNCTION = "from"
 XML_EDGE_TO_JUNCTION = "to"
+XML_EDGE_PRIORITY = "priority"
+XML_EDGE_FUNCTION = "function"
+XML_EDGE_DEFAULT_PRIORITY = -1
+XML_EDGE_DEFAULT_FUNCTION = "normal"
 XML_LANE_ELEMENT = "lane"
 XML_LANE_ID = "id"
+XML_LANE_INDEX = "index"
 XML_LANE_LENGTH = "length"
+XML_LANE_SPEED = "speed"
+XML_LANE_SHAPE = "shape"
+XML_CONNECTION_ELEMENT = "connection"
+XML_CONNECTION_FROM = "from"
+XML_CONNECTION_TO = "to"
+XML_CONNECTION_FROM_LANE = "fromLane"
+XML_CONNECTION_TO_LANE = "toLane"
+XML_CONNECTION_LINK_INDEX = "linkIndex"
+XML_CONNECTION_NO_LINK_INDEX = -1
+XML_JUNCTION_ELEMENT = "junction"
+XML_JUNCTION_ID = "id"
+XML_JUNCTION_X = "x"
+XML_JUNCTION_Y = "y"
+XML_LOCATION_ELEMENT = "location"
+XML_LOCATION_NET_OFFSET = "netOffset"
+XML_LOCATION_PROJECTION = "projParameter"
 
 
 """ DuarouterRoute """
@@ -301,16 +419,23 @@ XML_TRIP_ID_ATTRIBUTE = "id"
 XML_TRIP_DEPART_ATTRIBUTE = "depart"
 XML_TRIP_FROM_ATTRIBUTE = "from"
 XML_TRIP_TO_ATTRIBUTE = "to"
+XML_VEHICLE_ELEMENT = "vehicle"
+XML_VEHICLE_ID_ATTRIBUTE = "id"
 XML_ROUTE_ELEMENT = "route"
 XML_COST_ATTRIBUTE = "cost"
 XML_EDGES_ATTRIBUTE = "edges"
-TRIPS_PATH = TMP_DIRECTORY + "/trips.xml"
-ROUTES_OUTPUT_PATH = TMP_DIRECTORY + "/result.rou.xml"
-ROUTES_ALT_OUTPUT_PATH = TMP_DIRECTORY + "/result.rou.alt.xml"
-DUAROUTER_START_COMMAND_TEMPLATE = "{} --ignore-errors --trip-files {} --net-file {} --output-file {}"
-DUAROUTER_START_COMMAND = DUAROUTER_START_COMMAND_TEMPLATE.format(DUAROUTER_BINARY, TRIPS_PATH, SUMO_NETWORK_FILE, ROUTES_OUTPUT_PATH)
-DUAROUTER_SLEEP_TIME = 0.1
-DUAROUTER_MAX_SLEEP_TIME = 20
+""" Each Duarouter worker uses its own temporary directory """
+DUAROUTER_WORKER_DIRECTORY = TMP_DIRECTORY + "/duarouter{}"
+TRIPS_FILE = "/trips.xml"
+ROUTES_OUTPUT_FILE = "/result.rou.xml"
+ROUTES_ALT_OUTPUT_FILE = "/result.rou.alt.xml"
+DUAROUTER_START_COMMAND_TEMPLATE = [DUAROUTER_BINARY, "--ignore-errors", "--trip-files", "{trips}", "--net-file", SUMO_NETWORK_FILE, "--output-file", "{routes}"]
+"""
+Time in seconds after which the Duarouter subprocess is killed.
+This is also the longest time the responses of the untagged requests received after a DUA request
+may be held back, since these ones are sent in the order of the requests (See orderedReplies.py)
+"""
+DUAROUTER_TIMEOUT = 20
 
 
 """ Vehicle """
@@ -318,6 +443,8 @@ PRINT_PREFIX_VEHICLE = "Vehicle >>> "
 IGNORED_VEHICLES_REGEXP = re.compile(IGNORED_VEHICLES)
 
 VEHICLE_ADD_REQUEST_HEADER = "ADD"
+VEHICLE_ADD_BATCH_REQUEST_HEADER = "ADB"
+VEHICLE_ADD_BATCH_RESPONSE_HEADER = "ADB"
 VEHICLE_ADD_RAND_REQUEST_HEADER = "MOC"
 VEHICLE_DELETE_REQUEST_HEADER = "DEL"
 VEHICLE_SPEED_REQUEST_HEADER = "SPE"
@@ -332,6 +459,9 @@ VEHICLE_ARRIVED_RESPONSE_HEADER = "ARR"
 DEFAULT_VEHICLE_TYPE = "DEFAULT_VEHTYPE"
 PRIORITY_VEHICLE = '1'
 
+VEHICLE_MOCK_DEFAULT_SEED = 0  # Seed of the random routes when the stress test request does not specify one
+VEHICLE_MOCK_BATCH_SIZE = 500  # Number of random vehicles added to SUMO under a single TraCI lock
+
 
 """ TrafficLights """
 PRINT_PREFIX_TLL = "TrafficLights >>> "
@@ -0,0 +1,361 @@
+#!/usr/bin/env python
+
+"""
+@file    contractionHierarchy.py
+@author  ASTra team
+@date    16/10/2026
+
+This file contains the contraction hierarchies preprocessing and query engine of the routing graph (See routingGraph.py).
+
+Preprocessing (buildContractionHierarchy):
+    The vertices are contracted one by one in the order of their priority (2 * edge difference + contracted neighbours + level),
+    lazily updated. The level of a vertex is the length of the longest chain of contracted vertices below it, so that the
+    contraction spreads over the whole graph instead of growing a few deep chains.
+    Contracting a vertex v adds a shortcut u->w (via v) for each pair of remaining neighbours u->v->w, unless a witness search finds a path from u to w which is not longer without v.
+    The contraction order gives the rank of each vertex.
+
+Query (shortestPath):
+    A bidirectional Dijkstra where the forward search only follows arcs going to higher ranked vertices
+    and the backward search only follows arcs coming from higher ranked vertices.
+    Stall-on-demand: a vertex reached with a distance longer than the one given by an arc coming from a higher ranked
+    vertex already reached is not on a shortest path, so its arcs are not relaxed.
+    The shortcuts of the resulting path are then recursively unpacked into the original edges ID.
+
+(1) Contraction hierarchy dictionary (binary dictionary, See binaryDictionary.py):
+        Arrays: the ranks of the vertices, then the arcs of the hierarchy as CSR arrays (See routingGraph.py): offsets, targets,
+        weights and middles, the middle of an arc being the vertex the shortcut bypasses, -1 if the arc is an original one
+        The vertices index are the dense edges index of the ID registry (See idRegistry.py)
+"""
+
+import constants
+import dijkstra
+from array import array
+from heapq import heappush
+from heapq import heappop
+from heapq import heapify
+from binaryDictionary import exportDictionary
+from binaryDictionary import importDictionary
+from dijkstra import INFINITY
+from logger import Logger
+from sharedFunctions import isDictionaryOutOfDate
+
+
+"""
+============================================================================================================================================
+===                                                             PREPROCESSING                                                            ===
+============================================================================================================================================
+"""
+def witnessSearch(outArcs, source, excluded, targets, maxDistance):
+    """
+    Returns the distances from the source vertex to the vertices reachable within maxDistance in the remaining graph,
+    without crossing the excluded vertex. The search stops once every target vertex is settled,
+    and is bounded by a settled vertices limit (See constants)
+    """
+    distances = {source: 0.0}
+    heap = [(0.0, source)]
+    settledNumber = 0
+    remainingTargets = len(targets)
+
+    while heap and settledNumber < constants.CH_WITNESS_SETTLED_LIMIT:
+        distance, v = heappop(heap)
+        if distance > distances[v]:
+            continue
+        if distance > maxDistance:
+            break
+        if v in targets:
+            remainingTargets -= 1
+            if remainingTargets == 0:
+                break
+        settledNumber += 1
+
+        for w, arc in outArcs[v].iteritems():
+            if w != excluded:
+                vwLength = distance + arc[0]
+                if vwLength < distances.get(w, INFINITY):
+                    distances[w] = vwLength
+                    heappush(heap, (vwLength, w))
+
+    return distances
+
+
+def getShortcuts(outArcs, inArcs, v):
+    """
+    Returns the shortcuts (u, w, weight) required for contracting the vertex v
+    """
+    shortcuts = []
+
+    for u, inArc in inArcs[v].iteritems():
+        maxDistance = 0.0
+        for w, outArc in outArcs[v].iteritems():
+            if w != u:
+                maxDistance = max(maxDistance, inArc[0] + outArc[0])
+        if maxDistance == 0.0:
+            continue
+
+        distances = witnessSearch(outArcs, u, v, outArcs[v], maxDistance)
+        for w, outArc in outArcs[v].iteritems():
+            if w != u:
+                weight = inArc[0] + outArc[0]
+                if distances.get(w, INFINITY) > weight:
+                    shortcuts.append((u, w, weight))
+
+    return shortcuts
+
+
+def getPriority(outArcs, inArcs, contractedNeighbours, levels, v):
+    """
+    Returns the contraction priority of a vertex: the lower the sooner
+    """
+    edgeDifference = len(getShortcuts(outArcs, inArcs, v)) - len(inArcs[v]) - len(outArcs[v])
+    return 2 * edgeDifference + contractedNeighbours[v] + levels[v]
+
+
+def buildContractionHierarchy(routingGraph):
+    """
+    Returns the ranks array of the vertices and the arcs dictionary of the contraction hierarchy as
+    {Key=vertex u, Value=Dict as {Key=vertex v, Value=(weight, middle vertex or -1)}}
+    """
+    Logger.info("{}Building contraction hierarchy...".format(constants.PRINT_PREFIX_ROUTER))
+    verticesNumber = routingGraph.getVerticesNumber()
+    offsets = routingGraph.offsets
+    targets = routingGraph.targets
+    weights = routingGraph.weights
+
+    # Remaining graph, then every arc of the hierarchy
+    outArcs = [dict() for v in xrange(verticesNumber)]
+    inArcs = [dict() for v in xrange(verticesNumber)]
+    arcs = [dict() for v in xrange(verticesNumber)]
+    for u in xrange(verticesNumber):
+        for i in xrange(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            if v != u and weights[i] < outArcs[u].get(v, (INFINITY,))[0]:
+                outArcs[u][v] = (weights[i], -1)
+                inArcs[v][u] = (weights[i], -1)
+                arcs[u][v] = (weights[i], -1)
+
+    contractedNeighbours = [0] * verticesNumber
+    levels = [0] * verticesNumber
+    ranks = array('i', [-1]) * verticesNumber
+    heap = [(getPriority(outArcs, inArcs, contractedNeighbours, levels, v), v) for v in xrange(verticesNumber)]
+    heapify(heap)
+    rank = 0
+
+    while heap:
+        priority, v = heappop(heap)
+        if ranks[v] != -1:
+            continue
+
+        # Lazy update: the vertex is contracted only if it remains the cheapest one
+        priority = getPriority(outArcs, inArcs, contractedNeighbours, levels, v)
+        if heap and priority > heap[0][0]:
+            heappush(heap, (priority, v))
+            continue
+
+        for u, w, weight in getShortcuts(outArcs, inArcs, v):
+            if weight < outArcs[u].get(w, (INFINITY,))[0]:
+                outArcs[u][w] = (weight, v)
+                inArcs[w][u] = (weight, v)
+                arcs[u][w] = (weight, v)
+
+        for u in inArcs[v]:
+            del outArcs[u][v]
+            contractedNeighbours[u] += 1
+            levels[u] = max(levels[u], levels[v] + 1)
+        for w in outArcs[v]:
+            del inArcs[w][v]
+            contractedNeighbours[w] += 1
+            levels[w] = max(levels[w], levels[v] + 1)
+        outArcs[v] = dict()
+        inArcs[v] = dict()
+
+        ranks[v] = rank
+        rank += 1
+
+    Logger.info("{}Done".format(constants.PRINT_PREFIX_ROUTER))
+    return ranks, arcs
+
+
+
+"""
+============================================================================================================================================
+===                                                 CONTRACTION HIERARCHY DICTIONARY MANAGEMENT (1)                                      ===
+============================================================================================================================================
+"""
+def exportContractionHierarchy(ranks, arcs):
+    """
+    Writes the contraction hierarchy in an output file
+    """
+    Logger.info("{}Exporting contraction hierarchy...".format(constants.PRINT_PREFIX_ROUTER))
+    offsets = array('i', [0])
+    targets = array('i')
+    weights = array('d')
+    middles = array('i')
+    for u in xrange(len(ranks)):
+        for v, (weight, middle) in sorted(arcs[u].iteritems()):
+            targets.append(v)
+            weights.append(weight)
+            middles.append(middle)
+        offsets.append(len(targets))
+
+    exportDictionary(constants.SUMO_CONTRACTION_HIERARCHY_FILE, [], [ranks, offsets, targets, weights, middles], (constants.CH_WITNESS_SETTLED_LIMIT,))
+    Logger.info("{}Done".format(constants.PRINT_PREFIX_ROUTER))
+
+
+def importContractionHierarchy():
+    """
+    Reads the contraction hierarchy from an input file
+    """
+    Logger.info("{}Importing contraction hierarchy...".format(constants.PRINT_PREFIX_ROUTER))
+    strings, (ranks, offsets, targets, weights, middles) = importDictionary(constants.SUMO_CONTRACTION_HIERARCHY_FILE)
+    arcs = [dict((targets[i], (weights[i], middles[i])) for i in xrange(offsets[u], offsets[u + 1])) for u in xrange(len(ranks))]
+    Logger.info("{}Done".format(constants.PRINT_PREFIX_ROUTER))
+    return ranks, arcs
+
+
+def getContractionHierarchy(routingGraph):
+    """
+    Returns the contraction hierarchy of a routing graph. This one is obtained from a file, updated if new map data are detected
+    """
+    if isDictionaryOutOfDate(constants.SUMO_CONTRACTION_HIERARCHY_FILE, constants.SUMO_NETWORK_FILE, (constants.CH_WITNESS_SETTLED_LIMIT,)):
+        ranks, arcs = buildContractionHierarchy(routingGraph)
+        exportContractionHierarchy(ranks, arcs)
+    else:
+        ranks, arcs = importContractionHierarchy()
+    return ContractionHierarchy(ranks, arcs)
+
+
+
+"""
+============================================================================================================================================
+===                                                                 QUERY                                                                ===
+============================================================================================================================================
+"""
+class ContractionHierarchy(object):
+    """
+    Upward forward and backward graphs of a contraction hierarchy.
+    The arcs of a vertex are stored as a list of (vertex, weight) pairs, which CPython iterates faster than CSR arrays (See routingGraph.py)
+    """
+    def __init__(self, ranks, arcs):
+        verticesNumber = len(ranks)
+        self.ranks = ranks
+        self.middles = dict()
+        self.forwardArcs = [[] for v in xrange(verticesNumber)]
+        self.backwardArcs = [[] for v in xrange(verticesNumber)]
+
+        for u in xrange(verticesNumber):
+            for v, arc in arcs[u].iteritems():
+                self.middles[u * verticesNumber + v] = arc[1]
+                if ranks[v] > ranks[u]:
+                    self.forwardArcs[u].append((v, arc[0]))
+                else:
+                    self.backwardArcs[v].append((u, arc[0]))
+
+    def unpackArc(self, u, v, path):
+        """
+        Appends to the path the original vertices of the arc u->v, u excluded
+        """
+        verticesNumber = len(self.ranks)
+        stack = [(u, v)]
+        while stack:
+            u, v = stack.pop()
+            middle = self.middles[u * verticesNumber + v]
+            if middle == -1:
+                path.append(v)
+            else:
+                stack.append((middle, v))
+                stack.append((u, middle))
+
+    def query(self, start, end):
+        """
+        Returns the shortest path (list of vertices index) from the start to the end vertex index, None if no path exists
+        """
+        if start == end:
+            return [start]
+
+        forwardDistances = {start: 0.0}
+        backwardDistances = {end: 0.0}
+        forwardPredecessors = {start: -1}
+        backwardPredecessors = {end: -1}
+        forwardHeap = [(0.0, start)]
+        backwardHeap = [(0.0, end)]
+        best = INFINITY
+        meeting = -1
+
+        while forwardHeap or backwardHeap:
+            if forwardHeap and forwardHeap[0][0] >= best:
+                forwardHeap = []
+            if backwardHeap and backwardHeap[0][0] >= best:
+                backwardHeap = []
+
+            # The arcs followed upward by a search, and the ones coming from higher ranked vertices used for stalling
+            if forwardHeap and (not backwardHeap or forwardHeap[0][0] <= backwardHeap[0][0]):
+                heap, distances, predecessors, otherDistances = forwardHeap, forwardDistances, forwardPredecessors, backwardDistances
+                upwardArcs, downwardArcs = self.forwardArcs, self.backwardArcs
+            elif backwardHeap:
+                heap, distances, predecessors, otherDistances = backwardHeap, backwardDistances, backwardPredecessors, forwardDistances
+                upwardArcs, downwardArcs = self.backwardArcs, self.forwardArcs
+            else:
+                break
+
+            distance, v = heappop(heap)
+            if distance > distances[v]:
+                continue
+
+            stalled = False
+            for u, weight in downwardArcs[v]:
+                if u in distances and distances[u] + weight < distance:
+                    stalled = True
+                    break
+            if stalled:
+                continue
+
+            if v in otherDistances and distance + otherDistances[v] < best:
+                best = distance + otherDistances[v]
+                meeting = v
+
+            for w, weight in upwardArcs[v]:
+                vwLength = distance + weight
+                if vwLength < distances.get(w, INFINITY):
+                    distances[w] = vwLength
+                    predecessors[w] = v
+                    heappush(heap, (vwLength, w))
+
+        if meeting == -1:
+            return None
+
+        # Upward arcs from the start to the meeting vertex, then downward arcs to the end
+        upwardVertices = []
+        v = meeting
+        while v != -1:
+            upwardVertices.append(v)
+            v = forwardPredecessors[v]
+        upwardVertices.reverse()
+
+        path = [start]
+        for i in xrange(len(upwardVertices) - 1):
+            self.unpackArc(upwardVertices[i], upwardVertices[i + 1], path)
+        v = meeting
+        while backwardPredecessors[v] != -1:
+            self.unpackArc(v, backwardPredecessors[v], path)
+            v = backwardPredecessors[v]
+
+        return path
+
+
+def shortestPath(graph, start, end, closed=None):
+    """
+    Find a single shortest path from the given start vertex index
+    to the given end vertex index (See idRegistry.py), using the contraction hierarchy of the graph.
+    The shortcuts may go through closed vertices (See edgeClosures.py), so a Dijkstra search is used instead while some vertices are closed.
+    The output is a list of the vertices index in order along
+    the shortest path. A ValueError is raised if no path exists.
+    """
+    if closed is not None:
+        return dijkstra.shortestPath(graph, start, end, closed)
+    
+    path = graph.hierarchy.query(start, end)
+    if path is None:
+        raise ValueError("Contraction hierarchy: no path from {} to {}".format(start, end))
+
+    return path
+
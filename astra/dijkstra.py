@@ -1,99 +1,113 @@
 #!/usr/bin/env python
 
 """
-@file    Dijkstra.py
-@author  David Eppstein, UC Irvine
-@date    04/04/2002
+@file    dijkstra.py
+@author  ASTra team
+@date    16/10/2026
 
-Dijkstra's algorithm for shortest paths
-http://aspn.activestate.com/ASPN/Cookbook/Python/Recipe/117228 
+Dijkstra's algorithm for shortest paths over a routing graph (See routingGraph.py)
+
+The priority queue is a binary heap (heapq) of (distance, vertex) pairs with lazy deletion:
+a vertex is pushed each time its distance decreases and the outdated pairs are skipped when popped.
+Since the vertices are interned in the edges ID order, ties are broken as they were by the previous
+priority dictionary implementation.
 """
 
-from priorityDictionary import PriorityDictionary
+from array import array
+from heapq import heappush
+from heapq import heappop
+
+INFINITY = float('inf')
+
 
-def Dijkstra(G, start, end=None):
+def Dijkstra(graph, start, end=None, closed=None):
     """
-    Find shortest paths from the start vertex to all
-    vertices nearer than or equal to the end.
-
-    The input graph G is assumed to have the following
-    representation: A vertex can be any object that can
-    be used as an index into a dictionary.  G is a
-    dictionary, indexed by vertices.  For any vertex v,
-    G[v] is itself a dictionary, indexed by the neighbors
-    of v.  For any edge v->w, G[v][w] is the length of
-    the edge.  This is related to the representation in
-    <http://www.python.org/doc/essays/graphs.html>
-    where Guido van Rossum suggests representing graphs
-    as dictionaries mapping vertices to lists of neighbors,
-    however dictionaries of edges have many advantages
-    over lists: they can store extra information (here,
-    the lengths), they support fast existence tests,
-    and they allow easy modification of the graph by edge
-    insertion and removal.  Such modifications are not
-    needed here but are important in other graph algorithms.
-    Since dictionaries obey iterator protocol, a graph
-    represented as described here could be handed without
-    modification to an algorithm using Guido's representation.
-
-    Of course, G and G[v] need not be Python dict objects;
-    they can be any other object that obeys dict protocol,
-    for instance a wrapper in which vertices are URLs
-    and a call to G[v] loads the web page and finds its links.
-    
-    The output is a pair (D,P) where D[v] is the distance
-    from start to v and P[v] is the predecessor of v along
-    the shortest path from s to v.
-    
+    Find shortest paths from the start vertex index to all
+    vertices nearer than or equal to the end vertex index.
+    The closed vertices (See edgeClosures.py) are never entered.
+    The output is a pair (D, P) of arrays where D[v] is the distance
+    from start to v (INFINITY if v has not been reached) and P[v]
+    is the predecessor of v along the shortest path from start to v.
     Dijkstra's algorithm is only guaranteed to work correctly
-    when all edge lengths are positive. This code does not
-    verify this property for all edges (only the edges seen
-     before the end vertex is reached), but will correctly
-    compute shortest paths even for some graphs with negative
-    edges, and will raise an exception if it discovers that
-    a negative edge has caused it to make a mistake.
+    when all edge lengths are positive.
     """
+    verticesNumber = graph.getVerticesNumber()
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
 
-    D = {}  # dictionary of final distances
-    P = {}  # dictionary of predecessors
-    Q = PriorityDictionary()  # est.dist. of non-final vert.
-    Q[start] = 0
-    
-    for v in Q:
-        D[v] = Q[v]
+    D = array('d', [INFINITY]) * verticesNumber
+    P = array('i', [-1]) * verticesNumber
+    settled = bytearray(verticesNumber)
+    D[start] = 0.0
+    heap = [(0.0, start)]
+
+    while heap:
+        distance, v = heappop(heap)
+        if settled[v]:
+            continue
+        settled[v] = 1
         if v == end:
             break
-        
-        try:
-            for w in G[v]:
-                vwLength = D[v] + G[v][w]
-                if w in D:
-                    if vwLength < D[w]:
-                        raise ValueError, \
-      "Dijkstra: found better path to already-final vertex"
-                elif w not in Q or vwLength < Q[w]:
-                    Q[w] = vwLength
-                    P[w] = v
-        except:
-            pass
-    
+
+        for i in xrange(offsets[v], offsets[v + 1]):
+            w = targets[i]
+            if closed is not None and closed[w]:
+                continue
+            vwLength = distance + weights[i]
+            if vwLength < D[w]:
+                D[w] = vwLength
+                P[w] = v
+                heappush(heap, (vwLength, w))
+
     return (D, P)
-            
-def shortestPath(G, start, end):
+
+
+def DijkstraToTargets(graph, start, targets, closed=None):
     """
-    Find a single shortest path from the given start vertex
-    to the given end vertex.
-    The input has the same conventions as Dijkstra().
-    The output is a list of the vertices in order along
-    the shortest path.
+    Find the distances from the start vertex index to each of the targets vertices index, without entering the closed vertices.
+    The search stops as soon as every target is settled.
+    The output is the D array of dijkstra.Dijkstra(), where only the distances of the targets are final
     """
+    verticesNumber = graph.getVerticesNumber()
+    offsets = graph.offsets
+    targetsIndexes = graph.targets
+    weights = graph.weights
 
-    D, P = Dijkstra(G, start, end)
-    Path = []
-    while 1:
-        Path.append(end)
-        if end == start:
-            break
-        end = P[end]
-    Path.reverse()
-    return Path
+    D = array('d', [INFINITY]) * verticesNumber
+    settled = bytearray(verticesNumber)
+    remaining = set(targets)
+    D[start] = 0.0
+    heap = [(0.0, start)]
+
+    while heap and remaining:
+        distance, v = heappop(heap)
+        if settled[v]:
+            continue
+        settled[v] = 1
+        remaining.discard(v)
+
+        for i in xrange(offsets[v], offsets[v + 1]):
+            w = targetsIndexes[i]
+            if closed is not None and closed[w]:
+                continue
+            vwLength = distance + weights[i]
+            if vwLength < D[w]:
+                D[w] = vwLength
+                heappush(heap, (vwLength, w))
+
+    return D
+
+
+def shortestPath(graph, start, end, closed=None):
+    """
+    Find a single shortest path from the given start vertex index
+    to the given end vertex index (See idRegistry.py), avoiding the closed vertices.
+    The output is a list of the vertices index in order along
+    the shortest path. A ValueError is raised if no path exists.
+    """
+    D, P = Dijkstra(graph, start, end, closed)
+    if D[end] == INFINITY:
+        raise ValueError("Dijkstra: no path from {} to {}".format(start, end))
+
+    return graph.getPath(P, start, end)
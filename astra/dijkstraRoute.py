@@ -8,9 +8,9 @@
 This script is used for resolving routing request using a dijkstra algorithm.
 
 Routing procedure (processRouteRequest):
-    Transforming the SUMO edges ID into junctions ID
-    Using a dijkstra algorithm for processing the routing request (See dijkstra.py)
-    Transforming the junctions ID list returned in an edges ID list
+    Transforming the SUMO edges ID into vertices index (See idRegistry.py)
+    Using a dijkstra algorithm on the compiled routing graph for processing the routing request (See dijkstra.py and routingGraph.py)
+    Returning the vertices index list, translated into edges ID when the route is sent (See route.py)
 """
 
 import constants
@@ -18,39 +18,50 @@ import traci
 from sharedFunctions import getJunctionId
 from sharedFunctions import isJunction
 from sharedFunctions import correctRoute
-from sharedFunctions import getOppositeEdge
 from logger import Logger
 import dijkstra
     
 
-def processRouteRequest(src, destinations, junctionsDict, graphDict):
+def processRouteRequest(src, destinations, junctionsDict, routingGraph, shortestPath=dijkstra.shortestPath, closed=None):
     """
-    - Transforms the source and destination coordinates to SUMO junctions ID
-    - Resolves the routing demand by using a dijkstra algorithm
-    - Sends the route (list of geographic coordinates) back to the client
+    - Transforms the source and destination edges ID to vertices index
+    - Resolves the routing demand by using a dijkstra algorithm, or the given shortest path engine (See astar.py),
+      avoiding the closed vertices (See edgeClosures.py)
+    - Returns the route as a list of vertices index
     """
     route = []
     first = True
+    registry = routingGraph.registry
     
-    if isJunction(src):
-        #src become an edge predecessor of the src junction
-        src = iter(junctionsDict[getJunctionId(src)][0]).next()
-        srcJunction = True
-    else:
-        srcJunction = False
+    try:
+        if isJunction(src):
+            #src become an edge predecessor of the src junction
+            src = junctionsDict.getPredecessors(registry.getJunctionIndex(getJunctionId(src)))[0]
+            srcJunction = True
+        else:
+            src = registry.getEdgeIndex(src)
+            srcJunction = False
+    except (KeyError, IndexError) as e:
+        Logger.exception(e)
+        return constants.ROUTE_ERROR_CONNECTION, None
     
     for dest in destinations:
 
-        if isJunction(dest):
-            #dest become an edge successor of the dest junction
-            dest = iter(junctionsDict[getJunctionId(dest)][1]).next()
-            destJunction = True
-        else:
-            destJunction = False
+        try:
+            if isJunction(dest):
+                #dest become an edge successor of the dest junction
+                dest = junctionsDict.getSuccessors(registry.getJunctionIndex(getJunctionId(dest)))[0]
+                destJunction = True
+            else:
+                dest = registry.getEdgeIndex(dest)
+                destJunction = False
+        except (KeyError, IndexError) as e:
+            Logger.exception(e)
+            return constants.ROUTE_ERROR_CONNECTION, None
         
         try:
             #Getting shortest path
-            tmpRoute = dijkstra.shortestPath(graphDict, src, dest)
+            tmpRoute = shortestPath(routingGraph, src, dest, closed)
         except Exception as e:
             Logger.exception(e)
             return constants.ROUTE_ERROR_CONNECTION, None
@@ -58,7 +69,7 @@ def processRouteRequest(src, destinations, junctionsDict, graphDict):
         #Removing the first edge if it's the first routing and we find recurrence
         if first and srcJunction and tmpRoute:
             tmpRoute.pop(0)
-        elif first and len(tmpRoute) > 1 and tmpRoute[1] == getOppositeEdge(tmpRoute[0]):
+        elif first and len(tmpRoute) > 1 and tmpRoute[1] == registry.getOppositeEdgeIndex(tmpRoute[0]):
             tmpRoute.pop(0)
             
         #Removing the last edge if it was a junctions from start
@@ -80,7 +91,7 @@ def processRouteRequest(src, destinations, junctionsDict, graphDict):
             src = dest
         
     
-    if len(route) > 1 and route[-2] == getOppositeEdge(route[-1]):
+    if len(route) > 1 and route[-2] == registry.getOppositeEdgeIndex(route[-1]):
         route.pop()
             
     return 0, route
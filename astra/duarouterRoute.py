@@ -9,18 +9,27 @@ This script is used for resolving routing request using a Duarouter subprocess.
 
 Routing procedure (processRouteRequest):
     Building a trip list from these edges using a junctions dictionary(*) in order to improve the routing accuracy
-    Writing this list in an XML file
-    Running Duarouter routing solver with this file as an input
-    Parsing the resulting output XML file and getting the best route in
-    Correcting the route
+    Writing this list in an XML file, one trip per leg of the route (source to destination 1, destination 1 to destination 2...)
+    Running Duarouter routing solver once with this file as an input
+    Parsing the resulting output XML file and getting the best route of each trip
+    Correcting and stitching the routes of the legs
+
+Duarouter workers pool (DuarouterPool):
+    The routing requests are queued in a bounded queue (See constants), then processed by several worker threads,
+    so that many Duarouter subprocesses can be run simultaneously while the router thread keeps on reading requests.
+    Each worker owns a temporary directory where its trips and routes files are written.
+    When a request is processed, a callback is called with the return code and the route.
+    The callbacks of the workers may be called in any order: the router thread keeps the order of its responses (See orderedReplies.py)
 """
 
 import os, sys
 import subprocess
-import time
+import threading
+import Queue
 import constants
 import traci
-from xml.dom.minidom import parseString
+import xml.sax
+from logger import Logger
 from xml.dom.minidom import Document
 from sharedFunctions import getJunctionId
 from sharedFunctions import isJunction
@@ -28,18 +37,18 @@ from sharedFunctions import correctRoute
 from sharedFunctions import getOppositeEdge
 
 
-def removeRoutingFiles():
+def removeRoutingFiles(directory):
     """
-    Removes the temporary files used for routing purposes
+    Removes the temporary files used for routing purposes from a worker directory
     """
-    if os.path.isfile(constants.TRIPS_PATH):
-        os.remove(constants.TRIPS_PATH)
+    if os.path.isfile(directory + constants.TRIPS_FILE):
+        os.remove(directory + constants.TRIPS_FILE)
         
-    if os.path.isfile(constants.ROUTES_OUTPUT_PATH):
-        os.remove(constants.ROUTES_OUTPUT_PATH)
+    if os.path.isfile(directory + constants.ROUTES_OUTPUT_FILE):
+        os.remove(directory + constants.ROUTES_OUTPUT_FILE)
         
-    if os.path.isfile(constants.ROUTES_ALT_OUTPUT_PATH):
-        os.remove(constants.ROUTES_ALT_OUTPUT_PATH)
+    if os.path.isfile(directory + constants.ROUTES_ALT_OUTPUT_FILE):
+        os.remove(directory + constants.ROUTES_ALT_OUTPUT_FILE)
 
 
 def getTrips(edgeSrc, edgeDest, junctionsDict):
@@ -61,9 +70,9 @@ def getTrips(edgeSrc, edgeDest, junctionsDict):
     return [src, dest]
 
 
-def writeTrips(trips):    
+def writeTrips(trips, directory):    
     """
-    Writes a list of edges ID (associated by pair (source edge ID / destination edge ID) in an XML file
+    Writes a list of edges ID (associated by pair (source edge ID / destination edge ID) in an XML file of a worker directory
     """
     i = 0
     doc = Document()
@@ -72,73 +81,102 @@ def writeTrips(trips):
     
     while i < len(trips):
         trip = doc.createElement(constants.XML_TRIP_ELEMENT)
-        trip.setAttribute(constants.XML_TRIP_ID_ATTRIBUTE, str(i))
+        trip.setAttribute(constants.XML_TRIP_ID_ATTRIBUTE, str(i / 2))
         trip.setAttribute(constants.XML_TRIP_DEPART_ATTRIBUTE, str(0))
         trip.setAttribute(constants.XML_TRIP_FROM_ATTRIBUTE, trips[i])
         trip.setAttribute(constants.XML_TRIP_TO_ATTRIBUTE, trips[i + 1])
         root.appendChild(trip)
         i += 2
     
-    xmlFile = open(constants.TRIPS_PATH, 'w')
+    xmlFile = open(directory + constants.TRIPS_FILE, 'w')
     doc.writexml(xmlFile, '\t', '\t' '\n')
     doc.unlink()
     xmlFile.close()
     
 
-def runDuarouterRouteSolver():
+def getDuarouterStartCommand(directory):
     """
-    Starts a DUAROUTER subprocess in charge of resolving shortest path demands and wait for it
+    Returns the command starting a DUAROUTER subprocess which reads and writes in a worker directory
+    """
+    return [argument.format(trips=directory + constants.TRIPS_FILE, routes=directory + constants.ROUTES_OUTPUT_FILE) for argument in constants.DUAROUTER_START_COMMAND_TEMPLATE]
+
+
+def runDuarouterRouteSolver(directory):
+    """
+    Starts a DUAROUTER subprocess in charge of resolving shortest path demands and wait for it.
+    The subprocess is killed if it is still running after the Duarouter timeout (See constants)
     """
-    runTime = 0
-    
     try:
-        duarouterProcess = subprocess.Popen(constants.DUAROUTER_START_COMMAND, shell=True, stdout=sys.stdout)
+        duarouterProcess = subprocess.Popen(getDuarouterStartCommand(directory), stdout=sys.stdout)
     except:
         return constants.DUAROUTER_ERROR_LAUNCH
     
+    timeout = threading.Event()
+    def killDuarouter():
+        timeout.set()
+        try:
+            duarouterProcess.kill()
+        except OSError:
+            pass
+    
     # Wait until process terminates
-    while duarouterProcess.poll() is None and runTime < constants.DUAROUTER_MAX_SLEEP_TIME:
-        time.sleep(constants.DUAROUTER_SLEEP_TIME)
-        runTime += constants.DUAROUTER_SLEEP_TIME
+    timer = threading.Timer(constants.DUAROUTER_TIMEOUT, killDuarouter)
+    timer.start()
+    duarouterProcess.wait()
+    timer.cancel()
     
-    if runTime >= constants.DUAROUTER_MAX_SLEEP_TIME:
+    if timeout.is_set():
         return constants.ROUTE_TIMEOUT_ERROR
-    duarouterProcess.wait()
     return 0
     
 
-def getBestRouteFromXml():
+class RoutesHandler(xml.sax.ContentHandler):
     """
-    Parses an XML file and return the cheapest route (list of edges ID)
+    SAX handler used for parsing a Duarouter alternative routes file in order to get the cheapest route of each trip
     """
-    xmlFile = open(constants.ROUTES_ALT_OUTPUT_PATH, 'r')
-    xmlData = xmlFile.read().encode("UTF-8")
-    dom = parseString(xmlData)
-    xmlFile.close()
-    xmlRoutes = dom.getElementsByTagName(constants.XML_ROUTE_ELEMENT)
-    minCost = -1
-    
-    if xmlRoutes:    
-        for node in xmlRoutes:
-            tmpCost = float(node.getAttribute(constants.XML_COST_ATTRIBUTE))
-            if minCost == -1 or tmpCost < minCost:
-                edges = node.getAttribute(constants.XML_EDGES_ATTRIBUTE)
-                minCost = tmpCost
-        edges = str(edges)
-        route = edges.split(constants.SEPARATOR)
-        return 0, route
-    
-    return constants.ROUTE_ERROR_CONNECTION, None
+    def __init__(self, routes):
+        self.routes = routes
+        self.tripId = None
+        self.minCost = -1
+        
+    def startElement(self, name, attrs):
+        if name == constants.XML_VEHICLE_ELEMENT:
+            self.tripId = str(attrs.get(constants.XML_VEHICLE_ID_ATTRIBUTE))
+            self.minCost = -1
+        
+        elif name == constants.XML_ROUTE_ELEMENT and self.tripId is not None:
+            tmpCost = float(attrs.get(constants.XML_COST_ATTRIBUTE))
+            if self.minCost == -1 or tmpCost < self.minCost:
+                self.routes[self.tripId] = str(attrs.get(constants.XML_EDGES_ATTRIBUTE)).split(constants.SEPARATOR)
+                self.minCost = tmpCost
+                
+    def endElement(self, name):
+        if name == constants.XML_VEHICLE_ELEMENT:
+            self.tripId = None
 
 
-def processRouteRequest(src, destinations, junctionsDict):
+def getBestRoutesFromXml(directory):
+    """
+    Parses the XML file of a worker directory and return a dictionary as {Key=tripId, Value=cheapest route of the trip (list of edges ID)}
+    """
+    routes = dict()
+    parser = xml.sax.make_parser()
+    parser.setContentHandler(RoutesHandler(routes))
+    parser.parse(directory + constants.ROUTES_ALT_OUTPUT_FILE)
+    return routes
+
+
+def processRouteRequest(src, destinations, junctionsDict, directory):
     """
     - Transforms the source and destination coordinates to SUMO edges ID
-    - Resolves the routing demand by using DUAROUTER
-    - Sends the route (list of geographic coordinates) back to the client
+    - Resolves the routing demand by using DUAROUTER, which is run once per request in the given worker directory,
+      with one trip per leg of the route (source to destination 1, destination 1 to destination 2...)
+    - Returns the return code of DUAROUTER and the route (list of edges ID), stitched from the routes of the legs
     """
     route = []
     first = True
+    trips = []
+    destJunctions = []
     
     if isJunction(src):
         #src become an edge predecessor of the src junction
@@ -151,23 +189,30 @@ def processRouteRequest(src, destinations, junctionsDict):
         if isJunction(dest):
             #dest become an edge successor of the dest junction
             dest = iter(junctionsDict[getJunctionId(dest)][1]).next()
-            destJunction = True
+            destJunctions.append(True)
         else:
-            destJunction = False
+            destJunctions.append(False)
         
-        #Removing temporary routing files
-        removeRoutingFiles()
-        #Writing them in an XML file
-        writeTrips([src, dest])
-        #Running Duarouter
-        returnCode = runDuarouterRouteSolver()
-        if returnCode != 0:
-            return returnCode, None
-        
-        #Getting the best route from the XML result file
-        returnCode, tmpRoute = getBestRouteFromXml()
-        if returnCode !=0:
-            return returnCode, None
+        #Each leg starts from the destination edge of the previous one
+        trips.extend([src, dest])
+        src = dest
+    
+    #Removing temporary routing files
+    removeRoutingFiles(directory)
+    #Writing them in an XML file
+    writeTrips(trips, directory)
+    #Running Duarouter
+    returnCode = runDuarouterRouteSolver(directory)
+    if returnCode != 0:
+        return returnCode, None
+    
+    #Getting the best route of each leg from the XML result file
+    routes = getBestRoutesFromXml(directory)
+    
+    for i in range(0, len(destJunctions)):
+        tmpRoute = routes.get(str(i))
+        if not tmpRoute:
+            return constants.ROUTE_ERROR_CONNECTION, None
         
         #Removing the first edge if it's the first routing and we find recurrence
         if first and srcJunction and tmpRoute:
@@ -176,7 +221,8 @@ def processRouteRequest(src, destinations, junctionsDict):
             tmpRoute.pop(0)
             
         #Removing the last edge if it was a junctions from start
-        if destJunction and tmpRoute:
+        #(the successor edge of a via junction is kept, since it is the source of the next leg)
+        if destJunctions[i] and tmpRoute and i == len(destJunctions) - 1:
             tmpRoute.pop()
 
         #Removing the first edge of routings with via points in order to avoid two identical edges when extending road
@@ -187,14 +233,52 @@ def processRouteRequest(src, destinations, junctionsDict):
         route.extend(tmpRoute)
         first = False
         
-        #Updating source edge for the next routing
-        if tmpRoute:
-            src = tmpRoute[-1]
-        else:
-            src = dest
-        
     
     if len(route) > 1 and route[-2] == getOppositeEdge(route[-1]):
         route.pop()
     
     return 0, route
+
+
+
+class DuarouterPool(object):
+    """
+    Pool of threads processing the DUA routing requests, each one running its own Duarouter subprocesses
+    """
+    def __init__(self, workersNumber, queueSize):
+        self.jobs = Queue.Queue(queueSize)
+        for i in range(0, workersNumber):
+            directory = constants.DUAROUTER_WORKER_DIRECTORY.format(i)
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+            worker = threading.Thread(None, self.run, "Duarouter{}".format(i), (directory,), {})
+            worker.daemon = True
+            worker.start()
+            
+    def submit(self, src, destinations, junctionsDict, callback):
+        """
+        Queues a routing request. callback(returnCode, route) is called by a worker once the request is processed.
+        Returns False if the queue is full
+        """
+        try:
+            self.jobs.put_nowait((src, destinations, junctionsDict, callback))
+        except Queue.Full:
+            return False
+        return True
+    
+    def run(self, directory):
+        """
+        Processes the queued routing requests
+        """
+        while True:
+            src, destinations, junctionsDict, callback = self.jobs.get()
+            try:
+                try:
+                    returnCode, route = processRouteRequest(src, destinations, junctionsDict, directory)
+                except Exception as e:
+                    Logger.exception(e)
+                    returnCode, route = constants.ROUTE_ROUTING_REQUEST_FAILED, None
+                callback(returnCode, route)
+            except Exception as e:
+                Logger.error("{}A {} exception occurred:".format(constants.PRINT_PREFIX_DUAROUTER, e.__class__.__name__))
+                Logger.exception(e)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+
+"""
+@file    edgeClosures.py
+@author  ASTra team
+@date    16/10/2026
+
+This file contains the closures overlay of the routing graph (See routingGraph.py).
+It is shared by the graph thread, which closes and opens edges when these ones are blocked or unblocked (See graph.py),
+and by the router thread, whose routing engines never enter a closed edge (See dijkstra.py).
+
+Overlay:
+    A flag per edge index (See idRegistry.py), 1 if the edge is closed. The base graph is neither copied nor modified,
+    so closing or opening an edge takes O(1). Each flag is written by the graph thread only and read as a single byte
+    by the router thread, so no lock is needed.
+    An edge is only closed when all its lanes are blocked, since a partially blocked edge can still be driven through.
+
+Blocked lanes:
+    The blocked lanes of each edge are recorded with the ID of their blocking vehicle (See graph.py (13)), so that the lanes
+    of an edge can be blocked by several requests, and unblocked one by one. These ones are only used by the graph thread.
+"""
+
+
+class EdgeClosures(object):
+    """
+    Closed flags of the edges, indexed by edges index
+    """
+    def __init__(self, edgesNumber):
+        self.closed = bytearray(edgesNumber)
+        self.closedNumber = 0
+        self.blockedLanes = dict()
+
+    def close(self, edge):
+        """
+        Closes the given edge index
+        """
+        if not self.closed[edge]:
+            self.closed[edge] = 1
+            self.closedNumber += 1
+
+    def open(self, edge):
+        """
+        Opens the given edge index
+        """
+        if self.closed[edge]:
+            self.closed[edge] = 0
+            self.closedNumber -= 1
+
+    def isClosed(self, edge):
+        """
+        Returns True if the given edge index is closed
+        """
+        return self.closed[edge] == 1
+
+    def getClosed(self):
+        """
+        Returns the closed flags given to the routing engines, None if no edge is closed
+        """
+        if self.closedNumber == 0:
+            return None
+        return self.closed
+
+    def blockLane(self, edge, lane, vehicleId, lanesNumber):
+        """
+        Records a lane of the given edge index as blocked by a vehicle, and closes the edge once its lanesNumber lanes are blocked
+        """
+        blockedLanes = self.blockedLanes.setdefault(edge, dict())
+        blockedLanes[lane] = vehicleId
+        if len(blockedLanes) >= lanesNumber:
+            self.close(edge)
+
+    def unblockLane(self, edge, lane):
+        """
+        Removes a blocked lane of the given edge index and opens the edge. Returns the ID of the blocking vehicle, None if the lane is not blocked
+        """
+        blockedLanes = self.blockedLanes.get(edge)
+        if blockedLanes is None or lane not in blockedLanes:
+            return None
+        vehicleId = blockedLanes.pop(lane)
+        if not blockedLanes:
+            del self.blockedLanes[edge]
+        self.open(edge)
+        return vehicleId
+
+    def getBlockedLanes(self, edge):
+        """
+        Returns the blocked lanes index of the given edge index, sorted
+        """
+        return sorted(self.blockedLanes.get(edge, ()))
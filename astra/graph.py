@@ -17,6 +17,7 @@ EDGES COORDINATES
 (3) Edges coordinates (response): COO edge1 lon1A lat1A lon1B lat1B...edgeN lonNA latNA lonNB latNB (N in [0-Y] if all edges were requested (See constants for Y value))
         If ALL EDGES were requested, these messages are followed by an end message (response): COO END
         With A and B the edge extremities
+        The coordinates are read from the junctions geographic coordinates dictionary (24), TraCI is only used if this one is empty
         
         
 EDGES LENGTH
@@ -26,6 +27,7 @@ EDGES LENGTH
 
 (6) Edges length (response): LEN edge1 length1...edgeN lengthN (N in [0-Y] if all edges were requested (See constants for Y value))
         If ALL EDGES were requested, these messages are followed by an end message (response): LEN END
+        The lengths are read from the edges attributes dictionary (25)
         
         
 EDGES CONGESTION
@@ -49,9 +51,14 @@ EDGES SUCCESSORS (GRAPH)
         
 BLOCK/UNBLOCK EDGE
 (13) Block edges request: BLO edge1 nbLanes1 ... edgeN nbLanesN
-        Note : if nbLanes = -1, every lane will be blocked
+    The cached routes (See routeCache.py) going through a blocked edge are dropped
+    An edge whose lanes are all blocked is closed: the routing engines do not route through it anymore (See edgeClosures.py)
+        The nbLanes lanes blocked are the first lanes which are not blocked yet, so that several requests can block the lanes of an edge
+        Note : if nbLanes = -1, every lane will be blocked, a lower nbLanes is an invalid request
+        The request stops at the first edge which cannot be blocked, with an error acknowledge (15)
 
 (14) Block edges request: UNB edge1 ... edgeN
+    The unblocked edges are opened again, and the routes cached while an unblocked edge was blocked are dropped
 
 (15) Acknowledge response (14): ACK returnCode
 
@@ -60,6 +67,7 @@ EDGE ID
 (16) Get an edge ID from geographic coordinates request: EID lon lat
 
 (17) Edge ID response : EID edgeId
+    The edge is found by the spatial index (26), TraCI is only used if the network projection is not supported
 
 
 ERROR
@@ -69,7 +77,7 @@ ERROR
 Dictionaries:
 (19) Junction dictionary:
         - Key=junctionId
-        - Value=[Collection(edgesId predecessors of the junction), Set(edgesId successors of the junction)]
+        - Value=[Collection(edgesId predecessors of the junction), Set(edgesId successors of the junction)], two empty sets for a junction without any edge
         
 (20) EdgesDictionary:
         - Key=edgeId
@@ -80,6 +88,39 @@ Dictionaries:
         - Value=Dictionary:
                     - Key=edgeId successor
                     - Value=edge length between the two edges=successor edge length
+
+(22) Junctions coordinates dictionary:
+        - Key=junctionId
+        - Value=(x, y) SUMO coordinates of the junction center
+
+(23) Reverse graph:
+        - Key=edgeId
+        - Value=Dictionary:
+                    - Key=edgeId predecessor
+                    - Value=length of the arc linking the predecessor to the edge (21)=edge length
+
+(24) Junctions geographic coordinates dictionary:
+        - Key=junctionId
+        - Value=(lon, lat) geographic coordinates of the junction center, computed from the network file projection (See projection.py)
+          This dictionary is empty if the projection is not supported
+
+(25) Edges attributes dictionary:
+        - Key=edgeId
+        - Value=(length, lanes number, speed limit, priority, function) read from the network file.
+          The length and speed limit are the ones of the first lane of the edge
+
+(26) Spatial index:
+        Uniform grid of the lanes shapes segments, used to find the edge nearest to geographic coordinates (See spatialIndex.py)
+
+(27) ID registry:
+        The edges and junctions ID interned to dense integers (See idRegistry.py).
+        The dictionaries (19) to (26) and (28) are stored as arrays indexed by these integers, and decoded to ID when accessed
+
+(28) Lanes links dictionary:
+        - Key=(edgeId, lane index)
+        - Value=[(out laneId 1, link index 1), ..., (out laneId N, link index N)] read from the connections of the network file,
+          in the order of traci.lane.getLinks. The link index is the index of the link in the state of the traffic light
+          controlling it, -1 if the link is not controlled by a traffic light
 """
 
 import sys
@@ -88,176 +129,384 @@ import time
 import constants
 from logger import Logger
 import xml.sax
+from array import array
+from binaryDictionary import exportDictionary
+from binaryDictionary import importDictionary
+from binaryDictionary import getStringsTable
+from binaryDictionary import MappedGraph
+from binaryDictionary import MappedJunctions
+from binaryDictionary import MappedEdges
+from binaryDictionary import MappedCoordinates
+from binaryDictionary import MappedEdgesAttributes
+from binaryDictionary import MappedLanesLinks
 from sharedFunctions import isDictionaryOutOfDate
 from sharedFunctions import sendAck
+from projection import Projection
+from projection import readProjection
+from spatialIndex import buildSpatialIndex
+from spatialIndex import SpatialIndex
+from idRegistry import buildIdRegistry
+from idRegistry import IdRegistry
 from route import getEdgeFromCoords
 
+"""
+============================================================================================================================================
+===                                                          ID REGISTRY MANAGEMENT (27)                                                   ===
+============================================================================================================================================
+"""
+def exportIdRegistry(edgeIds, junctionIds, oppositeEdges):
+    """
+    Writes the ID registry in an output binary file (See binaryDictionary.py): the sorted edges ID followed by the sorted junctions ID
+    """
+    Logger.info("{}Exporting ID registry...".format(constants.PRINT_PREFIX_GRAPH))
+    exportDictionary(constants.SUMO_IDS_DICTIONARY_FILE, edgeIds + junctionIds, [array('i', [len(edgeIds)]), oppositeEdges])
+    Logger.info("{}Done".format(constants.PRINT_PREFIX_GRAPH))
+    
+    
+def importIdRegistry():
+    """
+    Reads the ID registry from an input binary file. The ID are decoded when accessed
+    """
+    Logger.info("{}Importing ID registry...".format(constants.PRINT_PREFIX_GRAPH))
+    strings, arrays = importDictionary(constants.SUMO_IDS_DICTIONARY_FILE)
+    edgesNumber = arrays[0][0]
+    registry = IdRegistry(strings.getSlice(0, edgesNumber), strings.getSlice(edgesNumber, len(strings)), arrays[1])
+    Logger.info("{}Done".format(constants.PRINT_PREFIX_GRAPH))
+    return registry
+
+
+
 """
 ============================================================================================================================================
 ===                                                      JUNCTIONS DICTIONARY MANAGEMENT (4)                                                 ===
 ============================================================================================================================================
 """
-def exportJunctionsDictionary(junctionsDict):
+def exportJunctionsDictionary(junctionsDict, junctionIds, edgeIndexes):
     """
-    Writes the junctions dictionary in an output file
+    Writes the junctions dictionary in an output binary file (See binaryDictionary.py), as edges index lists of each junction index (See idRegistry.py)
     """
     Logger.info("{}Exporting junctions dictionary...".format(constants.PRINT_PREFIX_GRAPH))
-    junctionsFile = open(constants.SUMO_JUNCTIONS_DICTIONARY_FILE, 'w')
-    
-    for pair in junctionsDict.items():
-        junctionsFile.write(pair[0])
-        junctionsFile.write(constants.END_OF_LINE)
-        
-        size = len(pair[1][0])
-        i = 1
-        for value in pair[1][0]:
-            junctionsFile.write(value)
-            if i != size: 
-                junctionsFile.write(constants.SEPARATOR)
-                i += 1
-        junctionsFile.write(constants.END_OF_LINE)
-        
-        size = len(pair[1][1])
-        i = 1
-        for value in pair[1][1]:
-            junctionsFile.write(value)
-            if i != size: 
-                junctionsFile.write(constants.SEPARATOR)
-                i += 1
-        junctionsFile.write(constants.END_OF_LINE)
-        
-    junctionsFile.close()
+    predecessorsOffsets = array('i', [0])
+    predecessors = array('i')
+    successorsOffsets = array('i', [0])
+    successors = array('i')
+    for junctionId in junctionIds:
+        junctionEdges = junctionsDict.get(junctionId, [(), ()])
+        predecessors.extend(sorted(edgeIndexes[edgeId] for edgeId in junctionEdges[0]))
+        predecessorsOffsets.append(len(predecessors))
+        successors.extend(sorted(edgeIndexes[edgeId] for edgeId in junctionEdges[1]))
+        successorsOffsets.append(len(successors))
+        
+    exportDictionary(constants.SUMO_JUNCTIONS_DICTIONARY_FILE, [], [predecessorsOffsets, predecessors, successorsOffsets, successors])
     Logger.info("{}Done".format(constants.PRINT_PREFIX_GRAPH))
     
     
-def importJunctionsDictionary():
+def importJunctionsDictionary(registry):
     """
-    Reads the junctions dictionary from an input file
+    Reads the junctions dictionary from an input binary file. The junctions are decoded when accessed
     """
     Logger.info("{}Importing junctions dictionary...".format(constants.PRINT_PREFIX_GRAPH))
-    junctionsFile = open(constants.SUMO_JUNCTIONS_DICTIONARY_FILE, 'r')
-    junctionsDict = dict()
-    
-    key = junctionsFile.readline()[0:-1]
-    while key:
-        value = [set(), set()]
-        
-        strvalues = junctionsFile.readline()[0:-1]
-        lvalues = strvalues.split(constants.SEPARATOR)
-        for v in lvalues:
-            value[0].add(v)
-            
-        strvalues = junctionsFile.readline()[0:-1]
-        lvalues = strvalues.split(constants.SEPARATOR)
-        for v in lvalues:
-            value[1].add(v)
-            
-        junctionsDict[key] = value
-        key = junctionsFile.readline()[0:-1]
-    
-    junctionsFile.close()
+    strings, arrays = importDictionary(constants.SUMO_JUNCTIONS_DICTIONARY_FILE)
+    junctionsDict = MappedJunctions(registry, *arrays)
     Logger.info("{}Done".format(constants.PRINT_PREFIX_GRAPH))
     return junctionsDict
 
 
-
 """
 ============================================================================================================================================
 ===                                                           EDGES DICTIONARY MANAGEMENT (5)                                                ===
 ============================================================================================================================================
 """
-def exportEdgesDictionary(edgesDict):
+def exportEdgesDictionary(edgesDict, edgeIds, junctionIndexes):
     """
-    Writes the edges dictionary in an output edgesFile
+    Writes the edges dictionary in an output binary file (See binaryDictionary.py), as the junctions index of each edge index (See idRegistry.py)
     """
     Logger.info("{}Exporting edges dictionary...".format(constants.PRINT_PREFIX_GRAPH))
-    edgesFile = open(constants.SUMO_EDGES_DICTIONARY_FILE, 'w')
-    
-    for pair in edgesDict.items():
-        edgesFile.write(pair[0])
-        edgesFile.write(constants.SEPARATOR)
-        edgesFile.write(pair[1][0])
-        edgesFile.write(constants.SEPARATOR)
-        edgesFile.write(pair[1][1])
-        edgesFile.write(constants.END_OF_LINE)
+    junctionsFrom = array('i')
+    junctionsTo = array('i')
+    for edgeId in edgeIds:
+        junctionsFrom.append(junctionIndexes[edgesDict[edgeId][0]])
+        junctionsTo.append(junctionIndexes[edgesDict[edgeId][1]])
 
-    edgesFile.close()
+    exportDictionary(constants.SUMO_EDGES_DICTIONARY_FILE, [], [junctionsFrom, junctionsTo])
     Logger.info("{}Done".format(constants.PRINT_PREFIX_GRAPH))
     
     
-def importEdgesDictionary():
+def importEdgesDictionary(registry):
     """
-    Reads the edges dictionary from an input edgesFile
+    Reads the edges dictionary from an input binary file. The edges are decoded when accessed
     """
     Logger.info("{}Importing edges dictionary...".format(constants.PRINT_PREFIX_GRAPH))
-    edgesFile = open(constants.SUMO_EDGES_DICTIONARY_FILE, 'r')
-    edgesDict = dict()
-    
-    line = edgesFile.readline()[0:-1]
-    while line:
-        array = line.split(constants.SEPARATOR)
-        edgesDict[array[0]] = [array[1], array[2]]
-        line = edgesFile.readline()[0:-1]
-        
-    edgesFile.close()
+    strings, arrays = importDictionary(constants.SUMO_EDGES_DICTIONARY_FILE)
+    edgesDict = MappedEdges(registry, *arrays)
     Logger.info("{}Done".format(constants.PRINT_PREFIX_GRAPH))
     return edgesDict
 
 
-
 """
 ============================================================================================================================================
 ===                                                           GRAPH DICTIONARY MANAGEMENT (6)                                               ===
 ============================================================================================================================================
 """
-def exportGraph(graphDict):
+def exportGraph(graphDict, edgeIds, edgeIndexes, graphFilePath=constants.SUMO_GRAPH_FILE):
     """
-    Writes the graph in an output file
+    Writes the graph in an output binary file (See binaryDictionary.py), as the successors edges index of each edge index (See idRegistry.py)
     """
     Logger.info("{}Exporting graph...".format(constants.PRINT_PREFIX_GRAPH))
-    graphFile = open(constants.SUMO_GRAPH_FILE, 'w')
-    
-    for pair in graphDict.items():
-        graphFile.write(pair[0])
-        
-        for valuePair in pair[1].items():
-            graphFile.write(constants.SEPARATOR)
-            graphFile.write(valuePair[0])
-            graphFile.write(constants.SEPARATOR)
-            graphFile.write(str(valuePair[1]))
-            
-        graphFile.write(constants.END_OF_LINE)
+    offsets = array('i', [0])
+    targets = array('i')
+    weights = array('d')
+    for edgeId in edgeIds:
+        for successor, length in sorted(graphDict.get(edgeId, dict()).iteritems()):
+            targets.append(edgeIndexes[successor])
+            weights.append(length)
+        offsets.append(len(targets))
         
-    graphFile.close()
+    exportDictionary(graphFilePath, [], [offsets, targets, weights])
     Logger.info("{}Done".format(constants.PRINT_PREFIX_GRAPH))
     
     
-def importGraph():
+def importGraph(registry, graphFilePath=constants.SUMO_GRAPH_FILE):
     """
-    Reads the network graph from an input graphFile
+    Reads the network graph from an input binary file. The successors of an edge are decoded when accessed
     """
     Logger.info("{}Importing graph...".format(constants.PRINT_PREFIX_GRAPH))
-    graphFile = open(constants.SUMO_GRAPH_FILE, 'r')
-    graphDict = dict()
+    strings, arrays = importDictionary(graphFilePath)
+    graphDict = MappedGraph(registry, *arrays)
+    Logger.info("{}Done".format(constants.PRINT_PREFIX_GRAPH))
+    return graphDict
+
+
+"""
+============================================================================================================================================
+===                                                      REVERSE GRAPH DICTIONARY MANAGEMENT (23)                                        ===
+============================================================================================================================================
+"""
+def buildReverseGraph(graphDict):
+    """
+    Returns the reverse graph of a graph, as {Key=edgeId, Value=Dict as{Key=edge predecessor, Value=arc length}}
+    """
+    Logger.info("{}Building reverse graph...".format(constants.PRINT_PREFIX_GRAPH))
+    reverseGraphDict = dict()
+    
+    for edge in graphDict:
+        if edge not in reverseGraphDict:
+            reverseGraphDict[edge] = dict()
+        for successor, length in graphDict[edge].iteritems():
+            if successor not in reverseGraphDict:
+                reverseGraphDict[successor] = dict()
+            reverseGraphDict[successor][edge] = length
+            
+    Logger.info("{}Done".format(constants.PRINT_PREFIX_GRAPH))
+    return reverseGraphDict
+
+
+def exportReverseGraph(reverseGraphDict, edgeIds, edgeIndexes):
+    """
+    Writes the reverse graph in an output file
+    """
+    exportGraph(reverseGraphDict, edgeIds, edgeIndexes, constants.SUMO_REVERSE_GRAPH_FILE)
+    
+    
+def importReverseGraph(registry):
+    """
+    Reads the reverse graph from an input file
+    """
+    return importGraph(registry, constants.SUMO_REVERSE_GRAPH_FILE)
+
+
+
+"""
+============================================================================================================================================
+===                                                 JUNCTIONS COORDINATES DICTIONARY MANAGEMENT (22)                                         ===
+============================================================================================================================================
+"""
+def exportCoordinates(coordsDict, junctionIds, dictionaryFile):
+    """
+    Writes a coordinates dictionary in an output binary file (See binaryDictionary.py), as the coordinates of each junction index (See idRegistry.py).
+    Nothing is stored if the dictionary is empty
+    """
+    xs = array('d')
+    ys = array('d')
+    if coordsDict:
+        for junctionId in junctionIds:
+            xs.append(coordsDict[junctionId][0])
+            ys.append(coordsDict[junctionId][1])
+    exportDictionary(dictionaryFile, [], [xs, ys])
+
+
+def exportJunctionsCoordinatesDictionary(junctionsCoordsDict, junctionIds):
+    """
+    Writes the junctions coordinates dictionary in an output binary file (See binaryDictionary.py)
+    """
+    Logger.info("{}Exporting junctions coordinates dictionary...".format(constants.PRINT_PREFIX_GRAPH))
+    exportCoordinates(junctionsCoordsDict, junctionIds, constants.SUMO_JUNCTIONS_COORDS_DICTIONARY_FILE)
+    Logger.info("{}Done".format(constants.PRINT_PREFIX_GRAPH))
+    
+    
+def importJunctionsCoordinatesDictionary(registry):
+    """
+    Reads the junctions coordinates dictionary from an input binary file. The coordinates are decoded when accessed
+    """
+    Logger.info("{}Importing junctions coordinates dictionary...".format(constants.PRINT_PREFIX_GRAPH))
+    strings, arrays = importDictionary(constants.SUMO_JUNCTIONS_COORDS_DICTIONARY_FILE)
+    junctionsCoordsDict = MappedCoordinates(registry, *arrays)
+    Logger.info("{}Done".format(constants.PRINT_PREFIX_GRAPH))
+    return junctionsCoordsDict
+
+
+"""
+============================================================================================================================================
+===                                                   EDGES ATTRIBUTES DICTIONARY MANAGEMENT (25)                                            ===
+============================================================================================================================================
+"""
+def exportEdgesAttributesDictionary(edgesAttributesDict, edgeIds):
+    """
+    Writes the edges attributes dictionary in an output binary file (See binaryDictionary.py), as the attributes of each edge index (See idRegistry.py).
+    The functions names are the file strings table
+    """
+    Logger.info("{}Exporting edges attributes dictionary...".format(constants.PRINT_PREFIX_GRAPH))
+    strings, indexes = getStringsTable(set(attributes[4] for attributes in edgesAttributesDict.itervalues()))
     
-    line = graphFile.readline()[0:-1]
-    while line:
-        lineArray = line.split(constants.SEPARATOR)
-        junctionNode = lineArray[0]
-        graphDict[junctionNode] = dict()
+    lengths = array('d')
+    lanesNumbers = array('i')
+    speeds = array('d')
+    priorities = array('i')
+    functions = array('i')
+    for edgeId in edgeIds:
+        length, lanesNumber, speed, priority, function = edgesAttributesDict[edgeId]
+        lengths.append(length)
+        lanesNumbers.append(lanesNumber)
+        speeds.append(speed)
+        priorities.append(priority)
+        functions.append(indexes[function])
         
-        i = 1
-        while i < len(lineArray):
-            junctionSuccessor = lineArray[i]
-            edgeLength = lineArray[i + 1]
-            graphDict[junctionNode][junctionSuccessor] = float(edgeLength)
-            i += 2
+    exportDictionary(constants.SUMO_EDGES_ATTRIBUTES_DICTIONARY_FILE, strings, [lengths, lanesNumbers, speeds, priorities, functions])
+    Logger.info("{}Done".format(constants.PRINT_PREFIX_GRAPH))
+    
+    
+def importEdgesAttributesDictionary(registry):
+    """
+    Reads the edges attributes dictionary from an input binary file. The attributes are decoded when accessed
+    """
+    Logger.info("{}Importing edges attributes dictionary...".format(constants.PRINT_PREFIX_GRAPH))
+    strings, arrays = importDictionary(constants.SUMO_EDGES_ATTRIBUTES_DICTIONARY_FILE)
+    edgesAttributesDict = MappedEdgesAttributes(registry, strings, *arrays)
+    Logger.info("{}Done".format(constants.PRINT_PREFIX_GRAPH))
+    return edgesAttributesDict
+
 
-        line = graphFile.readline()[0:-1]
+
+"""
+============================================================================================================================================
+===                                                        SPATIAL INDEX MANAGEMENT (26)                                                     ===
+============================================================================================================================================
+"""
+def exportSpatialIndex(spatialIndex):
+    """
+    Writes the spatial index in an output binary file (See binaryDictionary.py)
+    """
+    Logger.info("{}Exporting spatial index...".format(constants.PRINT_PREFIX_GRAPH))
+    exportDictionary(constants.SUMO_SPATIAL_INDEX_FILE, [], spatialIndex.getArrays(), (constants.SPATIAL_INDEX_CELL_SIZE,))
+    Logger.info("{}Done".format(constants.PRINT_PREFIX_GRAPH))
+    
     
-    graphFile.close()
+def importSpatialIndex(registry):
+    """
+    Reads the spatial index from an input binary file, and the network projection used to convert geographic coordinates
+    """
+    Logger.info("{}Importing spatial index...".format(constants.PRINT_PREFIX_GRAPH))
+    strings, arrays = importDictionary(constants.SUMO_SPATIAL_INDEX_FILE)
+    spatialIndex = SpatialIndex(registry.edgeIds, *arrays)
+    projection = readProjection(constants.SUMO_NETWORK_FILE)
+    if projection is not None and projection.isSupported():
+        spatialIndex.projection = projection
     Logger.info("{}Done".format(constants.PRINT_PREFIX_GRAPH))
-    return graphDict
+    return spatialIndex
+
+
+
+"""
+============================================================================================================================================
+===                                            JUNCTIONS GEOGRAPHIC COORDINATES DICTIONARY MANAGEMENT (24)                                   ===
+============================================================================================================================================
+"""
+def buildJunctionsGeographicCoordinatesDictionary(junctionsCoordsDict, projection):
+    """
+    Returns the junctions geographic coordinates dictionary, empty if there is no supported projection
+    """
+    junctionsGeoCoordsDict = dict()
+    if projection is None or not projection.isSupported():
+        Logger.warning("{}Unsupported network projection, the junctions geographic coordinates will be computed by SUMO".format(constants.PRINT_PREFIX_GRAPH))
+        return junctionsGeoCoordsDict
+    
+    junctionIds = junctionsCoordsDict.keys()
+    lons, lats = projection.convertGeoArrays([junctionsCoordsDict[junctionId][0] for junctionId in junctionIds], [junctionsCoordsDict[junctionId][1] for junctionId in junctionIds])
+    for junctionId, lon, lat in zip(junctionIds, lons, lats):
+        junctionsGeoCoordsDict[junctionId] = (lon, lat)
+    return junctionsGeoCoordsDict
+
+
+def exportJunctionsGeographicCoordinatesDictionary(junctionsGeoCoordsDict, junctionIds):
+    """
+    Writes the junctions geographic coordinates dictionary in an output binary file (See binaryDictionary.py)
+    """
+    Logger.info("{}Exporting junctions geographic coordinates dictionary...".format(constants.PRINT_PREFIX_GRAPH))
+    exportCoordinates(junctionsGeoCoordsDict, junctionIds, constants.SUMO_JUNCTIONS_GEO_COORDS_DICTIONARY_FILE)
+    Logger.info("{}Done".format(constants.PRINT_PREFIX_GRAPH))
+    
+    
+def importJunctionsGeographicCoordinatesDictionary(registry):
+    """
+    Reads the junctions geographic coordinates dictionary from an input binary file. The coordinates are decoded when accessed
+    """
+    Logger.info("{}Importing junctions geographic coordinates dictionary...".format(constants.PRINT_PREFIX_GRAPH))
+    strings, arrays = importDictionary(constants.SUMO_JUNCTIONS_GEO_COORDS_DICTIONARY_FILE)
+    junctionsGeoCoordsDict = MappedCoordinates(registry, *arrays)
+    Logger.info("{}Done".format(constants.PRINT_PREFIX_GRAPH))
+    return junctionsGeoCoordsDict
+
+
+
+"""
+============================================================================================================================================
+===                                                     LANES LINKS DICTIONARY MANAGEMENT (28)                                             ===
+============================================================================================================================================
+"""
+def exportLanesLinksDictionary(lanesLinksDict, edgesAttributesDict, edgeIds, edgeIndexes):
+    """
+    Writes the lanes links dictionary in an output binary file (See binaryDictionary.py), as the links of each lane of each edge index (See idRegistry.py).
+    The lanes number of each edge is read from the edges attributes dictionary (25)
+    """
+    Logger.info("{}Exporting lanes links dictionary...".format(constants.PRINT_PREFIX_GRAPH))
+    lanesOffsets = array('i', [0])
+    linksOffsets = array('i', [0])
+    outEdges = array('i')
+    outLanes = array('i')
+    linkIndexes = array('i')
+    for edgeId in edgeIds:
+        for laneIndex in xrange(edgesAttributesDict[edgeId][1]):
+            for outLane, linkIndex in lanesLinksDict.get((edgeId, laneIndex), ()):
+                outEdge, outLaneIndex = outLane.rsplit('_', 1)
+                outEdges.append(edgeIndexes[outEdge])
+                outLanes.append(int(outLaneIndex))
+                linkIndexes.append(linkIndex)
+            linksOffsets.append(len(outEdges))
+        lanesOffsets.append(len(linksOffsets) - 1)
+        
+    exportDictionary(constants.SUMO_LANES_LINKS_DICTIONARY_FILE, [], [lanesOffsets, linksOffsets, outEdges, outLanes, linkIndexes])
+    Logger.info("{}Done".format(constants.PRINT_PREFIX_GRAPH))
+    
+    
+def importLanesLinksDictionary(registry):
+    """
+    Reads the lanes links dictionary from an input binary file. The links are decoded when accessed
+    """
+    Logger.info("{}Importing lanes links dictionary...".format(constants.PRINT_PREFIX_GRAPH))
+    strings, arrays = importDictionary(constants.SUMO_LANES_LINKS_DICTIONARY_FILE)
+    lanesLinksDict = MappedLanesLinks(registry, *arrays)
+    Logger.info("{}Done".format(constants.PRINT_PREFIX_GRAPH))
+    return lanesLinksDict
 
 
 
@@ -269,9 +518,10 @@ def importGraph():
 class NetworkHandler(xml.sax.ContentHandler):
     """
     SAX handler used for parsing a SUMO network file in order to build
-    a graph, junctions and edges dictionary
+    a graph, junctions, edges and junctions coordinates dictionary.
+    The graph arcs are the connections of the network file, each one weighted by the length of its destination lane
     """
-    def __init__(self, graphDict, junctionsDict, edgesDict, mtraci):
+    def __init__(self, graphDict, junctionsDict, edgesDict, junctionsCoordsDict, edgesAttributesDict):
         xml.sax.ContentHandler.__init__(self)
         self.junctionFrom = ''
         self.junctionTo = ''
@@ -279,7 +529,13 @@ class NetworkHandler(xml.sax.ContentHandler):
         self.graphDict = graphDict
         self.junctionsDict = junctionsDict
         self.edgesDict = edgesDict
-        self.mtraci = mtraci
+        self.junctionsCoordsDict = junctionsCoordsDict
+        self.edgesAttributesDict = edgesAttributesDict
+        self.edgesShapes = dict()
+        self.lanesLinksDict = dict()
+        self.lanesLength = dict()
+        self.connections = []
+        self.projection = None
 
     def startElement(self, name, attrs):
         if name == constants.XML_EDGE_ELEMENT:
@@ -306,31 +562,75 @@ class NetworkHandler(xml.sax.ContentHandler):
                 if not self.edgeId in self.graphDict:
                     self.graphDict[self.edgeId] = dict()
                     
+                # Edges attributes (the length, lanes number and speed limit are set by the lanes)
+                priority = attrs.get(constants.XML_EDGE_PRIORITY)
+                if priority is None:
+                    priority = constants.XML_EDGE_DEFAULT_PRIORITY
+                function = attrs.get(constants.XML_EDGE_FUNCTION, constants.XML_EDGE_DEFAULT_FUNCTION)
+                self.edgesAttributesDict[self.edgeId] = [0.0, 0, 0.0, int(priority), str(function)]
+                    
                     
         elif name == constants.XML_LANE_ELEMENT:
             laneId = attrs.get(constants.XML_LANE_ID)
             if laneId[0] != ':':
-                laneId = str(laneId)
-                self.mtraci.acquire()
-                links = traci.lane.getLinks(laneId)
-                self.mtraci.release()
+                length = float(attrs.get(constants.XML_LANE_LENGTH))
+                self.lanesLength[str(laneId)] = length
+                
+                shape = [point.split(',') for point in attrs.get(constants.XML_LANE_SHAPE).split()]
+                self.edgesShapes.setdefault(self.edgeId, []).append([(float(point[0]), float(point[1])) for point in shape])
+                
+                edgeAttributes = self.edgesAttributesDict[self.edgeId]
+                edgeAttributes[1] += 1
+                if attrs.get(constants.XML_LANE_INDEX) == '0':
+                    edgeAttributes[0] = length
+                    edgeAttributes[2] = float(attrs.get(constants.XML_LANE_SPEED))
+                    
+                    
+        elif name == constants.XML_CONNECTION_ELEMENT:
+            edgeFrom = attrs.get(constants.XML_CONNECTION_FROM)
+            if edgeFrom[0] != ':':
+                # The lanes length may be unknown yet, the connections are added to the graph at the end of the document
+                edgeTo = str(attrs.get(constants.XML_CONNECTION_TO))
+                laneTo = str(attrs.get(constants.XML_CONNECTION_TO_LANE))
+                self.connections.append((str(edgeFrom), edgeTo, laneTo))
                 
-                for successorLaneId in links:
-                    successorEdgeId = successorLaneId[0].split('_')[0]
+                # Lanes links
+                linkIndex = attrs.get(constants.XML_CONNECTION_LINK_INDEX)
+                if linkIndex is None:
+                    linkIndex = constants.XML_CONNECTION_NO_LINK_INDEX
+                laneFrom = (str(edgeFrom), int(attrs.get(constants.XML_CONNECTION_FROM_LANE)))
+                self.lanesLinksDict.setdefault(laneFrom, []).append((edgeTo + '_' + laneTo, int(linkIndex)))
+                    
                     
-                    self.mtraci.acquire()
-                    length = traci.lane.getLength(successorLaneId[0])
-                    self.mtraci.release()
+        elif name == constants.XML_JUNCTION_ELEMENT:
+            junctionId = attrs.get(constants.XML_JUNCTION_ID)
+            if junctionId[0] != ':':
+                x = float(attrs.get(constants.XML_JUNCTION_X))
+                y = float(attrs.get(constants.XML_JUNCTION_Y))
+                self.junctionsCoordsDict[str(junctionId)] = (x, y)
                     
-                    self.graphDict[self.edgeId][successorEdgeId] = length
+                    
+        elif name == constants.XML_LOCATION_ELEMENT:
+            self.projection = Projection(attrs.get(constants.XML_LOCATION_NET_OFFSET), attrs.get(constants.XML_LOCATION_PROJECTION))
+                
+    def endDocument(self):
+        for edgeFrom, edgeTo, laneTo in self.connections:
+            self.graphDict[edgeFrom][edgeTo] = self.lanesLength[edgeTo + '_' + laneTo]
+        for edgeId, edgeAttributes in self.edgesAttributesDict.iteritems():
+            self.edgesAttributesDict[edgeId] = tuple(edgeAttributes)
 
 
-def buildGraphAndJunctionsDictionaryAndEdgesDictionary(mtraci):
+def buildGraphAndJunctionsDictionaryAndEdgesDictionary():
     """
     Returns
     - A graph built as a dictionary as {Key=junctionId, Value=Dict as{Key=junction successor, Value=edge length between the junctions}
     - A junctions dictionary as {Key=junctionId, Value=[Set(edgesId predecessors of the junction), Set(edgesId successors of the junction)]
     - An edges dictionary as {Key=edgeId, Value=[junction predecessor, junction successor]
+    - A junctions coordinates dictionary as {Key=junctionId, Value=(x, y)}
+    - A junctions geographic coordinates dictionary as {Key=junctionId, Value=(lon, lat)}
+    - An edges attributes dictionary as {Key=edgeId, Value=(length, lanes number, speed limit, priority, function)}
+    - The lanes shapes of each edge as {Key=edgeId, Value=[lane shape 1 [(x1, y1), ..., (xN, yN)], ..., lane shape N]}
+    - A lanes links dictionary as {Key=(edgeId, lane index), Value=[(out laneId, link index)]}
     """
     Logger.info("{}Building graph, junctions dictionary and edges dictionary...".format(constants.PRINT_PREFIX_GRAPH))
     
@@ -338,30 +638,52 @@ def buildGraphAndJunctionsDictionaryAndEdgesDictionary(mtraci):
     graphDict = dict()
     junctionsDict = dict()
     edgesDict = dict()
+    junctionsCoordsDict = dict()
+    edgesAttributesDict = dict()
         
     # Parsing XML network file
     parser = xml.sax.make_parser()
-    parser.setContentHandler(NetworkHandler(graphDict, junctionsDict, edgesDict, mtraci))
+    handler = NetworkHandler(graphDict, junctionsDict, edgesDict, junctionsCoordsDict, edgesAttributesDict)
+    parser.setContentHandler(handler)
     parser.parse(constants.SUMO_NETWORK_FILE)
+    junctionsGeoCoordsDict = buildJunctionsGeographicCoordinatesDictionary(junctionsCoordsDict, handler.projection)
         
     Logger.info("{}Done".format(constants.PRINT_PREFIX_GRAPH))
-    return graphDict, junctionsDict, edgesDict
+    return graphDict, junctionsDict, edgesDict, junctionsCoordsDict, junctionsGeoCoordsDict, edgesAttributesDict, handler.edgesShapes, handler.lanesLinksDict
 
 
-def getGraphAndJunctionsDictionaryAndEdgesDictionary(mtraci):
+def getGraphAndJunctionsDictionaryAndEdgesDictionary():
     """
-    Returns the graph(*), junctions(**) and edges(***) dictionary. This one is obtained from a text file, updated if new map data are detected
+    Returns the graph(21), junctions(19), edges(20), junctions coordinates(22), reverse graph(23), junctions geographic coordinates(24), edges attributes(25) dictionary, the spatial index(26), the ID registry(27) and the lanes links dictionary(28). This one is obtained from a binary file, updated if new map data are detected
     """
-    if isDictionaryOutOfDate(constants.SUMO_JUNCTIONS_DICTIONARY_FILE, constants.SUMO_NETWORK_FILE) or isDictionaryOutOfDate(constants.SUMO_EDGES_DICTIONARY_FILE, constants.SUMO_NETWORK_FILE) or isDictionaryOutOfDate(constants.SUMO_GRAPH_FILE, constants.SUMO_NETWORK_FILE):
-        graphDict, junctionsDict, edgesDict = buildGraphAndJunctionsDictionaryAndEdgesDictionary(mtraci)
-        exportGraph(graphDict)
-        exportJunctionsDictionary(junctionsDict)
-        exportEdgesDictionary(edgesDict)
-    else:
-        graphDict = importGraph()
-        junctionsDict = importJunctionsDictionary()
-        edgesDict = importEdgesDictionary()
-    return graphDict, junctionsDict, edgesDict
+    dictionaryFiles = [constants.SUMO_IDS_DICTIONARY_FILE, constants.SUMO_JUNCTIONS_DICTIONARY_FILE, constants.SUMO_EDGES_DICTIONARY_FILE, constants.SUMO_GRAPH_FILE, constants.SUMO_JUNCTIONS_COORDS_DICTIONARY_FILE, constants.SUMO_REVERSE_GRAPH_FILE, constants.SUMO_JUNCTIONS_GEO_COORDS_DICTIONARY_FILE, constants.SUMO_EDGES_ATTRIBUTES_DICTIONARY_FILE, constants.SUMO_LANES_LINKS_DICTIONARY_FILE]
+    if [dictionaryFile for dictionaryFile in dictionaryFiles if isDictionaryOutOfDate(dictionaryFile, constants.SUMO_NETWORK_FILE)] or isDictionaryOutOfDate(constants.SUMO_SPATIAL_INDEX_FILE, constants.SUMO_NETWORK_FILE, (constants.SPATIAL_INDEX_CELL_SIZE,)):
+        graphDict, junctionsDict, edgesDict, junctionsCoordsDict, junctionsGeoCoordsDict, edgesAttributesDict, edgesShapes, lanesLinksDict = buildGraphAndJunctionsDictionaryAndEdgesDictionary()
+        reverseGraphDict = buildReverseGraph(graphDict)
+        edgeIds, junctionIds, edgeIndexes, junctionIndexes, oppositeEdges = buildIdRegistry(edgesDict, set(junctionsDict) | set(junctionsCoordsDict))
+        exportIdRegistry(edgeIds, junctionIds, oppositeEdges)
+        exportGraph(graphDict, edgeIds, edgeIndexes)
+        exportJunctionsDictionary(junctionsDict, junctionIds, edgeIndexes)
+        exportEdgesDictionary(edgesDict, edgeIds, junctionIndexes)
+        exportJunctionsCoordinatesDictionary(junctionsCoordsDict, junctionIds)
+        exportReverseGraph(reverseGraphDict, edgeIds, edgeIndexes)
+        exportJunctionsGeographicCoordinatesDictionary(junctionsGeoCoordsDict, junctionIds)
+        exportEdgesAttributesDictionary(edgesAttributesDict, edgeIds)
+        exportSpatialIndex(buildSpatialIndex(edgeIds, edgesShapes))
+        exportLanesLinksDictionary(lanesLinksDict, edgesAttributesDict, edgeIds, edgeIndexes)
+        
+    # The dictionaries are imported even after being built, so that the dictionaries are always decoded in the same way
+    registry = importIdRegistry()
+    graphDict = importGraph(registry)
+    junctionsDict = importJunctionsDictionary(registry)
+    edgesDict = importEdgesDictionary(registry)
+    junctionsCoordsDict = importJunctionsCoordinatesDictionary(registry)
+    reverseGraphDict = importReverseGraph(registry)
+    junctionsGeoCoordsDict = importJunctionsGeographicCoordinatesDictionary(registry)
+    edgesAttributesDict = importEdgesAttributesDictionary(registry)
+    spatialIndex = importSpatialIndex(registry)
+    lanesLinksDict = importLanesLinksDictionary(registry)
+    return graphDict, junctionsDict, edgesDict, junctionsCoordsDict, reverseGraphDict, junctionsGeoCoordsDict, edgesAttributesDict, spatialIndex, registry, lanesLinksDict
 
 
 
@@ -421,10 +743,12 @@ def getMaximumEdgesPerMessage(informationType):
         return  constants.SUCCESSORS_NUMBER_PER_MESSAGE
 
 
-def sendEdgesDetails(edges, outputSocket, mtraci, informationType, dictionary, uniqueMsg):
+def sendEdgesDetails(edges, outputSocket, mtraci, informationType, dictionary, uniqueMsg, junctionsGeoCoordsDict=None):
     """
     Send information messages to Client, followed by and end message.
-    The dictionary must be the edgesDictionary if an edges coordinates () request is specified
+    The dictionary must be the edgesDictionary if an edges coordinates () request is specified,
+    the junctions geographic coordinates being read from junctionsGeoCoordsDict (24)
+    The dictionary must be the edgesAttributesDictionary if an edges length () request is specified
     The dictionary must be the graphDictionary if a graph () or successors () request is specified
     """    
     edgesNumber = 0
@@ -450,12 +774,16 @@ def sendEdgesDetails(edges, outputSocket, mtraci, informationType, dictionary, u
                 edgesJunctions = dictionary[edge]
                 
                 # Getting geographic coordinates of the two junctions center
-                mtraci.acquire()
-                predecessorCoords = traci.junction.getPosition(edgesJunctions[0])
-                predecessorCoordsGeo = traci.simulation.convertGeo(predecessorCoords[0], predecessorCoords[1], False)
-                successorCoords = traci.junction.getPosition(edgesJunctions[1])
-                successorCoordsGeo = traci.simulation.convertGeo(successorCoords[0], successorCoords[1], False)
-                mtraci.release()
+                if edgesJunctions[0] in junctionsGeoCoordsDict and edgesJunctions[1] in junctionsGeoCoordsDict:
+                    predecessorCoordsGeo = junctionsGeoCoordsDict[edgesJunctions[0]]
+                    successorCoordsGeo = junctionsGeoCoordsDict[edgesJunctions[1]]
+                else:
+                    mtraci.acquire()
+                    predecessorCoords = traci.junction.getPosition(edgesJunctions[0])
+                    predecessorCoordsGeo = traci.simulation.convertGeo(predecessorCoords[0], predecessorCoords[1], False)
+                    successorCoords = traci.junction.getPosition(edgesJunctions[1])
+                    successorCoordsGeo = traci.simulation.convertGeo(successorCoords[0], successorCoords[1], False)
+                    mtraci.release()
     
                 # Adding to the current message
                 edgesMsg.append(str(predecessorCoordsGeo[0]))
@@ -468,12 +796,8 @@ def sendEdgesDetails(edges, outputSocket, mtraci, informationType, dictionary, u
             
             # EDGES LENGTH
             elif(informationType == constants.EDGES_LENGTH):
-                lane = edge + '_0'
-                
                 # Getting edge length
-                mtraci.acquire()
-                length = traci.lane.getLength(lane)
-                mtraci.release()
+                length = dictionary[edge][0]
                 
                 # Adding to the current message
                 edgesMsg.append(str(length))
@@ -545,9 +869,11 @@ def sendEdgesDetails(edges, outputSocket, mtraci, informationType, dictionary, u
         Logger.infoFile("{} Message sent: {}".format(constants.PRINT_PREFIX_GRAPH, strmsg))
     
     
-def blockEdges(mtraci, edgesBlocked, idCpt, outputSocket):
+def blockEdges(mtraci, edgesBlocked, idCpt, edgesAttributesDict, registry, routeCache, edgeClosures, outputSocket):
     """
-    Blocks edges in the SUMO simulated network by adding stopped vehicles
+    Blocks edges in the SUMO simulated network by adding a stopped vehicle on each lane not blocked yet, and drops the cached routes going through them.
+    The blocked lanes are recorded, the edges whose lanes are all blocked being closed to the routing engines (See edgeClosures.py).
+    The lanes number and length of the edges are read from the edges attributes dictionary (25)
     """
     cpt = 1
     i = 0
@@ -563,10 +889,27 @@ def blockEdges(mtraci, edgesBlocked, idCpt, outputSocket):
             sendAck(constants.PRINT_PREFIX_GRAPH, constants.GRAPH_INVALID_BLOCK_MSG, outputSocket)
             return cpt
         
+        if nbLanesBlocked < -1:
+            sendAck(constants.PRINT_PREFIX_GRAPH, constants.GRAPH_INVALID_BLOCK_MSG, outputSocket)
+            return cpt
+        
+        if not edgeBlocked in edgesAttributesDict:
+            sendAck(constants.PRINT_PREFIX_GRAPH, constants.GRAPH_UNKNOWN_EDGE, outputSocket)
+            return cpt
+        
+        edgeIndex = registry.getEdgeIndex(edgeBlocked)
+        edgeLength, lanesNumber = edgesAttributesDict[edgeBlocked][0:2]
+        blockedLanes = set(edgeClosures.getBlockedLanes(edgeIndex))
+        freeLanes = [laneIndex for laneIndex in xrange(lanesNumber) if laneIndex not in blockedLanes]
+        if nbLanesBlocked != -1:
+            freeLanes = freeLanes[:nbLanesBlocked]
+        
+        # Nothing to block: no route is added, so that the next edge gets an unused route ID
+        if not freeLanes:
+            continue
+        
         routeId = constants.BLOCKED_ROUTE_ID_PREFIX + str(idCpt + cpt)
         route = [edgeBlocked]
-        laneIndex = 0
-        laneBlocked = edgeBlocked + '_0'
         
         try:
             mtraci.acquire()
@@ -576,63 +919,66 @@ def blockEdges(mtraci, edgesBlocked, idCpt, outputSocket):
             mtraci.release()
             sendAck(constants.PRINT_PREFIX_GRAPH, constants.GRAPH_UNKNOWN_EDGE, outputSocket)
             return cpt
+        
+        routeCache.blockEdges([edgeIndex])
+        
+        stopPosition = edgeLength / 2.0
             
-        while laneIndex != nbLanesBlocked - 1:
-            vehicleId = constants.BLOCKED_VEHICLE_ID_PREFIX + str(idCpt + cpt)
-            # TODO: improve, we can use the lane number by adding it to a dictionary when parsing the network
-            try:
-                mtraci.acquire()
-                laneLength = traci.lane.getLength(laneBlocked)
-                mtraci.release()
-            except:
-                mtraci.release()
-                break
-               
-            laneLength /= 2.0
-    
-            mtraci.acquire()
-            traci.vehicle.add(vehicleId, routeId, -2, 0, 0, 0, constants.DEFAULT_VEHICLE_TYPE)
-            traci.vehicle.setStop(vehicleId, edgeBlocked, laneLength, laneIndex, 2147483646)
+        mtraci.acquire()
+        try:
+            for laneIndex in freeLanes:
+                vehicleId = constants.BLOCKED_VEHICLE_ID_PREFIX + str(idCpt + cpt)
+                traci.vehicle.add(vehicleId, routeId, -2, 0, 0, 0, constants.DEFAULT_VEHICLE_TYPE)
+                traci.vehicle.setStop(vehicleId, edgeBlocked, stopPosition, laneIndex, 2147483646)
+                edgeClosures.blockLane(edgeIndex, laneIndex, vehicleId, lanesNumber)
+                cpt += 1
+        except traci.TraCIException:
+            # The lanes blocked so far remain recorded, the next request skipping the ID of the failed vehicle
+            sendAck(constants.PRINT_PREFIX_GRAPH, constants.GRAPH_BLOCK_FAILED, outputSocket)
+            return cpt
+        finally:
             mtraci.release()
             
-            cpt += 1
-            laneIndex += 1
-            laneBlocked = laneBlocked[:-1] + str(laneIndex)
-            
     sendAck(constants.PRINT_PREFIX_GRAPH, returnCode, outputSocket)
     return cpt
 
                 
-def unblockEdges(mtraci, edgesBlocked, outputSocket):
+def unblockEdges(mtraci, edgesBlocked, registry, routeCache, edgeClosures, outputSocket):
     """
-    Unblocks edges in the SUMO simulated network by removing blocked vehicle previously added
+    Unblocks edges in the SUMO simulated network by removing the blocking vehicle of each blocked lane,
+    opens them to the routing engines and drops the routes cached while these edges were blocked
     """
     returnCode = constants.ACK_OK
     
     for edgeBlocked in edgesBlocked:
         try:
-            mtraci.acquire()
-            blockedVehicles = traci.edge.getLastStepVehicleIDs(edgeBlocked)
-            mtraci.release()
-        except:
-            mtraci.release()
+            edgeIndex = registry.getEdgeIndex(edgeBlocked)
+        except KeyError:
             sendAck(constants.PRINT_PREFIX_GRAPH, constants.GRAPH_UNKNOWN_EDGE, outputSocket)
             return
             
-        for blockedVehicle in blockedVehicles:
-            if blockedVehicle.startswith(constants.BLOCKED_VEHICLE_ID_PREFIX):
-                mtraci.acquire()
-                traci.vehicle.remove(blockedVehicle)
-                mtraci.release()
+        mtraci.acquire()
+        try:
+            for laneIndex in edgeClosures.getBlockedLanes(edgeIndex):
+                blockedVehicle = edgeClosures.unblockLane(edgeIndex, laneIndex)
+                try:
+                    traci.vehicle.remove(blockedVehicle)
+                except traci.TraCIException:
+                    # The blocking vehicle has already left the simulation (e.g. teleported)
+                    pass
+        finally:
+            mtraci.release()
+        
+        routeCache.unblockEdges([edgeIndex])
                 
     sendAck(constants.PRINT_PREFIX_GRAPH, returnCode, outputSocket)
     
     
-def sendEdgeId(mtraci, lon, lat, outputSocket):
+def sendEdgeId(mtraci, lon, lat, spatialIndex, outputSocket):
     """
     Sends an edge ID calculated from geographic coordinates to the remote client
     """
-    edgeId = getEdgeFromCoords(lon, lat, mtraci)
+    edgeId = getEdgeFromCoords(float(lon), float(lat), spatialIndex, mtraci)
     
     routeCoordsMsg = []
     routeCoordsMsg.append(constants.EDGE_ID_RESPONSE_HEADER)
@@ -648,16 +994,12 @@ def sendEdgeId(mtraci, lon, lat, outputSocket):
     Logger.infoFile("{} Message sent: {}".format(constants.PRINT_PREFIX_GRAPH, strmsg))
         
 
-def run(mtraci, inputSocket, outputSocket, eShutdown, eGraphReady, eManagerReady, graphDict, edgesDict):
+def run(mtraci, inputSocket, outputSocket, eShutdown, eGraphReady, eManagerReady, graphDict, edgesDict, junctionsGeoCoordsDict, edgesAttributesDict, spatialIndex, registry, routeCache, edgeClosures, edges):
     """
     See file description
     """
     bufferSize = 32768
     blockedIdCpt = 0
-                        
-    mtraci.acquire()
-    edges = traci.edge.getIDList()
-    mtraci.release()
     
     eGraphReady.set()
     while not eManagerReady.is_set():
@@ -695,23 +1037,23 @@ def run(mtraci, inputSocket, outputSocket, eShutdown, eGraphReady, eManagerReady
                     #===== EDGES COORDINATES =====
                     # Send all edges coordinates to Client
                     if commandSize == 1 and command[0] == constants.ALL_EDGES_COORDS_REQUEST_HEADER:
-                        sendEdgesDetails(edges, outputSocket, mtraci, constants.EDGES_COORDS, edgesDict, False)
+                        sendEdgesDetails(edges, outputSocket, mtraci, constants.EDGES_COORDS, edgesDict, False, junctionsGeoCoordsDict)
                     
                     # Send the specified edges coordinates to Client    
                     elif commandSize > 1 and command[0] == constants.EDGES_COORDS_REQUEST_HEADER:
                         command.pop(0)
-                        sendEdgesDetails(command, outputSocket, mtraci, constants.EDGES_COORDS, edgesDict, True)
+                        sendEdgesDetails(command, outputSocket, mtraci, constants.EDGES_COORDS, edgesDict, True, junctionsGeoCoordsDict)
                     
                     
                     #===== EDGES LENGTH =====
                     # Send all edges length to Client
                     elif commandSize == 1 and command[0] == constants.ALL_EDGES_LENGTH_REQUEST_HEADER:
-                        sendEdgesDetails(edges, outputSocket, mtraci, constants.EDGES_LENGTH, None, False)
+                        sendEdgesDetails(edges, outputSocket, mtraci, constants.EDGES_LENGTH, edgesAttributesDict, False)
                     
                     # Send the specified edges length to Client    
                     elif commandSize > 1 and command[0] == constants.EDGES_LENGTH_REQUEST_HEADER:
                         command.pop(0)
-                        sendEdgesDetails(command, outputSocket, mtraci, constants.EDGES_LENGTH, None, True)
+                        sendEdgesDetails(command, outputSocket, mtraci, constants.EDGES_LENGTH, edgesAttributesDict, True)
                     
                     
                     #===== EDGES CONGESTION =====
@@ -740,18 +1082,18 @@ def run(mtraci, inputSocket, outputSocket, eShutdown, eGraphReady, eManagerReady
                     # Block edges in the SUMO simulation
                     elif commandSize > 2 and command[0] == constants.BLOCK_EDGE_REQUEST_HEADER:
                         command.pop(0)
-                        blockedIdCpt += blockEdges(mtraci, command, blockedIdCpt, outputSocket)
+                        blockedIdCpt += blockEdges(mtraci, command, blockedIdCpt, edgesAttributesDict, registry, routeCache, edgeClosures, outputSocket)
                         
                     # Unblock edges in the SUMO simulation
                     elif commandSize > 1 and command[0] == constants.UNBLOCK_EDGE_REQUEST_HEADER:
                         command.pop(0)
-                        unblockEdges(mtraci, command, outputSocket)
+                        unblockEdges(mtraci, command, registry, routeCache, edgeClosures, outputSocket)
                         
                         
                     #===== EDGE ID =====
                     # Sending an edge ID from geographic coordinates
                     elif commandSize == 3 and command[0] == constants.EDGE_ID_REQUEST_HEADER:
-                        sendEdgeId(mtraci, command[1], command[2], outputSocket)
+                        sendEdgeId(mtraci, command[1], command[2], spatialIndex, outputSocket)
                         
                         
                     #===== UNKNOWN REQUEST =====
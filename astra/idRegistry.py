@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+"""
+@file    idRegistry.py
+@author  ASTra team
+@date    16/10/2026
+
+This file contains the ID registry, which interns the edges and junctions ID of the network to dense integers.
+
+Every network dictionary (See graph.py), the routing graph (See routingGraph.py), the route cache (See routeCache.py)
+and the spatial index (See spatialIndex.py) only handle these integers. The ID are translated at the sockets boundary:
+from strings when a request is received, to strings when a response is sent.
+
+Indexes:
+    - The edges index are the ranks of the edges ID sorted (internal edges excluded)
+    - The junctions index are the ranks of the junctions ID sorted (internal junctions excluded)
+    - The opposite edge of each edge index (See sharedFunctions.getOppositeEdge), -1 if this one does not exist
+"""
+
+from array import array
+from sharedFunctions import getOppositeEdge
+
+
+def buildIdRegistry(edgeIds, junctionIds):
+    """
+    Returns the sorted edges ID list, the sorted junctions ID list, the edges index dictionary as {Key=edgeId, Value=edge index},
+    the junctions index dictionary as {Key=junctionId, Value=junction index} and the opposite edges array
+    """
+    edgeIds = sorted(edgeIds)
+    junctionIds = sorted(junctionIds)
+    edgeIndexes = dict((edgeId, i) for i, edgeId in enumerate(edgeIds))
+    junctionIndexes = dict((junctionId, i) for i, junctionId in enumerate(junctionIds))
+    oppositeEdges = array('i', [edgeIndexes.get(getOppositeEdge(edgeId), -1) for edgeId in edgeIds])
+    return edgeIds, junctionIds, edgeIndexes, junctionIndexes, oppositeEdges
+
+
+class IdRegistry(object):
+    """
+    Edges and junctions ID interned to dense integers (See file description)
+    """
+    def __init__(self, edgeIds, junctionIds, oppositeEdges):
+        self.edgeIds = edgeIds
+        self.junctionIds = junctionIds
+        self.oppositeEdges = oppositeEdges
+
+    def getEdgesNumber(self):
+        return len(self.edgeIds)
+
+    def getJunctionsNumber(self):
+        return len(self.junctionIds)
+
+    def getEdgeIndex(self, edgeId):
+        """
+        Returns the index of an edge ID. A KeyError is raised if the edge is unknown
+        """
+        return self.edgeIds.index(edgeId)
+
+    def getEdgeId(self, edgeIndex):
+        return self.edgeIds[edgeIndex]
+
+    def getJunctionIndex(self, junctionId):
+        """
+        Returns the index of a junction ID. A KeyError is raised if the junction is unknown
+        """
+        return self.junctionIds.index(junctionId)
+
+    def getJunctionId(self, junctionIndex):
+        return self.junctionIds[junctionIndex]
+
+    def getOppositeEdgeIndex(self, edgeIndex):
+        """
+        Returns the index of the opposite edge of an edge index, -1 if there is no such edge
+        """
+        return self.oppositeEdges[edgeIndex]
+
+    def getEdgeIds(self, edgeIndexes):
+        """
+        Returns the edges ID of a list of edges index
+        """
+        edgeIds = self.edgeIds
+        return [edgeIds[edgeIndex] for edgeIndex in edgeIndexes]
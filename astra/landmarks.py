@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+
+"""
+@file    landmarks.py
+@author  ASTra team
+@date    16/10/2026
+
+This file contains the landmarks distance oracle of the routing graph (See routingGraph.py), and the ALT
+(A*, Landmarks, Triangle inequality) query engine using it.
+
+Preprocessing (buildLandmarks):
+    The landmarks are picked by farthest point selection: each new landmark is the vertex which maximizes
+    its round trip distance to the closest landmark already picked.
+    For each landmark L, the distances from L to every vertex and from every vertex to L are stored in float32 arrays.
+
+Lower bound of the distance from u to t (triangle inequality), for every landmark L:
+    d(u, t) >= d(L, t) - d(L, u)
+    d(u, t) >= d(u, L) - d(t, L)
+Besides, t cannot be reached from u if d(L, u) is finite while d(L, t) is not, or if d(t, L) is finite while d(u, L) is not.
+
+(1) Landmarks dictionary (binary dictionary, See binaryDictionary.py):
+        Arrays: the K landmarks vertices index (int32), the K float32 tables of distances from the landmarks,
+        then the K float32 tables of distances to the landmarks
+        The vertices index are the dense edges index of the ID registry (See idRegistry.py)
+"""
+
+import constants
+from array import array
+from heapq import heappush
+from heapq import heappop
+from binaryDictionary import exportDictionary
+from binaryDictionary import importDictionary
+from dijkstra import Dijkstra
+from dijkstra import INFINITY
+from logger import Logger
+from sharedFunctions import isDictionaryOutOfDate
+
+""" Relative rounding error of the float32 tables, taken into account so that the lower bounds remain valid """
+FLOAT32_ROUNDING = 1e-7
+
+
+"""
+============================================================================================================================================
+===                                                             PREPROCESSING                                                            ===
+============================================================================================================================================
+"""
+def getFarthestVertex(roundTrips):
+    """
+    Returns the vertex index with the greatest finite round trip distance, -1 if every round trip distance is 0 or infinite
+    """
+    farthestVertex = -1
+    farthest = 0.0
+    for v in xrange(len(roundTrips)):
+        if roundTrips[v] != INFINITY and roundTrips[v] > farthest:
+            farthestVertex = v
+            farthest = roundTrips[v]
+    return farthestVertex
+
+
+def buildLandmarks(routingGraph, landmarksNumber):
+    """
+    Returns the landmarks vertices index, the tables of distances from the landmarks and the tables of distances to the landmarks
+    """
+    Logger.info("{}Building {} landmarks...".format(constants.PRINT_PREFIX_ROUTER, landmarksNumber))
+    reverseGraph = routingGraph.getReverseGraph()
+    verticesNumber = routingGraph.getVerticesNumber()
+    landmarks = []
+    fromTables = []
+    toTables = []
+
+    # The first landmark is the farthest vertex from the vertex 0
+    fromTable = Dijkstra(routingGraph, 0)[0]
+    toTable = Dijkstra(reverseGraph, 0)[0]
+    roundTrips = array('d', [fromTable[v] + toTable[v] for v in xrange(verticesNumber)])
+    candidate = getFarthestVertex(roundTrips)
+
+    while len(landmarks) < landmarksNumber and candidate != -1:
+        fromTable = Dijkstra(routingGraph, candidate)[0]
+        toTable = Dijkstra(reverseGraph, candidate)[0]
+        landmarks.append(candidate)
+        fromTables.append(array('f', fromTable))
+        toTables.append(array('f', toTable))
+
+        # Round trip distance from each vertex to its closest landmark
+        if len(landmarks) == 1:
+            roundTrips = array('d', [INFINITY]) * verticesNumber
+        for v in xrange(verticesNumber):
+            roundTrips[v] = min(roundTrips[v], fromTable[v] + toTable[v])
+        candidate = getFarthestVertex(roundTrips)
+
+    Logger.info("{}Done".format(constants.PRINT_PREFIX_ROUTER))
+    return landmarks, fromTables, toTables
+
+
+
+"""
+============================================================================================================================================
+===                                                   LANDMARKS DICTIONARY MANAGEMENT (1)                                                ===
+============================================================================================================================================
+"""
+def exportLandmarks(landmarks, fromTables, toTables):
+    """
+    Writes the landmarks and their distance tables in an output file
+    """
+    Logger.info("{}Exporting landmarks...".format(constants.PRINT_PREFIX_ROUTER))
+    exportDictionary(constants.SUMO_LANDMARKS_FILE, [], [array('i', landmarks)] + fromTables + toTables, (constants.LANDMARKS_NUMBER,))
+    Logger.info("{}Done".format(constants.PRINT_PREFIX_ROUTER))
+
+
+def importLandmarks():
+    """
+    Reads the landmarks and their distance tables from an input file
+    """
+    Logger.info("{}Importing landmarks...".format(constants.PRINT_PREFIX_ROUTER))
+    strings, arrays = importDictionary(constants.SUMO_LANDMARKS_FILE)
+    landmarks = list(arrays[0])
+    landmarksNumber = len(landmarks)
+    Logger.info("{}Done".format(constants.PRINT_PREFIX_ROUTER))
+    return landmarks, arrays[1:landmarksNumber + 1], arrays[landmarksNumber + 1:]
+
+
+def getLandmarks(routingGraph):
+    """
+    Returns the landmarks of a routing graph. These ones are obtained from a file, updated if new map data are detected
+    """
+    if isDictionaryOutOfDate(constants.SUMO_LANDMARKS_FILE, constants.SUMO_NETWORK_FILE, (constants.LANDMARKS_NUMBER,)):
+        landmarks, fromTables, toTables = buildLandmarks(routingGraph, constants.LANDMARKS_NUMBER)
+        exportLandmarks(landmarks, fromTables, toTables)
+    else:
+        landmarks, fromTables, toTables = importLandmarks()
+    return Landmarks(landmarks, fromTables, toTables)
+
+
+
+"""
+============================================================================================================================================
+===                                                          DISTANCE ORACLE AND QUERY                                                   ===
+============================================================================================================================================
+"""
+class Landmarks(object):
+    """
+    Landmarks distance oracle
+    """
+    def __init__(self, landmarks, fromTables, toTables):
+        self.landmarks = landmarks
+        self.fromTables = fromTables
+        self.toTables = toTables
+
+    def getLowerBound(self, u, t, landmarksIndexes=None):
+        """
+        Returns a lower bound of the distance from the vertex u to the vertex t, using the given landmarks (all by default).
+        INFINITY is returned if t cannot be reached from u
+        """
+        if landmarksIndexes is None:
+            landmarksIndexes = xrange(len(self.landmarks))
+
+        bound = 0.0
+        for k in landmarksIndexes:
+            fromTable = self.fromTables[k]
+            toTable = self.toTables[k]
+            fromU = fromTable[u]
+            fromT = fromTable[t]
+            toU = toTable[u]
+            toT = toTable[t]
+
+            if fromU != INFINITY:
+                if fromT == INFINITY:
+                    return INFINITY
+                bound = max(bound, fromT - fromU - FLOAT32_ROUNDING * (fromT + fromU))
+            if toT != INFINITY:
+                if toU == INFINITY:
+                    return INFINITY
+                bound = max(bound, toU - toT - FLOAT32_ROUNDING * (toU + toT))
+
+        return bound
+
+    def getActiveLandmarks(self, start, end):
+        """
+        Returns the indexes of the landmarks giving the best lower bounds between the start and end vertices (See constants)
+        """
+        bounds = [(self.getLowerBound(start, end, (k,)), k) for k in xrange(len(self.landmarks))]
+        bounds.sort(reverse=True)
+        return [k for bound, k in bounds[:constants.ALT_ACTIVE_LANDMARKS]]
+
+
+def ALT(graph, start, end, closed=None):
+    """
+    Find a shortest path from the start vertex index to the end vertex index, using an A* algorithm
+    where the heuristic is the landmarks lower bound. The closed vertices are never entered: closures only
+    lengthen the paths, so the lower bounds remain valid.
+    The output is a pair (D, P) of arrays, with the same conventions as dijkstra.Dijkstra().
+    Only the distance of the end vertex and the predecessors along its path are final
+    """
+    landmarks = graph.landmarks
+    verticesNumber = graph.getVerticesNumber()
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
+    activeLandmarks = landmarks.getActiveLandmarks(start, end)
+
+    D = array('d', [INFINITY]) * verticesNumber
+    P = array('i', [-1]) * verticesNumber
+    settled = bytearray(verticesNumber)
+    D[start] = 0.0
+    heap = [(landmarks.getLowerBound(start, end, activeLandmarks), start)]
+
+    while heap:
+        v = heappop(heap)[1]
+        if settled[v]:
+            continue
+        settled[v] = 1
+        if v == end:
+            break
+
+        distance = D[v]
+        for i in xrange(offsets[v], offsets[v + 1]):
+            w = targets[i]
+            if closed is not None and closed[w]:
+                continue
+            vwLength = distance + weights[i]
+            if vwLength < D[w]:
+                D[w] = vwLength
+                P[w] = v
+                heappush(heap, (vwLength + landmarks.getLowerBound(w, end, activeLandmarks), w))
+
+    return (D, P)
+
+
+def shortestPath(graph, start, end, closed=None):
+    """
+    Find a single shortest path from the given start vertex index
+    to the given end vertex index (See idRegistry.py), using the landmarks of the graph and avoiding the closed vertices.
+    The output is a list of the vertices index in order along
+    the shortest path. A ValueError is raised if no path exists,
+    without any search if the landmarks prove it.
+    """
+    if graph.landmarks.getLowerBound(start, end) == INFINITY:
+        raise ValueError("ALT: {} cannot be reached from {}".format(end, start))
+
+    D, P = ALT(graph, start, end, closed)
+    if D[end] == INFINITY:
+        raise ValueError("ALT: no path from {} to {}".format(start, end))
+
+    return graph.getPath(P, start, end)
@@ -9,6 +9,7 @@ Script algorithm:
 while True
     - Starting the SUMO program
     - Initializing a TraCI connection
+    - Loading the network context if the network file changed (See networkContext.py)
     - Initializing and waiting for socket connections from the remote client
     - Starting threads
     - Waiting for an error in the previous threads
@@ -37,9 +38,15 @@ import simulation
 import vehicle
 import trafficLights
 import route
+import duarouterRoute
 import graph
 import traci
 from logger import Logger
+from routeCache import RouteCache
+from travelTimes import TravelTimes
+from networkContext import NetworkContext
+from edgeClosures import EdgeClosures
+from vehicleRegistry import VehicleRegistry
 
 def acceptConnection(host, port):
     """
@@ -93,7 +100,7 @@ def initTraciConnection(traciPort, maxRetry):
     Logger.info("{}Initialized".format(constants.PRINT_PREFIX_MANAGER))
 
 
-def deployThreads(mtraci, mRelaunch, mPriorityVehicle, eRouteReady, eGraphReady, eVehicleReady, eTrafficLightsReady, eSimulationReady, eShutdown, eManagerReady, priorityVehicles, graphDict, junctionsDict, edgesDict, vehicles, mVehicles):
+def deployThreads(mtraci, mRelaunch, eRouteReady, eGraphReady, eVehicleReady, eTrafficLightsReady, eSimulationReady, eShutdown, eManagerReady, vehicleRegistry, networkContext, routeCache, edgeClosures, duarouterPool, travelTimes):
     """
     Starts a SUMO subprocess, connects to TraCI then starts ASTra's threads
     """
@@ -102,7 +109,7 @@ def deployThreads(mtraci, mRelaunch, mPriorityVehicle, eRouteReady, eGraphReady,
         Logger.info("{}--------- Graph enabled --------".format(constants.PRINT_PREFIX_MANAGER))
         graphInputSocket = acceptConnection(constants.HOST, constants.GRAPH_INPUT_PORT)
         graphOutputSocket = acceptConnection(constants.HOST, constants.GRAPH_OUTPUT_PORT)
-        graphThread = threading.Thread(None, graph.run, "Graph", (mtraci, graphInputSocket, graphOutputSocket, eShutdown, eGraphReady, eManagerReady, graphDict, edgesDict), {})
+        graphThread = threading.Thread(None, graph.run, "Graph", (mtraci, graphInputSocket, graphOutputSocket, eShutdown, eGraphReady, eManagerReady, networkContext.graphDict, networkContext.edgesDict, networkContext.junctionsGeoCoordsDict, networkContext.edgesAttributesDict, networkContext.spatialIndex, networkContext.registry, routeCache, edgeClosures, networkContext.edges), {})
         graphThread.start()
     else:
         Logger.info("{}======== Graph disabled ========".format(constants.PRINT_PREFIX_MANAGER))
@@ -112,7 +119,7 @@ def deployThreads(mtraci, mRelaunch, mPriorityVehicle, eRouteReady, eGraphReady,
         Logger.info("{}------- Routing enabled --------".format(constants.PRINT_PREFIX_MANAGER))
         routerInputSocket = acceptConnection(constants.HOST, constants.ROUTER_INPUT_PORT)
         routerOutputSocket = acceptConnection(constants.HOST, constants.ROUTER_OUTPUT_PORT)
-        routerThread = threading.Thread(None, route.run, "Route", (mtraci, routerInputSocket, routerOutputSocket, eShutdown, eRouteReady, eManagerReady, graphDict, junctionsDict, edgesDict), {})
+        routerThread = threading.Thread(None, route.run, "Route", (mtraci, routerInputSocket, routerOutputSocket, eShutdown, eRouteReady, eManagerReady, networkContext.junctionsDict, networkContext.edgesDict, networkContext.routingGraph, networkContext.spatialIndex, routeCache, edgeClosures, duarouterPool, travelTimes), {})
         routerThread.start()
     else:
         Logger.info("{}======= Routing disabled =======".format(constants.PRINT_PREFIX_MANAGER))
@@ -122,7 +129,7 @@ def deployThreads(mtraci, mRelaunch, mPriorityVehicle, eRouteReady, eGraphReady,
         Logger.info("{}-------- Vehicles enabled --------".format(constants.PRINT_PREFIX_MANAGER))
         orderInputSocket = acceptConnection(constants.HOST, constants.VEHICLE_INPUT_PORT)
         orderOutputSocket = acceptConnection(constants.HOST, constants.VEHICLE_OUTPUT_PORT)
-        orderThread = threading.Thread(None, vehicle.run, "Vehicle", (mtraci, orderInputSocket, orderOutputSocket, eShutdown, priorityVehicles, mPriorityVehicle, eVehicleReady, eManagerReady, vehicles, mVehicles), {})
+        orderThread = threading.Thread(None, vehicle.run, "Vehicle", (mtraci, orderInputSocket, orderOutputSocket, eShutdown, eVehicleReady, eManagerReady, vehicleRegistry, networkContext.lanesLinksDict, networkContext.randomRoutes, networkContext.getProjection()), {})
         orderThread.start()
     else:
         Logger.info("{}======= Vehicles disabled ========".format(constants.PRINT_PREFIX_MANAGER))
@@ -132,7 +139,7 @@ def deployThreads(mtraci, mRelaunch, mPriorityVehicle, eRouteReady, eGraphReady,
         Logger.info("{}---- Traffic lights enabled ----".format(constants.PRINT_PREFIX_MANAGER))
         tllInputSocket = acceptConnection(constants.HOST, constants.TLL_INPUT_PORT)
         tllOutputSocket = acceptConnection(constants.HOST, constants.TLL_OUTPUT_PORT)
-        trafficLightsThread = threading.Thread(None, trafficLights.run, "TrafficLights", (mtraci, tllInputSocket, tllOutputSocket, eShutdown, eTrafficLightsReady, eManagerReady), {})
+        trafficLightsThread = threading.Thread(None, trafficLights.run, "TrafficLights", (mtraci, tllInputSocket, tllOutputSocket, eShutdown, eTrafficLightsReady, eManagerReady, networkContext.trafficLightsId, networkContext.junctionsGeoCoordsDict, networkContext.getProjection()), {})
         trafficLightsThread.start()
     else:
         Logger.info("{}=== Traffic lights disabled ====".format(constants.PRINT_PREFIX_MANAGER))
@@ -141,7 +148,7 @@ def deployThreads(mtraci, mRelaunch, mPriorityVehicle, eRouteReady, eGraphReady,
     if constants.SIMULATION_ENABLED:
         Logger.info("{}------ Simulation enabled -------".format(constants.PRINT_PREFIX_MANAGER))
         simulatorOutputSocket = acceptConnection(constants.HOST, constants.SIMULATOR_OUTPUT_PORT)
-        simulatorThread = threading.Thread(None, simulation.run, "Simulation", (mtraci, simulatorOutputSocket, mRelaunch, eShutdown, eSimulationReady, priorityVehicles, mPriorityVehicle, eManagerReady, vehicles, mVehicles), {})
+        simulatorThread = threading.Thread(None, simulation.run, "Simulation", (mtraci, simulatorOutputSocket, mRelaunch, eShutdown, eSimulationReady, eManagerReady, vehicleRegistry, travelTimes, networkContext.lanesLinksDict, networkContext.tllDict, networkContext.edges, networkContext.getProjection()), {})
         simulatorThread.start()
     else:
         Logger.info("{}====== Simulation disabled ======".format(constants.PRINT_PREFIX_MANAGER))
@@ -187,14 +194,20 @@ def main():
     """
     Logger.initLogger()
     
+    # Duarouter workers, kept across redeployments
+    duarouterPool = None
+    if constants.ROUTING_ENABLED:
+        duarouterPool = duarouterRoute.DuarouterPool(constants.DUAROUTER_WORKERS_NUMBER, constants.DUAROUTER_QUEUE_SIZE)
+    
+    # Network dictionaries and derived indexes, kept across redeployments unless the network file changes
+    networkContext = NetworkContext()
+    
     # Automatic restart is the remote sockets are closed or if TraCI or SUMO crash
     while True:
         # Variables
         # Mutex
         mtraci = Lock()
         mRelaunch = Lock()
-        mPriorityVehicle = Lock()
-        mVehicles = Lock()
         # Events
         eRouteReady = threading.Event()
         eGraphReady = threading.Event()
@@ -203,9 +216,12 @@ def main():
         eSimulationReady = threading.Event()
         eShutdown = threading.Event()
         eManagerReady = threading.Event()
-        # Vehicles list
-        priorityVehicles = []
-        vehicles = []
+        # Vehicles managed by ASTra, shared by the vehicle, simulation and traffic lights threads
+        vehicleRegistry = VehicleRegistry()
+        # Routes cache shared by the router and the graph threads
+        routeCache = RouteCache(constants.ROUTE_CACHE_SIZE)
+        # Edges travel times measured by the simulation thread, used by the router thread
+        travelTimes = TravelTimes()
         
         Logger.info("++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++\n"
                   + "+ Initializing app 'ASTra'                                 +\n"
@@ -220,17 +236,24 @@ def main():
         # Connecting to TraCI
         initTraciConnection(constants.TRACI_PORT, constants.TRACI_CONNECT_MAX_STEPS)
         
-        # Building dictionaries
-        if constants.ROUTING_ENABLED or constants.GRAPH_ENABLED:
-            graphDict, junctionsDict, edgesDict = graph.getGraphAndJunctionsDictionaryAndEdgesDictionary(mtraci)
+        # Loading the network context if the network file changed since the last deployment
+        networkContext.update(mtraci)
+        
+        # Edges closed by the graph thread and avoided by the router thread
+        edgeClosures = None
+        if networkContext.registry is not None:
+            edgeClosures = EdgeClosures(len(networkContext.registry.edgeIds))
             
         if constants.VEHICLE_ENABLED or constants.SIMULATION_ENABLED:
             mtraci.acquire()
             vehicles = traci.vehicle.getIDList()
             mtraci.release()
             vehicles = vehicle.getRegularVehicles(vehicles)
+            vehicle.subscribeVehicles(mtraci, vehicles)
+            for vehicleId in vehicles:
+                vehicleRegistry.add(vehicleId)
         
-        graphThread, graphInputSocket, graphOutputSocket, routerThread, routerInputSocket, routerOutputSocket, orderThread, orderInputSocket, orderOutputSocket, trafficLightsThread, tllInputSocket, tllOutputSocket, simulatorThread, simulatorOutputSocket = deployThreads(mtraci, mRelaunch, mPriorityVehicle, eRouteReady, eGraphReady, eVehicleReady, eTrafficLightsReady, eSimulationReady, eShutdown, eManagerReady, priorityVehicles, graphDict, junctionsDict, edgesDict, vehicles, mVehicles)
+        graphThread, graphInputSocket, graphOutputSocket, routerThread, routerInputSocket, routerOutputSocket, orderThread, orderInputSocket, orderOutputSocket, trafficLightsThread, tllInputSocket, tllOutputSocket, simulatorThread, simulatorOutputSocket = deployThreads(mtraci, mRelaunch, eRouteReady, eGraphReady, eVehicleReady, eTrafficLightsReady, eSimulationReady, eShutdown, eManagerReady, vehicleRegistry, networkContext, routeCache, edgeClosures, duarouterPool, travelTimes)
 
         # Waiting for the threads to be ready
         while not eGraphReady.is_set() or not eRouteReady.is_set() or not eVehicleReady.is_set() or not eTrafficLightsReady.is_set() or not eSimulationReady.is_set():
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+"""
+@file    networkContext.py
+@author  ASTra team
+@date    16/10/2026
+
+This file contains the network context: the dictionaries of the network file (See graph.py and trafficLights.py),
+the indexes derived from them and the network ID lists, shared by every thread.
+
+The manager keeps a single context for the whole process lifetime (See manager.py). On each redeployment, the context
+is only loaded again if the network file changed since it was loaded (See update), so that a SUMO or TraCI failure
+only costs the SUMO restart.
+
+Context content:
+    - The dictionaries (19) to (28) of graph.py and the traffic lights dictionary (See trafficLights.py (9))
+    - The routing graph compiled with its contraction hierarchy and landmarks (See route.py)
+    - The random routes generator of the stress test requests (See randomRoutes.py)
+    - The edges and traffic lights ID lists of the network, as returned by TraCI
+"""
+
+import constants
+import traci
+import graph
+import route
+from randomRoutes import RandomRoutes
+from logger import Logger
+from sharedFunctions import getNetworkHash
+from trafficLights import getTrafficLightsDictionary
+
+
+class NetworkContext(object):
+    """
+    Network dictionaries and derived indexes, kept across redeployments (See file description)
+    """
+    def __init__(self):
+        self.networkHash = None
+        self.graphDict = None
+        self.junctionsDict = None
+        self.edgesDict = None
+        self.junctionsCoordsDict = None
+        self.reverseGraphDict = None
+        self.junctionsGeoCoordsDict = None
+        self.edgesAttributesDict = None
+        self.spatialIndex = None
+        self.registry = None
+        self.lanesLinksDict = None
+        self.tllDict = None
+        self.routingGraph = None
+        self.randomRoutes = None
+        self.edges = None
+        self.trafficLightsId = None
+
+    def isOutOfDate(self):
+        """
+        Returns True if the context was never loaded, or if the network file changed since it was loaded
+        """
+        return self.networkHash != getNetworkHash(constants.SUMO_NETWORK_FILE)
+
+    def update(self, mtraci):
+        """
+        Loads the context if it is out of date. SUMO must be started and connected to TraCI.
+        Returns True if the context was loaded, False if the current one is kept
+        """
+        if not self.isOutOfDate():
+            Logger.info("{}Network file unchanged, reusing the network context".format(constants.PRINT_PREFIX_MANAGER))
+            return False
+
+        Logger.info("{}Loading the network context...".format(constants.PRINT_PREFIX_MANAGER))
+        networkHash = getNetworkHash(constants.SUMO_NETWORK_FILE)
+
+        if constants.ROUTING_ENABLED or constants.GRAPH_ENABLED or constants.VEHICLE_ENABLED or constants.SIMULATION_ENABLED:
+            self.graphDict, self.junctionsDict, self.edgesDict, self.junctionsCoordsDict, self.reverseGraphDict, self.junctionsGeoCoordsDict, self.edgesAttributesDict, self.spatialIndex, self.registry, self.lanesLinksDict = graph.getGraphAndJunctionsDictionaryAndEdgesDictionary()
+
+        if constants.ROUTING_ENABLED:
+            self.routingGraph = route.getRoutingGraph(self.graphDict, self.reverseGraphDict, self.edgesDict, self.junctionsCoordsDict)
+
+        if constants.VEHICLE_ENABLED:
+            self.randomRoutes = RandomRoutes(self.graphDict)
+
+        if constants.SIMULATION_ENABLED:
+            self.tllDict = getTrafficLightsDictionary(mtraci)
+
+        mtraci.acquire()
+        self.edges = traci.edge.getIDList()
+        self.trafficLightsId = traci.trafficlights.getIDList()
+        mtraci.release()
+
+        self.networkHash = networkHash
+        Logger.info("{}Done".format(constants.PRINT_PREFIX_MANAGER))
+        return True
+
+    def getProjection(self):
+        """
+        Returns the network projection (See projection.py), None if this one is not supported
+        """
+        if self.spatialIndex is None:
+            return None
+        return self.spatialIndex.projection
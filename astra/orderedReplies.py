@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+
+"""
+@file    orderedReplies.py
+@author  ASTra team
+@date    16/10/2026
+
+This file contains the replies of the router thread (See route.py), which are sent in the order of the requests.
+The router thread reads the next requests while the Duarouter workers are processing the previous ones (See duarouterRoute.py),
+but the responses carry no request ID: a response must therefore never be sent before the responses of the previous requests.
+
+Replies:
+    A reply is reserved for each request when this one is read. Its messages are written by its send method, as to a socket,
+    either by the router thread or by a Duarouter worker, then the reply is closed once the request is processed.
+    The messages of a reply are only sent when every previous reply is closed, and buffered until then.
+
+Head-of-line blocking:
+    A slow request holds back the responses of every request received after it, even the ones already processed:
+    a DUA request delays the next DIJ, AST or MAT responses until its Duarouter run ends, for up to DUAROUTER_TIMEOUT (See constants).
+
+Tagged replies:
+    A request prefixed by a client tag (See route.py) gets a tagged reply, outside of the requests order: each of its messages is sent
+    at once, prefixed by the same tag so that the client can match it with its request, and it never holds back the next replies.
+    Tagging the DUA requests thus avoids the head-of-line blocking.
+"""
+
+import constants
+from collections import deque
+from threading import Lock
+
+
+class Reply(object):
+    """
+    Messages answering a single request
+    """
+    __slots__ = ('replies', 'messages', 'closed', 'tag')
+
+    def __init__(self, replies, tag=None):
+        self.replies = replies
+        self.messages = []
+        self.closed = False
+        self.tag = tag
+
+    def send(self, data):
+        """
+        Sends a message of the reply, as soon as the previous replies are closed (at once if the reply is tagged)
+        """
+        self.replies.send(self, data)
+
+    def close(self):
+        """
+        Closes the reply once every message is sent, allowing the next replies to be sent
+        """
+        self.replies.close(self)
+
+
+class OrderedReplies(object):
+    """
+    Replies sent by an output socket in the order they were reserved
+    """
+    def __init__(self, outputSocket):
+        self.outputSocket = outputSocket
+        self.lock = Lock()
+        self.pending = deque()
+
+    def reserve(self, tag=None):
+        """
+        Returns a new reply, sent after every reply reserved before, unless a tag is given (See file description)
+        """
+        reply = Reply(self, tag)
+        if tag is not None:
+            return reply
+        self.lock.acquire()
+        self.pending.append(reply)
+        self.lock.release()
+        return reply
+
+    def send(self, reply, data):
+        self.lock.acquire()
+        try:
+            if reply.tag is not None:
+                self.outputSocket.send(constants.TAGGED_RESPONSE_HEADER + constants.SEPARATOR + reply.tag + constants.SEPARATOR + data)
+            else:
+                reply.messages.append(data)
+                self.flush()
+        finally:
+            self.lock.release()
+
+    def close(self, reply):
+        self.lock.acquire()
+        try:
+            reply.closed = True
+            if reply.tag is None:
+                self.flush()
+        finally:
+            self.lock.release()
+
+    def flush(self):
+        """
+        Sends the buffered messages of the first replies, up to the first one which is not closed. The lock must be held
+        """
+        while self.pending:
+            reply = self.pending[0]
+            while reply.messages:
+                self.outputSocket.send(reply.messages.pop(0))
+            if not reply.closed:
+                return
+            self.pending.popleft()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+
+"""
+@file    projection.py
+@author  ASTra team
+@date    16/10/2026
+
+This file contains the conversion between SUMO coordinates and geographic coordinates, without TraCI.
+
+The projection is read from the location element of the network file:
+    <location netOffset="x,y" convBoundary="..." origBoundary="..." projParameter="..."/>
+The SUMO coordinates are translated by -netOffset, then projected back to (lon, lat) as traci.simulation.convertGeo does (See convertGeo).
+The geographic coordinates are projected, then translated by netOffset (See convertXY).
+
+Supported projection parameters:
+    - "!": no projection, the translated coordinates are the geographic ones
+    - "+proj=utm +zone=Z [+south]" over the WGS84 ellipsoid: inverse transverse Mercator,
+      computed with the Krueger series (sub-millimetre accuracy inside a UTM zone) in both directions
+Any other projection is reported as unsupported (See isSupported)
+
+Batches of coordinates are converted at once by convertGeoArrays and convertXYArrays, with NumPy when this one is installed.
+Without NumPy, each pair of coordinates is converted by convertGeo or convertXY.
+"""
+
+import constants
+import xml.sax
+from math import asin
+from math import atan
+from math import atan2
+from math import atanh
+from math import cos
+from math import cosh
+from math import degrees
+from math import radians
+from math import sin
+from math import sinh
+from math import sqrt
+from math import tan
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+""" WGS84 ellipsoid and UTM parameters """
+WGS84_SEMI_MAJOR_AXIS = 6378137.0
+WGS84_FLATTENING = 1 / 298.257223563
+UTM_SCALE_FACTOR = 0.9996
+UTM_FALSE_EASTING = 500000.0
+UTM_SOUTH_FALSE_NORTHING = 10000000.0
+NO_PROJECTION = "!"
+
+
+class Projection(object):
+    """
+    Inverse projection of a network file (See file description)
+    """
+    def __init__(self, netOffset, projParameter):
+        offset = netOffset.split(',')
+        self.xOffset = float(offset[0])
+        self.yOffset = float(offset[1])
+        self.projParameter = projParameter.strip()
+        self.zone = None
+        self.south = False
+
+        if self.projParameter != NO_PROJECTION:
+            parameters = dict()
+            for parameter in self.projParameter.split():
+                pair = parameter.lstrip('+').split('=', 1)
+                parameters[pair[0]] = pair[1] if len(pair) == 2 else None
+            if parameters.get('proj') == 'utm' and parameters.get('ellps', 'WGS84') in ('WGS84', 'GRS80') and 'zone' in parameters:
+                self.zone = int(parameters['zone'])
+                self.south = 'south' in parameters
+                self.initTransverseMercator()
+
+    def initTransverseMercator(self):
+        """
+        Computes the Krueger series coefficients of the inverse transverse Mercator projection
+        """
+        n = WGS84_FLATTENING / (2 - WGS84_FLATTENING)
+        self.rectifyingRadius = WGS84_SEMI_MAJOR_AXIS / (1 + n) * (1 + n ** 2 / 4 + n ** 4 / 64)
+        self.alpha = (n / 2 - 2 * n ** 2 / 3 + 5 * n ** 3 / 16,
+                      13 * n ** 2 / 48 - 3 * n ** 3 / 5,
+                      61 * n ** 3 / 240)
+        self.beta = (n / 2 - 2 * n ** 2 / 3 + 37 * n ** 3 / 96,
+                     n ** 2 / 48 + n ** 3 / 15,
+                     17 * n ** 3 / 480)
+        self.n = n
+        self.eccentricity = sqrt(WGS84_FLATTENING * (2 - WGS84_FLATTENING))
+        self.centralMeridian = radians(self.zone * 6 - 183)
+
+    def isSupported(self):
+        """
+        Returns True if the network coordinates can be converted to geographic coordinates
+        """
+        return self.projParameter == NO_PROJECTION or self.zone is not None
+
+    def convertGeo(self, x, y):
+        """
+        Returns the (lon, lat) geographic coordinates of the SUMO coordinates (x, y)
+        """
+        easting = x - self.xOffset
+        northing = y - self.yOffset
+        if self.zone is None:
+            return (easting, northing)
+
+        if self.south:
+            northing -= UTM_SOUTH_FALSE_NORTHING
+        xi = northing / (UTM_SCALE_FACTOR * self.rectifyingRadius)
+        eta = (easting - UTM_FALSE_EASTING) / (UTM_SCALE_FACTOR * self.rectifyingRadius)
+
+        xiPrime = xi
+        etaPrime = eta
+        for j in xrange(1, 4):
+            xiPrime -= self.beta[j - 1] * sin(2 * j * xi) * cosh(2 * j * eta)
+            etaPrime -= self.beta[j - 1] * cos(2 * j * xi) * sinh(2 * j * eta)
+
+        # Conformal latitude, then geodetic latitude by Newton iterations on the conformal latitude equation
+        tauPrime = tan(asin(sin(xiPrime) / cosh(etaPrime)))
+        e = self.eccentricity
+        tau = tauPrime
+        for i in xrange(3):
+            sigma = sinh(e * atanh(e * tau / sqrt(1 + tau ** 2)))
+            tauPrimeI = tau * sqrt(1 + sigma ** 2) - sigma * sqrt(1 + tau ** 2)
+            tau += (tauPrime - tauPrimeI) / sqrt(1 + tauPrimeI ** 2) * (1 + (1 - e ** 2) * tau ** 2) / ((1 - e ** 2) * sqrt(1 + tau ** 2))
+
+        lat = atan(tau)
+        lon = self.centralMeridian + atan2(sinh(etaPrime), cos(xiPrime))
+        return (degrees(lon), degrees(lat))
+
+
+    def convertXY(self, lon, lat):
+        """
+        Returns the (x, y) SUMO coordinates of the geographic coordinates (lon, lat)
+        """
+        if self.zone is None:
+            return (lon + self.xOffset, lat + self.yOffset)
+
+        phi = radians(lat)
+        lambd = radians(lon) - self.centralMeridian
+        k = 2 * sqrt(self.n) / (1 + self.n)
+        t = sinh(atanh(sin(phi)) - k * atanh(k * sin(phi)))
+        xiPrime = atan2(t, cos(lambd))
+        etaPrime = atanh(sin(lambd) / sqrt(1 + t ** 2))
+
+        xi = xiPrime
+        eta = etaPrime
+        for j in xrange(1, 4):
+            xi += self.alpha[j - 1] * sin(2 * j * xiPrime) * cosh(2 * j * etaPrime)
+            eta += self.alpha[j - 1] * cos(2 * j * xiPrime) * sinh(2 * j * etaPrime)
+
+        easting = UTM_FALSE_EASTING + UTM_SCALE_FACTOR * self.rectifyingRadius * eta
+        northing = UTM_SCALE_FACTOR * self.rectifyingRadius * xi
+        if self.south:
+            northing += UTM_SOUTH_FALSE_NORTHING
+        return (easting + self.xOffset, northing + self.yOffset)
+
+    def convertGeoArrays(self, xs, ys):
+        """
+        Returns the (lons, lats) geographic coordinates lists of the SUMO coordinates lists (xs, ys)
+        """
+        if numpy is None:
+            coords = [self.convertGeo(x, y) for x, y in zip(xs, ys)]
+            return [lon for lon, lat in coords], [lat for lon, lat in coords]
+
+        easting = numpy.asarray(xs, dtype=float) - self.xOffset
+        northing = numpy.asarray(ys, dtype=float) - self.yOffset
+        if self.zone is None:
+            return easting.tolist(), northing.tolist()
+
+        if self.south:
+            northing -= UTM_SOUTH_FALSE_NORTHING
+        xi = northing / (UTM_SCALE_FACTOR * self.rectifyingRadius)
+        eta = (easting - UTM_FALSE_EASTING) / (UTM_SCALE_FACTOR * self.rectifyingRadius)
+
+        xiPrime = xi.copy()
+        etaPrime = eta.copy()
+        for j in xrange(1, 4):
+            xiPrime -= self.beta[j - 1] * numpy.sin(2 * j * xi) * numpy.cosh(2 * j * eta)
+            etaPrime -= self.beta[j - 1] * numpy.cos(2 * j * xi) * numpy.sinh(2 * j * eta)
+
+        tauPrime = numpy.tan(numpy.arcsin(numpy.sin(xiPrime) / numpy.cosh(etaPrime)))
+        e = self.eccentricity
+        tau = tauPrime.copy()
+        for i in xrange(3):
+            sigma = numpy.sinh(e * numpy.arctanh(e * tau / numpy.sqrt(1 + tau ** 2)))
+            tauPrimeI = tau * numpy.sqrt(1 + sigma ** 2) - sigma * numpy.sqrt(1 + tau ** 2)
+            tau += (tauPrime - tauPrimeI) / numpy.sqrt(1 + tauPrimeI ** 2) * (1 + (1 - e ** 2) * tau ** 2) / ((1 - e ** 2) * numpy.sqrt(1 + tau ** 2))
+
+        lats = numpy.degrees(numpy.arctan(tau))
+        lons = numpy.degrees(self.centralMeridian + numpy.arctan2(numpy.sinh(etaPrime), numpy.cos(xiPrime)))
+        return lons.tolist(), lats.tolist()
+
+    def convertXYArrays(self, lons, lats):
+        """
+        Returns the (xs, ys) SUMO coordinates lists of the geographic coordinates lists (lons, lats)
+        """
+        if numpy is None:
+            coords = [self.convertXY(lon, lat) for lon, lat in zip(lons, lats)]
+            return [x for x, y in coords], [y for x, y in coords]
+
+        lons = numpy.asarray(lons, dtype=float)
+        lats = numpy.asarray(lats, dtype=float)
+        if self.zone is None:
+            return (lons + self.xOffset).tolist(), (lats + self.yOffset).tolist()
+
+        phi = numpy.radians(lats)
+        lambd = numpy.radians(lons) - self.centralMeridian
+        k = 2 * sqrt(self.n) / (1 + self.n)
+        t = numpy.sinh(numpy.arctanh(numpy.sin(phi)) - k * numpy.arctanh(k * numpy.sin(phi)))
+        xiPrime = numpy.arctan2(t, numpy.cos(lambd))
+        etaPrime = numpy.arctanh(numpy.sin(lambd) / numpy.sqrt(1 + t ** 2))
+
+        xi = xiPrime.copy()
+        eta = etaPrime.copy()
+        for j in xrange(1, 4):
+            xi += self.alpha[j - 1] * numpy.sin(2 * j * xiPrime) * numpy.cosh(2 * j * etaPrime)
+            eta += self.alpha[j - 1] * numpy.cos(2 * j * xiPrime) * numpy.sinh(2 * j * etaPrime)
+
+        easting = UTM_FALSE_EASTING + UTM_SCALE_FACTOR * self.rectifyingRadius * eta
+        northing = UTM_SCALE_FACTOR * self.rectifyingRadius * xi
+        if self.south:
+            northing += UTM_SOUTH_FALSE_NORTHING
+        return (easting + self.xOffset).tolist(), (northing + self.yOffset).tolist()
+
+
+
+class LocationFound(Exception):
+    """
+    Raised in order to stop parsing the network file once its location element is read
+    """
+    pass
+
+
+class LocationHandler(xml.sax.ContentHandler):
+    """
+    SAX handler reading the projection of a SUMO network file
+    """
+    def __init__(self):
+        xml.sax.ContentHandler.__init__(self)
+        self.projection = None
+
+    def startElement(self, name, attrs):
+        if name == constants.XML_LOCATION_ELEMENT:
+            self.projection = Projection(attrs.get(constants.XML_LOCATION_NET_OFFSET), attrs.get(constants.XML_LOCATION_PROJECTION))
+            raise LocationFound()
+
+
+def readProjection(networkFile):
+    """
+    Returns the projection of a network file, None if this one has no location element
+    """
+    handler = LocationHandler()
+    parser = xml.sax.make_parser()
+    parser.setContentHandler(handler)
+    try:
+        parser.parse(networkFile)
+    except LocationFound:
+        pass
+    return handler.projection
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+
+"""
+@file    randomRoutes.py
+@author  ASTra team
+@date    16/10/2026
+
+This file contains the random routes generator of the stress test request (See vehicle.py (4)), which does not use TraCI.
+
+Routes:
+    A random route is a random walk over the graph dictionary (See graph.py (21)), read from its successors arrays (See binaryDictionary.py).
+    The walks are restricted to the largest strongly connected component of the graph: every edge of this component has a successor
+    in it, so a walk never reaches a dead end and never has to be retried.
+    The generator is seeded, hence the same seed always gives the same routes for the same network.
+"""
+
+from array import array
+from random import Random
+
+
+def getLargestStronglyConnectedComponent(offsets, targets):
+    """
+    Returns the vertices index of the largest strongly connected component of a graph given as successors arrays,
+    using an iterative Tarjan algorithm
+    """
+    verticesNumber = len(offsets) - 1
+    indexes = array('i', [-1]) * verticesNumber
+    lowLinks = array('i', [0]) * verticesNumber
+    onStack = bytearray(verticesNumber)
+    stack = []
+    largest = []
+    index = 0
+
+    for root in xrange(verticesNumber):
+        if indexes[root] != -1:
+            continue
+
+        indexes[root] = lowLinks[root] = index
+        index += 1
+        stack.append(root)
+        onStack[root] = 1
+        calls = [(root, offsets[root])]
+
+        while calls:
+            v, i = calls[-1]
+            if i < offsets[v + 1]:
+                calls[-1] = (v, i + 1)
+                w = targets[i]
+                if indexes[w] == -1:
+                    indexes[w] = lowLinks[w] = index
+                    index += 1
+                    stack.append(w)
+                    onStack[w] = 1
+                    calls.append((w, offsets[w]))
+                elif onStack[w] and indexes[w] < lowLinks[v]:
+                    lowLinks[v] = indexes[w]
+                continue
+
+            calls.pop()
+            if calls:
+                u = calls[-1][0]
+                if lowLinks[v] < lowLinks[u]:
+                    lowLinks[u] = lowLinks[v]
+
+            if lowLinks[v] == indexes[v]:
+                component = []
+                w = -1
+                while w != v:
+                    w = stack.pop()
+                    onStack[w] = 0
+                    component.append(w)
+                if len(component) > len(largest):
+                    largest = component
+
+    return largest
+
+
+class RandomRoutes(object):
+    """
+    Random walks over the largest strongly connected component of the graph dictionary
+    """
+    def __init__(self, graphDict):
+        self.edgeIds = graphDict.registry.edgeIds
+        self.offsets = graphDict.offsets
+        self.targets = graphDict.targets
+        self.component = sorted(getLargestStronglyConnectedComponent(self.offsets, self.targets))
+        self.inComponent = bytearray(len(self.offsets) - 1)
+        for v in self.component:
+            self.inComponent[v] = 1
+
+    def getRoutes(self, routesNumber, routeSize, seed):
+        """
+        Generates routesNumber random routes of routeSize + 1 edges ID, always the same ones for a given seed.
+        A ValueError is raised if the largest strongly connected component is a single edge
+        """
+        if len(self.component) < 2:
+            raise ValueError("Random routes: no strongly connected component of several edges")
+
+        generator = Random(seed)
+        for i in xrange(routesNumber):
+            yield [self.edgeIds[v] for v in self.getWalk(generator, routeSize)]
+
+    def getWalk(self, generator, routeSize):
+        """
+        Returns a random walk of routeSize steps inside the component, as a list of vertices index
+        """
+        offsets = self.offsets
+        targets = self.targets
+        inComponent = self.inComponent
+
+        v = self.component[generator.randrange(len(self.component))]
+        walk = [v]
+        for step in xrange(routeSize):
+            successors = [w for w in targets[offsets[v]:offsets[v + 1]] if inComponent[w]]
+            v = successors[generator.randrange(len(successors))]
+            walk.append(v)
+        return walk
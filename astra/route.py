@@ -7,7 +7,8 @@
 
 This script reads an input socket connected to the remote client and process a GET(1) command when received. A ROUTE(2) or ERROR(3) answer is then sent
 The building/export or import of a graph (See Graph(10)) file is required for this purpose.
-Junctions (See Graph(8)) and edges (See Graph(9)) dictionaries are also required.
+Junctions (See Graph(8)), edges (See Graph(9)), junctions coordinates (See Graph(22)) and reverse graph (See Graph(23)) dictionaries are also required.
+The spatial index (See Graph(26)) is used in order to find the edges nearest to geographic coordinates.
 Requests must be sent on the port 180003, responses are sent on the port 18004.
 
 Algorithm:
@@ -17,7 +18,11 @@ while 1:
 
 (1) Routing request: GET routingAlgorithm geo src dest1 ... destN
         routingAlgorithm:
-            if routingAlgorithm = DIJ, a Dijkstra algorithm is applied
+            if routingAlgorithm = DIJ, a Dijkstra algorithm is applied (using the contraction hierarchy if enabled, See constants)
+            else if routingAlgorithm = AST, an A* algorithm using the junctions coordinates is applied
+            else if routingAlgorithm = ALT, an A* algorithm using the landmarks distance lower bounds is applied
+            else if routingAlgorithm = BID, a bidirectional Dijkstra algorithm using the reverse graph is applied
+            else if routingAlgorithm = TIM, a Dijkstra algorithm is applied, the length of an edge being its live travel time (See travelTimes.py)
             else if routingAlgorithm = DUA, a Duarouter subprocess is called for processing the routing request
         
         geo:
@@ -34,6 +39,32 @@ while 1:
 (3) Error answer: ERR errorCode
         
 (4) Error response when an invalid request is received : ERR 40
+
+(5) Route cache statistics request: CAC
+
+(6) Route cache statistics response: CAC hits misses evictions size
+
+(7) Distance matrix request: MAT srcNumber src1 ... srcN dest1 ... destM
+        src1 ... srcN, dest1 ... destM: SUMO edges ID
+        The cost from a source to a destination is the length of the shortest route from the end of the source edge
+        to the end of the destination edge. A Dijkstra algorithm is applied once per source
+
+(8) Distance matrix response: MAT,src1 cost11 ... cost1M,src2 cost21 ... cost2M,...,srcN costN1 ... costNM (N in [0-Y], See constants for Y value)
+        costIJ = -1 if destJ cannot be reached from srcI
+        The response is split in several messages, followed by an end message: MAT,END
+
+The computed routes are cached (See routeCache.py), so that a routing request already processed is answered without any routing.
+TIM routes are never cached since they depend on the current traffic.
+DUA routing requests are processed by a pool of Duarouter workers (See duarouterRoute.py), while the next requests are read.
+The responses are still sent in the order of the requests (See orderedReplies.py): the responses of the requests received
+after a DUA request are buffered until its route is sent, for up to the Duarouter timeout (See constants).
+
+(9) Tagged request: TAG requestId request
+        request: any request above, e.g. GET DUA 0 src dest1
+        The responses of a tagged request are sent as soon as they are computed, before the responses of the previous requests if needed,
+        and never hold back the responses of the next requests. Each one is prefixed by the tag of the request (10)
+
+(10) Tagged response: TAG requestId response
 """
 
 import traci
@@ -41,8 +72,15 @@ import time
 import constants
 import duarouterRoute
 import dijkstraRoute
+import astar
+import bidirectionalDijkstra
+import contractionHierarchy
+import dijkstra
+import landmarks
 import sys
 from logger import Logger
+from orderedReplies import OrderedReplies
+from routingGraph import RoutingGraph
 from sharedFunctions import sendAck
 
 """
@@ -50,26 +88,32 @@ from sharedFunctions import sendAck
 ===                                                             ROUTING REQUESTS MANAGEMENT                                                        ===
 ============================================================================================================================================
 """
-def sendRoute(route, outputSocket):
+def sendMessage(strmsg, outputSocket):
+    """
+    Sends a message to Client using the outputSocket, which is the reply of the request being processed (See orderedReplies.py)
+    """
+    try:
+        outputSocket.send(strmsg.encode())
+    except:
+        raise constants.ClosedSocketException("The listening socket has been closed")
+    Logger.infoFile("{} Message sent: {}".format(constants.PRINT_PREFIX_ROUTER, strmsg))
+
+
+def sendRoute(route, registry, outputSocket):
     """
     Sends a routing(2) message to Client using the outputSocket
-    For this purpose, the route is converted to geographic coordinates by traci
+    For this purpose, the vertices index of the route are translated to edges ID by the ID registry (See idRegistry.py)
     """
     routeMsg = []
     routeMsg.append(constants.ROUTING_RESPONSE_HEADER)
     
-    for edge in route:
+    for edge in registry.getEdgeIds(route):
         routeMsg.append(constants.SEPARATOR)
-        routeMsg.append(str(edge))
+        routeMsg.append(edge)
         
     routeMsg.append(constants.END_OF_MESSAGE)
         
-    strmsg = ''.join(routeMsg)
-    try:
-        outputSocket.send(strmsg.encode())
-    except:
-        raise constants.ClosedSocketException("The listening socket has been closed")
-    Logger.infoFile("{} Message sent: {}".format(constants.PRINT_PREFIX_ROUTER, strmsg))
+    sendMessage(''.join(routeMsg), outputSocket)
 
 
 def sendRoutingError(outputSocket, errorCode):
@@ -82,12 +126,7 @@ def sendRoutingError(outputSocket, errorCode):
     errorMsg.append(str(errorCode))
     errorMsg.append(constants.END_OF_MESSAGE)
         
-    strmsg = ''.join(errorMsg)
-    try:
-        outputSocket.send(strmsg.encode())
-    except:
-        raise constants.ClosedSocketException("The listening socket has been closed")
-    Logger.infoFile("{} Message sent: {}".format(constants.PRINT_PREFIX_ROUTER, strmsg))
+    sendMessage(''.join(errorMsg), outputSocket)
 
 
 def getRouteFromJunctions(junctions, junctionsDict):
@@ -103,34 +142,71 @@ def getRouteFromJunctions(junctions, junctionsDict):
     return route
 
 
-def getEdgeFromCoords(lon, lat, mtraci):
+def getEdgesFromCoords(coords, spatialIndex, mtraci):
     """
-    Return a SUMO edge ID from geographic coordinates
+    Return the SUMO edges ID nearest to a list of geographic coordinates [(lon1, lat1), ..., (lonN, latN)].
+    The edges are found by the spatial index, or by SUMO if the network projection is not supported
     """
+    if spatialIndex is not None and spatialIndex.projection is not None:
+        xs, ys = spatialIndex.projection.convertXYArrays([lon for lon, lat in coords], [lat for lon, lat in coords])
+        return spatialIndex.getNearestEdges(zip(xs, ys))
+    
+    edges = []
+    mtraci.acquire()
     try:
-        mtraci.acquire()
-        edge = traci.simulation.convertRoad(lat, lon, True)[0]
-        mtraci.release()
-    except:
+        for lon, lat in coords:
+            edges.append(traci.simulation.convertRoad(lon, lat, True)[0])
+    finally:
         mtraci.release()
-        raise
-    return edge
+    return edges
+
+
+def getEdgeFromCoords(lon, lat, spatialIndex, mtraci):
+    """
+    Return a SUMO edge ID from geographic coordinates
+    """
+    return getEdgesFromCoords([(lon, lat)], spatialIndex, mtraci)[0]
+
+
+def sendRoutingResult(returnCode, route, cacheKey, routeCache, registry, outputSocket):
+    """
+    Caches (unless the cache key is None) then sends a route(2) of vertices index to Client, or sends an error(3) if the return code is not 0
+    """
+    if returnCode != 0:
+        return sendRoutingError(outputSocket, returnCode)
+
+    if cacheKey is not None:
+        routeCache.put(cacheKey, route)
+    sendRoute(route, registry, outputSocket)
+
+
+def sendDuarouterResult(returnCode, route, cacheKey, routeCache, registry, outputSocket):
+    """
+    Translates the edges ID route of a Duarouter worker to vertices index, then caches and sends it (See sendRoutingResult)
+    """
+    if returnCode == 0:
+        try:
+            route = [registry.getEdgeIndex(edge) for edge in route]
+        except KeyError:
+            returnCode = constants.ROUTE_ERROR_CONNECTION
+    sendRoutingResult(returnCode, route, cacheKey, routeCache, registry, outputSocket)
 
 
-def processRouteRequest(algorithm, geo, points, junctionsDict, graphDict, edgesDict, outputSocket, mtraci):
+def processRouteRequest(algorithm, geo, points, junctionsDict, routingGraph, edgesDict, spatialIndex, routeCache, edgeClosures, duarouterPool, travelTimes, outputSocket, mtraci):
     """
     - Transforms the source and destination coordinates to SUMO edges ID if geo is 1
-    - Resolves the routing demand by the specified algorithm
-    - Sends the route(2) back to Client
+    - Resolves the routing demand by the specified algorithm, unless the route is cached. The closed edges are avoided (See edgeClosures.py)
+    - Sends the route(2) back to Client (DUA routes are sent by a Duarouter worker)
+    Returns True if the response is sent by a Duarouter worker, which then closes the reply (See orderedReplies.py)
     """
     if geo == constants.GEOGRAPHIC_COORDS:
-        edgesDest = []
-        edgeSrc = getEdgeFromCoords(float(points[0]), float(points[1]), mtraci)
-        
-        i = 2
+        coords = []
+        i = 0
         while i < len(points):
-            edgesDest.append(getEdgeFromCoords(float(points[i]), float(points[i + 1]), mtraci))
+            coords.append((float(points[i]), float(points[i + 1])))
             i += 2
+        edgesDest = getEdgesFromCoords(coords, spatialIndex, mtraci)
+        edgeSrc = edgesDest.pop(0)
     elif geo == constants.EDGES_ID:
         edgeSrc = points[0]
         points.pop(0)
@@ -138,24 +214,169 @@ def processRouteRequest(algorithm, geo, points, junctionsDict, graphDict, edgesD
     else:
         return sendRoutingError(outputSocket, constants.ROUTE_INVALID_GEO)
     
-    if algorithm == constants.DIJKSTRA_REQUEST:
-        returnCode, route = dijkstraRoute.processRouteRequest(edgeSrc, edgesDest, junctionsDict, graphDict)
+    registry = routingGraph.registry
+    if algorithm == constants.TRAVEL_TIME_REQUEST:
+        cacheKey = None
+    else:
+        cacheKey = (algorithm, edgeSrc, tuple(edgesDest))
+        route = routeCache.get(cacheKey)
+        if route is not None:
+            return sendRoute(route, registry, outputSocket)
+    
+    closed = edgeClosures.getClosed()
+    if algorithm == constants.DIJKSTRA_REQUEST and routingGraph.hierarchy is not None:
+        returnCode, route = dijkstraRoute.processRouteRequest(edgeSrc, edgesDest, junctionsDict, routingGraph, contractionHierarchy.shortestPath, closed)
+    elif algorithm == constants.DIJKSTRA_REQUEST:
+        returnCode, route = dijkstraRoute.processRouteRequest(edgeSrc, edgesDest, junctionsDict, routingGraph, dijkstra.shortestPath, closed)
+    elif algorithm == constants.ASTAR_REQUEST:
+        returnCode, route = dijkstraRoute.processRouteRequest(edgeSrc, edgesDest, junctionsDict, routingGraph, astar.shortestPath, closed)
+    elif algorithm == constants.ALT_REQUEST:
+        returnCode, route = dijkstraRoute.processRouteRequest(edgeSrc, edgesDest, junctionsDict, routingGraph, landmarks.shortestPath, closed)
+    elif algorithm == constants.BIDIRECTIONAL_DIJKSTRA_REQUEST:
+        returnCode, route = dijkstraRoute.processRouteRequest(edgeSrc, edgesDest, junctionsDict, routingGraph, bidirectionalDijkstra.shortestPath, closed)
+    elif algorithm == constants.TRAVEL_TIME_REQUEST:
+        returnCode, route = dijkstraRoute.processRouteRequest(edgeSrc, edgesDest, junctionsDict, travelTimes.getRoutingGraph(routingGraph), dijkstra.shortestPath, closed)
     elif algorithm == constants.DUAROUTER_REQUEST:
-        returnCode, route = duarouterRoute.processRouteRequest(edgeSrc, edgesDest, junctionsDict)
+        def callback(returnCode, route):
+            try:
+                sendDuarouterResult(returnCode, route, cacheKey, routeCache, registry, outputSocket)
+            finally:
+                outputSocket.close()
+        if not duarouterPool.submit(edgeSrc, edgesDest, junctionsDict, callback):
+            sendRoutingError(outputSocket, constants.ROUTE_DUAROUTER_QUEUE_FULL)
+            return False
+        return True
     else:
         return sendRoutingError(outputSocket, constants.ROUTE_INVALID_ALGORITHM)
     
-    if returnCode != 0:
-        return sendRoutingError(outputSocket, returnCode)
+    sendRoutingResult(returnCode, route, cacheKey, routeCache, registry, outputSocket)
+
+
+def processMatrixRequest(sources, destinations, routingGraph, edgeClosures, outputSocket):
+    """
+    Sends the distance matrix(8) from the sources edges ID to the destinations edges ID to Client, avoiding the closed edges.
+    The rows are sent as soon as they are computed
+    """
+    try:
+        sourcesIndexes = [routingGraph.getIndex(edge) for edge in sources]
+        destinationsIndexes = [routingGraph.getIndex(edge) for edge in destinations]
+    except KeyError:
+        return sendRoutingError(outputSocket, constants.ROUTE_UNKNOWN_EDGE)
+    
+    closed = edgeClosures.getClosed()
+    rowsNumber = 0
+    matrixMsg = []
+    matrixMsg.append(constants.MATRIX_RESPONSE_HEADER)
+    
+    for source, sourceIndex in zip(sources, sourcesIndexes):
+        D = dijkstra.DijkstraToTargets(routingGraph, sourceIndex, destinationsIndexes, closed)
+        
+        matrixMsg.append(constants.MATRIX_ROWS_SEPARATOR)
+        matrixMsg.append(source)
+        for destinationIndex in destinationsIndexes:
+            matrixMsg.append(constants.SEPARATOR)
+            if D[destinationIndex] == dijkstra.INFINITY:
+                matrixMsg.append(str(constants.MATRIX_UNREACHABLE_COST))
+            else:
+                matrixMsg.append(str(D[destinationIndex]))
+        rowsNumber += 1
+        
+        # Sending the message if this one has reached the maximum rows number per message
+        if rowsNumber == constants.MATRIX_ROWS_PER_MESSAGE:
+            matrixMsg.append(constants.END_OF_MESSAGE)
+            sendMessage(''.join(matrixMsg), outputSocket)
+            rowsNumber = 0
+            matrixMsg[:] = []
+            matrixMsg.append(constants.MATRIX_RESPONSE_HEADER)
+            
+    if rowsNumber != 0:
+        matrixMsg.append(constants.END_OF_MESSAGE)
+        sendMessage(''.join(matrixMsg), outputSocket)
+        
+    # Sending end of matrix messages
+    matrixMsg[:] = []
+    matrixMsg.append(constants.MATRIX_RESPONSE_HEADER)
+    matrixMsg.append(constants.MATRIX_ROWS_SEPARATOR)
+    matrixMsg.append(constants.MATRIX_END)
+    matrixMsg.append(constants.END_OF_MESSAGE)
+    sendMessage(''.join(matrixMsg), outputSocket)
+
+
+def sendRouteCacheStatistics(routeCache, outputSocket):
+    """
+    Sends the route cache statistics(6) to Client
+    """
+    statisticsMsg = []
+    statisticsMsg.append(constants.ROUTE_CACHE_RESPONSE_HEADER)
+    
+    for counter in routeCache.getStatistics():
+        statisticsMsg.append(constants.SEPARATOR)
+        statisticsMsg.append(str(counter))
+        
+    statisticsMsg.append(constants.END_OF_MESSAGE)
+    
+    sendMessage(''.join(statisticsMsg), outputSocket)
+
 
-    sendRoute(route, outputSocket)
+def getRoutingGraph(graphDict, reverseGraphDict, edgesDict, junctionsCoordsDict):
+    """
+    Returns the routing graph compiled once for the routing engines, with its contraction hierarchy and landmarks (See routingGraph.py)
+    """
+    routingGraph = RoutingGraph(graphDict, reverseGraphDict)
+    routingGraph.setCoordinates(edgesDict, junctionsCoordsDict)
+    if constants.CONTRACTION_HIERARCHY_ENABLED:
+        routingGraph.hierarchy = contractionHierarchy.getContractionHierarchy(routingGraph)
+    routingGraph.landmarks = landmarks.getLandmarks(routingGraph)
+    return routingGraph
 
 
-def run(mtraci, inputSocket, outputSocket, eShutdown, eRouteReady, eManagerReady, graphDict, junctionsDict, edgesDict):
+def processCommand(command, commandSize, outputSocket, mtraci, junctionsDict, edgesDict, routingGraph, spatialIndex, routeCache, edgeClosures, duarouterPool, travelTimes):
+    """
+    Processes a request received from Client, the responses being sent by the reply of the request (See orderedReplies.py).
+    Returns True if the reply is closed by a Duarouter worker
+    """
+    if commandSize >= 6 and command[0] == constants.ROUTING_REQUEST_HEADER:
+        try:
+            command.pop(0)
+            algorithm = command[0]
+            command.pop(0)
+            geo = int(command[0])
+            command.pop(0)
+            return processRouteRequest(algorithm, geo, command, junctionsDict, routingGraph, edgesDict, spatialIndex, routeCache, edgeClosures, duarouterPool, travelTimes, outputSocket, mtraci)
+        except Exception as e:
+            if e.__class__.__name__ != constants.CLOSED_SOCKET_EXCEPTION and e.__class__.__name__ != constants.TRACI_EXCEPTION:
+                sendRoutingError(outputSocket, constants.ROUTE_ROUTING_REQUEST_FAILED)
+                raise
+        
+    # Distance matrix request
+    elif commandSize >= 4 and command[0] == constants.MATRIX_REQUEST_HEADER and command[1].isdigit() and 0 < int(command[1]) < commandSize - 2:
+        try:
+            sourcesNumber = int(command[1])
+            processMatrixRequest(command[2:sourcesNumber + 2], command[sourcesNumber + 2:], routingGraph, edgeClosures, outputSocket)
+        except Exception as e:
+            if e.__class__.__name__ != constants.CLOSED_SOCKET_EXCEPTION and e.__class__.__name__ != constants.TRACI_EXCEPTION:
+                sendRoutingError(outputSocket, constants.ROUTE_ROUTING_REQUEST_FAILED)
+                raise
+        
+    # Route cache statistics request
+    elif commandSize == 1 and command[0] == constants.ROUTE_CACHE_REQUEST_HEADER:
+        sendRouteCacheStatistics(routeCache, outputSocket)
+        
+        
+    # Error
+    else:
+        Logger.warning("{}Invalid command received: {}".format(constants.PRINT_PREFIX_ROUTER, command))
+        sendAck(constants.PRINT_PREFIX_ROUTER, constants.INVALID_MESSAGE, outputSocket)
+
+    return False
+
+
+def run(mtraci, inputSocket, outputSocket, eShutdown, eRouteReady, eManagerReady, junctionsDict, edgesDict, routingGraph, spatialIndex, routeCache, edgeClosures, duarouterPool, travelTimes):
     """
     See file description
     """
     bufferSize = 1024
+    replies = OrderedReplies(outputSocket)
     
     eRouteReady.set()
     while not eManagerReady.is_set():
@@ -189,26 +410,21 @@ def run(mtraci, inputSocket, outputSocket, eShutdown, eRouteReady, eManagerReady
                         command[i] = str(command[i])
                         
                     Logger.infoFile("{} Message received: {}".format(constants.PRINT_PREFIX_ROUTER, cmd))
-                
-                    # Routing request
-                    if commandSize >= 6 and command[0] == constants.ROUTING_REQUEST_HEADER:
-                        try:
-                            command.pop(0)
-                            algorithm = command[0]
-                            command.pop(0)
-                            geo = int(command[0])
-                            command.pop(0)
-                            processRouteRequest(algorithm, geo, command, junctionsDict, graphDict, edgesDict, outputSocket, mtraci)
-                        except Exception as e:
-                            if e.__class__.__name__ != constants.CLOSED_SOCKET_EXCEPTION and e.__class__.__name__ != constants.TRACI_EXCEPTION:
-                                sendRoutingError(outputSocket, constants.ROUTE_ROUTING_REQUEST_FAILED)
-                                raise
-                        
-                        
-                    # Error
-                    else:
-                        Logger.warning("{}Invalid command received: {}".format(constants.PRINT_PREFIX_ROUTER, command))
-                        sendAck(constants.PRINT_PREFIX_ROUTER, constants.INVALID_MESSAGE, outputSocket)
+                    tag = None
+                    if commandSize >= 3 and command[0] == constants.TAGGED_REQUEST_HEADER:
+                        tag = command[1]
+                        command = command[2:]
+                        commandSize -= 2
+                    
+                    reply = replies.reserve(tag)
+                    try:
+                        deferred = processCommand(command, commandSize, reply, mtraci, junctionsDict, edgesDict, routingGraph, spatialIndex, routeCache, edgeClosures, duarouterPool, travelTimes)
+                    except:
+                        deferred = False
+                        raise
+                    finally:
+                        if not deferred:
+                            reply.close()
                 
         except Exception as e:
             if e.__class__.__name__ == constants.CLOSED_SOCKET_EXCEPTION or e.__class__.__name__ == constants.TRACI_EXCEPTION:
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+
+"""
+@file    routeCache.py
+@author  ASTra team
+@date    16/10/2026
+
+This file contains the cache of the routes computed by the router (See route.py).
+It is shared by the router thread, which reads and fills it, and by the graph thread, which invalidates it
+when edges are blocked or unblocked (See graph.py).
+
+Cache entries:
+    - Key=(routingAlgorithm, source edgeId, (destination edgeId 1, ..., destination edgeId N)), as received from Client
+    - Value=route (list of edges index, See idRegistry.py)
+The least recently used entry is evicted when the cache is full (See constants).
+
+Invalidation:
+    - When an edge is blocked, every cached route going through it is dropped
+    - When an edge is unblocked, every route cached while this edge was blocked is dropped,
+      since a shorter route may now go through it
+"""
+
+from collections import OrderedDict
+from threading import Lock
+
+
+class RouteCache(object):
+    """
+    Thread safe LRU cache of routes, indexed by the edges they go through
+    """
+    def __init__(self, maxSize):
+        self.maxSize = maxSize
+        self.routes = OrderedDict()
+        self.edgeKeys = dict()
+        self.blockedEdgeKeys = dict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Returns a copy of the route cached for the given key, None if there is no such route
+        """
+        self.lock.acquire()
+        try:
+            route = self.routes.pop(key, None)
+            if route is None:
+                self.misses += 1
+                return None
+            self.routes[key] = route
+            self.hits += 1
+            return list(route)
+        finally:
+            self.lock.release()
+
+    def put(self, key, route):
+        """
+        Adds a route to the cache, evicting the least recently used routes if the cache is full.
+        A route going through a blocked edge (computed before this one was blocked) is not cached
+        """
+        if self.maxSize <= 0:
+            return
+
+        self.lock.acquire()
+        try:
+            for edge in route:
+                if edge in self.blockedEdgeKeys:
+                    return
+            if key in self.routes:
+                self.remove(key)
+            while len(self.routes) >= self.maxSize:
+                self.remove(next(iter(self.routes)))
+                self.evictions += 1
+
+            route = tuple(route)
+            self.routes[key] = route
+            for edge in set(route):
+                self.edgeKeys.setdefault(edge, set()).add(key)
+            for keys in self.blockedEdgeKeys.itervalues():
+                keys.add(key)
+        finally:
+            self.lock.release()
+
+    def remove(self, key):
+        """
+        Removes a route from the cache and from the edges index. The lock must be held by the caller
+        """
+        route = self.routes.pop(key)
+        for edge in set(route):
+            keys = self.edgeKeys[edge]
+            keys.discard(key)
+            if not keys:
+                del self.edgeKeys[edge]
+        for keys in self.blockedEdgeKeys.itervalues():
+            keys.discard(key)
+
+    def blockEdges(self, edges):
+        """
+        Drops the routes going through the given edges index
+        """
+        self.lock.acquire()
+        try:
+            for edge in edges:
+                for key in list(self.edgeKeys.get(edge, ())):
+                    self.remove(key)
+                self.blockedEdgeKeys.setdefault(edge, set())
+        finally:
+            self.lock.release()
+
+    def unblockEdges(self, edges):
+        """
+        Drops the routes cached while the given edges index were blocked
+        """
+        self.lock.acquire()
+        try:
+            for edge in edges:
+                for key in list(self.blockedEdgeKeys.pop(edge, ())):
+                    self.remove(key)
+        finally:
+            self.lock.release()
+
+    def getStatistics(self):
+        """
+        Returns the hits, misses and evictions counters, and the number of cached routes
+        """
+        self.lock.acquire()
+        try:
+            return self.hits, self.misses, self.evictions, len(self.routes)
+        finally:
+            self.lock.release()
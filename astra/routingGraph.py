@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+
+"""
+@file    routingGraph.py
+@author  ASTra team
+@date    16/10/2026
+
+This file contains the compiled routing graph used by the routing engines (See dijkstra.py).
+
+The graph dictionary (See graph.py (21)) and the reverse graph dictionary (See graph.py (23)) are compiled once
+into a CSR (compressed sparse row) adjacency:
+    - Every edge ID is interned to an integer index: the edge index of the ID registry (See idRegistry.py) for a binary graph,
+      the rank of the edge ID sorted otherwise. Comparing two indexes gives the same result than comparing the two edges ID
+    - The successors of the vertex i are targets[offsets[i]:offsets[i + 1]]
+    - The length of the arc linking the vertex i to targets[j] is weights[j]
+
+When the junctions coordinates are set, each vertex is also located at the end junction of its edge
+(See xs and ys), which is used by the goal directed engines (See astar.py)
+
+A binary graph dictionary (See binaryDictionary.py) is already stored in this layout, so its arrays are used directly.
+The routing engines only handle vertices index: the routes are translated to edges ID when they are sent (See route.py).
+
+The contraction hierarchy (See contractionHierarchy.py) and the landmarks (See landmarks.py) of the graph
+can also be attached to it
+"""
+
+import constants
+from array import array
+from math import hypot
+from logger import Logger
+from binaryDictionary import MappedGraph
+from binaryDictionary import MappedEdges
+from binaryDictionary import MappedCoordinates
+
+
+class RoutingGraph(object):
+    """
+    Graph dictionary compiled into integer indexed arrays
+    """
+    def __init__(self, graphDict, reverseGraphDict=None):
+        if isinstance(graphDict, MappedGraph):
+            self.registry = graphDict.registry
+            self.edgeIds = self.registry.edgeIds
+            self.edgeIndexes = None
+        else:
+            vertices = set(graphDict)
+            for successors in graphDict.itervalues():
+                vertices.update(successors)
+            self.registry = None
+            self.edgeIds = sorted(vertices)
+            self.edgeIndexes = dict((edgeId, index) for index, edgeId in enumerate(self.edgeIds))
+            
+        self.offsets, self.targets, self.weights = self.compileArcs(graphDict)
+            
+        self.xs = None
+        self.ys = None
+        self.heuristicScale = 0.0
+        self.hierarchy = None
+        self.landmarks = None
+        self.reverseGraph = None
+        
+        if reverseGraphDict is not None:
+            self.reverseGraph = self.getVerticesCopy()
+            self.reverseGraph.offsets, self.reverseGraph.targets, self.reverseGraph.weights = self.compileArcs(reverseGraphDict)
+            self.reverseGraph.reverseGraph = self
+
+    def compileArcs(self, graphDict):
+        """
+        Returns the offsets, targets and weights arrays of a graph dictionary, using the vertices index of the current graph.
+        The arrays of a binary graph using the same vertices index are used without decoding the graph
+        """
+        if isinstance(graphDict, MappedGraph) and graphDict.registry is self.registry:
+            return graphDict.offsets, graphDict.targets, graphDict.weights
+        
+        offsets = array('i', [0])
+        targets = array('i')
+        weights = array('d')
+
+        for edgeId in self.edgeIds:
+            if edgeId in graphDict:
+                for successor, length in graphDict[edgeId].iteritems():
+                    targets.append(self.getIndex(successor))
+                    weights.append(length)
+            offsets.append(len(targets))
+            
+        return offsets, targets, weights
+    
+    def getVerticesCopy(self):
+        """
+        Returns a routing graph without any arc, sharing the vertices index of the current graph
+        """
+        graph = RoutingGraph(dict())
+        graph.registry = self.registry
+        graph.edgeIds = self.edgeIds
+        graph.edgeIndexes = self.edgeIndexes
+        return graph
+
+    def setCoordinates(self, edgesDict, junctionsCoordsDict):
+        """
+        Locates every vertex at the end junction of its edge, and computes the heuristic scale:
+        the minimum arc weight per straight line unit between the two vertices of an arc.
+        Multiplied by this scale, the straight line distance between two vertices is a lower bound
+        of their shortest path length. The scale is 0 (no heuristic) if a vertex cannot be located.
+        The scale is logged, with a warning if it is far below the median arc weight per straight line unit (See constants)
+        """
+        verticesNumber = self.getVerticesNumber()
+        self.xs = array('d', [0.0]) * verticesNumber
+        self.ys = array('d', [0.0]) * verticesNumber
+        self.heuristicScale = 0.0
+        
+        if isinstance(edgesDict, MappedEdges) and isinstance(junctionsCoordsDict, MappedCoordinates) and edgesDict.registry is self.registry:
+            # Both dictionaries are indexed by the ID registry, no ID is decoded
+            if len(junctionsCoordsDict) == 0:
+                return
+            junctionsTo = edgesDict.junctionsTo
+            for v in xrange(verticesNumber):
+                self.xs[v] = junctionsCoordsDict.xs[junctionsTo[v]]
+                self.ys[v] = junctionsCoordsDict.ys[junctionsTo[v]]
+        else:
+            for index, edgeId in enumerate(self.edgeIds):
+                try:
+                    self.xs[index], self.ys[index] = junctionsCoordsDict[edgesDict[edgeId][1]]
+                except KeyError:
+                    return
+            
+        ratios = array('d')
+        for v in xrange(verticesNumber):
+            for i in xrange(self.offsets[v], self.offsets[v + 1]):
+                w = self.targets[i]
+                straightLine = hypot(self.xs[w] - self.xs[v], self.ys[w] - self.ys[v])
+                if straightLine > 0:
+                    ratios.append(self.weights[i] / straightLine)
+        if not ratios:
+            return
+        
+        # A single arc much shorter than its straight line (e.g. a short edge between two large junctions) lowers the whole heuristic
+        self.heuristicScale = min(ratios)
+        medianRatio = sorted(ratios)[len(ratios) // 2]
+        Logger.info("{}A* heuristic scale: {} (median arc weight per straight line unit: {})".format(constants.PRINT_PREFIX_ROUTER, self.heuristicScale, medianRatio))
+        if self.heuristicScale < constants.ASTAR_HEURISTIC_SCALE_WARNING_RATIO * medianRatio:
+            Logger.warning("{}The A* heuristic scale collapsed, A* routing requests will explore nearly as many edges as Dijkstra ones".format(constants.PRINT_PREFIX_ROUTER))
+
+    def getReverseGraph(self):
+        """
+        Returns the routing graph where every arc is reversed. This one shares the vertices index of the current graph.
+        If no reverse graph dictionary was given, the current graph is transposed
+        """
+        if self.reverseGraph is None:
+            verticesNumber = self.getVerticesNumber()
+            predecessors = [[] for v in xrange(verticesNumber)]
+            for v in xrange(verticesNumber):
+                for i in xrange(self.offsets[v], self.offsets[v + 1]):
+                    predecessors[self.targets[i]].append((v, self.weights[i]))
+                    
+            reverseGraph = self.getVerticesCopy()
+            for w in xrange(verticesNumber):
+                for v, weight in predecessors[w]:
+                    reverseGraph.targets.append(v)
+                    reverseGraph.weights.append(weight)
+                reverseGraph.offsets.append(len(reverseGraph.targets))
+            reverseGraph.reverseGraph = self
+            self.reverseGraph = reverseGraph
+            
+        return self.reverseGraph
+
+    def getVerticesNumber(self):
+        """
+        Returns the number of vertices (edges ID) of the graph
+        """
+        return len(self.edgeIds)
+
+    def getIndex(self, edgeId):
+        """
+        Returns the vertex index of an edge ID. A KeyError is raised if the edge is unknown
+        """
+        if self.registry is not None:
+            return self.registry.getEdgeIndex(edgeId)
+        return self.edgeIndexes[edgeId]
+
+    def getEdgeId(self, index):
+        """
+        Returns the edge ID of a vertex index
+        """
+        return self.edgeIds[index]
+
+    def getPath(self, predecessors, start, end):
+        """
+        Returns the list of vertices index from the start to the end vertex index, following a predecessors array
+        """
+        path = []
+        while end != start:
+            path.append(end)
+            end = predecessors[end]
+        path.append(start)
+        path.reverse()
+        return path
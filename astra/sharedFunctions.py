@@ -10,9 +10,13 @@ or to the contrary avoid these call because of concurrent access to the TraCI re
 """
 
 import os
+import hashlib
 import constants
 from logger import Logger
 
+""" Network files hash, as {Key=network file path, Value=((size, modification time), hash)} (See getNetworkHash) """
+networkHashes = dict()
+
 def isJunction(edgeId):
     """
     Returns true if the edge belongs to a junction
@@ -34,6 +38,36 @@ def getEdgeFromLane(lane):
     return lane.split('_')[0]
 
 
+def getLaneIndexFromLane(lane):
+    """
+    Returns the index of the received lane in its edge
+    """
+    return int(lane[lane.rindex('_') + 1:])
+
+
+def getLinkedLane(lanesLinksDict, inLane, outEdge):
+    """
+    Returns the first lane of the out edge linked with the in lane, using the lanes links dictionary (See graph.py (28)).
+    If the in lane is not linked with the out edge, the other lanes of the in edge are used in order.
+    Returns None if no lane of the in edge is linked with the out edge
+    """
+    inEdge = getEdgeFromLane(inLane)
+    inLaneIndex = getLaneIndexFromLane(inLane)
+    links = lanesLinksDict.get((inEdge, inLaneIndex))
+    laneIndex = 0
+    
+    while links is not None:
+        for outLane, linkIndex in links:
+            if getEdgeFromLane(outLane) == outEdge:
+                return outLane
+        if laneIndex == inLaneIndex:
+            laneIndex += 1
+        links = lanesLinksDict.get((inEdge, laneIndex))
+        laneIndex += 1
+        
+    return None
+
+
 def getFirstLaneFromEdge(edgeId):
     """
     Returns the first lane ID from and edge ID given in parameter
@@ -50,13 +84,88 @@ def getOppositeEdge(edge):
     return '-' + edge
 
 
-def isDictionaryOutOfDate(dictionaryFile, networkFile):
+def getNetworkHash(networkFile):
+    """
+    Returns the SHA-1 hash of the network file content. The hash is computed again only if the file size or modification time changed
+    """
+    path = os.path.abspath(networkFile)
+    stamp = (os.path.getsize(path), os.path.getmtime(path))
+    cached = networkHashes.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    sha1 = hashlib.sha1()
+    networkFileObject = open(path, 'rb')
+    chunk = networkFileObject.read(constants.NETWORK_HASH_CHUNK_SIZE)
+    while chunk:
+        sha1.update(chunk)
+        chunk = networkFileObject.read(constants.NETWORK_HASH_CHUNK_SIZE)
+    networkFileObject.close()
+
+    networkHashes[path] = (stamp, sha1.hexdigest())
+    return networkHashes[path][1]
+
+
+def getDictionaryManifest(networkFile, settings):
+    """
+    Returns the manifest line expected for a dictionary file: the network file hash, the dictionaries format version,
+    the generator settings and the dictionary file size (appended by the caller)
+    """
+    manifest = [getNetworkHash(networkFile), str(constants.DICTIONARY_FORMAT_VERSION)]
+    manifest.extend(str(setting) for setting in settings)
+    return manifest
+
+
+def isDictionaryOutOfDate(dictionaryFile, networkFile, settings=()):
     """
-    Returns true if the dictionary file doesn't exist or is older than the network file the dictionary is based on
+    Returns true if the dictionary file doesn't exist, is damaged (size different from the manifest one),
+    or was not generated from the current network file content, dictionaries format version and generator settings
     """
-    if os.path.isfile(os.path.abspath(dictionaryFile)):
-        return os.path.getmtime(os.path.abspath(networkFile)) > os.path.getmtime(os.path.abspath(dictionaryFile))
-    return True
+    path = os.path.abspath(dictionaryFile)
+    try:
+        manifestFile = open(path + constants.DICTIONARY_MANIFEST_EXTENSION, 'r')
+        manifest = manifestFile.readline()[0:-1].split(constants.SEPARATOR)
+        manifestFile.close()
+        size = os.path.getsize(path)
+    except (IOError, OSError):
+        return True
+    return manifest != getDictionaryManifest(networkFile, settings) + [str(size)]
+
+
+def replaceFile(source, destination):
+    """
+    Renames a file to the destination path, replacing the destination file if it exists
+    """
+    if os.name == 'nt' and os.path.isfile(destination):
+        # os.rename does not replace an existing file on Windows
+        os.remove(destination)
+    os.rename(source, destination)
+
+
+def getTemporaryDictionaryFile(dictionaryFile):
+    """
+    Returns the temporary file path a dictionary is written to before being committed (See commitDictionaryFile)
+    """
+    return os.path.abspath(dictionaryFile) + constants.DICTIONARY_TEMPORARY_EXTENSION
+
+
+def commitDictionaryFile(dictionaryFile, networkFile, settings=()):
+    """
+    Moves a dictionary written in its temporary file (See getTemporaryDictionaryFile) to its final path, then writes its manifest.
+    The previous manifest is deleted first, so that an interrupted export always leaves a dictionary out of date
+    """
+    path = os.path.abspath(dictionaryFile)
+    manifestPath = path + constants.DICTIONARY_MANIFEST_EXTENSION
+    if os.path.isfile(manifestPath):
+        os.remove(manifestPath)
+    replaceFile(getTemporaryDictionaryFile(dictionaryFile), path)
+
+    manifest = getDictionaryManifest(networkFile, settings) + [str(os.path.getsize(path))]
+    manifestFile = open(manifestPath + constants.DICTIONARY_TEMPORARY_EXTENSION, 'w')
+    manifestFile.write(constants.SEPARATOR.join(manifest))
+    manifestFile.write(constants.END_OF_LINE)
+    manifestFile.close()
+    replaceFile(manifestPath + constants.DICTIONARY_TEMPORARY_EXTENSION, manifestPath)
 
 
 def correctRoute(edgeSrc, edgeDest, route):
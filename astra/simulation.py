@@ -6,9 +6,12 @@
 @date    07/06/2013
 
 Script algorithm:
+Subscribing every edge to its mean speed and occupancy
 While 1:
     Running a SUMO simulation step of X seconds
-    Sending a vehicles position(1) message to the remote client by an output socket
+    Reading the edges mean speed and occupancy for the travel time routing (See travelTimes.py)
+    Sending a vehicles position(1) message to the remote client by an output socket, built from the vehicles
+    subscription results of the step: one TraCI call for the whole message (See vehicle.py)
     Sending the vehicles ID of each arrived vehicle (2) by an output socket
     Changing the traffic lights phases if required for cleaning the road for priority vehicles
     Sleeping Y seconds
@@ -25,10 +28,11 @@ import time
 import constants
 import traci
 from trafficLights import updateTllForPriorityVehicles
-from trafficLights import getTrafficLightsDictionary
 from vehicle import sendArrivedVehicles
 from vehicle import sendVehiclesCoordinates
 from vehicle import getRegularVehicles
+from travelTimes import subscribeEdges
+from travelTimes import collectMeasures
 from logger import Logger
 
 def runSimulationStep(mtraci):
@@ -40,28 +44,22 @@ def runSimulationStep(mtraci):
     mtraci.release()
         
     
-def removeArrivedVehicles(arrivedVehicles, priorityVehicles, mPriorityVehicles, managedTllDict, vehicles):
+def removeArrivedVehicles(arrivedVehicles, vehicleRegistry, managedTllDict):
     """
-    Removes every arrived vehicles from the priority vehicles shared list
+    Removes every arrived vehicles from the vehicles registry, and the traffic lights managed for the arrived priority vehicles
     """
     for vehicleId in arrivedVehicles:
+        record = vehicleRegistry.remove(vehicleId)
         
-        if not constants.IGNORED_VEHICLES_REGEXP.match(vehicleId):
-            vehicles.remove(vehicleId)
-        
-            mPriorityVehicles.acquire()
-            if vehicleId in priorityVehicles:
-                priorityVehicles.remove(vehicleId)
-            mPriorityVehicles.release()
-            
+        if record is not None and record.priority:
             for key in managedTllDict.keys():
                 if managedTllDict[key][0] == vehicleId:
                     del managedTllDict[key]
     
 
-def notifyAndUpdateArrivedVehicles(mtraci, outputSocket, priorityVehicles, mPriorityVehicles, managedTllDict, vehicles):
+def notifyAndUpdateArrivedVehicles(mtraci, outputSocket, vehicleRegistry, managedTllDict):
     """
-    Sends an arrived vehicles message (2) to the remote client and Remove every arrived vehicles from the priority vehicles shared list
+    Sends an arrived vehicles message (2) to the remote client and Remove every arrived vehicles from the vehicles registry
     """
     mtraci.acquire()
     arrivedVehicles = traci.simulation.getArrivedIDList()
@@ -70,16 +68,16 @@ def notifyAndUpdateArrivedVehicles(mtraci, outputSocket, priorityVehicles, mPrio
     
     if constants.SEND_ARRIVED_VEHICLES and (constants.SEND_MSG_EVEN_IF_EMPTY or (not constants.SEND_MSG_EVEN_IF_EMPTY and arrivedVehicles)):
         sendArrivedVehicles(arrivedVehicles, mtraci, outputSocket)
-    removeArrivedVehicles(arrivedVehicles, priorityVehicles, mPriorityVehicles, managedTllDict, vehicles)
+    removeArrivedVehicles(arrivedVehicles, vehicleRegistry, managedTllDict)
     
 
-def run(mtraci, outputSocket, mRelaunch, eShutdown, eSimulationReady, priorityVehicles, mPriorityVehicles, eManagerReady, vehicles, mVehicles):
+def run(mtraci, outputSocket, mRelaunch, eShutdown, eSimulationReady, eManagerReady, vehicleRegistry, travelTimes, lanesLinksDict, tllDict, edges, projection):
     """
     See file description
     """
     yellowTllDict = dict()
     managedTllDict = dict()
-    tllDict = getTrafficLightsDictionary(mtraci)
+    subscribeEdges(mtraci, edges)
     
     mRelaunch.acquire()
     eSimulationReady.set()
@@ -89,14 +87,18 @@ def run(mtraci, outputSocket, mRelaunch, eShutdown, eSimulationReady, priorityVe
     while not eShutdown.is_set():
         startTime = time.clock()
         try:
-            mVehicles.acquire()
-            runSimulationStep(mtraci)
-            notifyAndUpdateArrivedVehicles(mtraci, outputSocket, priorityVehicles, mPriorityVehicles, managedTllDict, vehicles)
-            mVehicles.release()
+            vehicleRegistry.lock.acquire()
+            try:
+                runSimulationStep(mtraci)
+                notifyAndUpdateArrivedVehicles(mtraci, outputSocket, vehicleRegistry, managedTllDict)
+            finally:
+                vehicleRegistry.lock.release()
+            collectMeasures(mtraci, travelTimes)
+            vehicles = vehicleRegistry.getVehicles()
             if constants.SEND_VEHICLES_COORDS and (constants.SEND_MSG_EVEN_IF_EMPTY or (not constants.SEND_MSG_EVEN_IF_EMPTY and vehicles)):
-                sendVehiclesCoordinates(vehicles, mtraci, outputSocket, mVehicles)
+                sendVehiclesCoordinates(vehicles, mtraci, outputSocket, projection)
                 
-            updateTllForPriorityVehicles(mtraci, priorityVehicles, mPriorityVehicles, tllDict, yellowTllDict, managedTllDict)
+            updateTllForPriorityVehicles(mtraci, vehicleRegistry, tllDict, yellowTllDict, managedTllDict, lanesLinksDict)
 
         except Exception as e:
             if e.__class__.__name__ == constants.TRACI_EXCEPTION or e.__class__.__name__ == constants.CLOSED_SOCKET_EXCEPTION:
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+
+"""
+@file    spatialIndex.py
+@author  ASTra team
+@date    16/10/2026
+
+This file contains the spatial index of the lanes shapes, used to find the edge nearest to a point
+without calling traci.simulation.convertRoad (See route.py).
+
+Index:
+    - Every lane shape of the network file (except internal lanes) is split into segments, each one linked with the index of its edge (See idRegistry.py)
+    - The network bounding box is divided in a uniform grid of square cells (See constants for the cell size).
+      The segments crossing the bounding box of a cell are listed in this cell: the segments of the cell i
+      are cellsSegments[cellsOffsets[i]:cellsOffsets[i + 1]]
+
+Nearest edge query:
+    The cells are visited by squares rings around the cell of the point. The search stops as soon as the distance between the point
+    and the nearest segment found is shorter than the distance between the point and any cell not visited yet
+
+Geographic coordinates are converted to SUMO coordinates by the network projection (See projection.py), when this one is supported
+"""
+
+import constants
+from array import array
+from math import floor
+from math import sqrt
+
+
+def getSquaredDistanceToSegment(x, y, x1, y1, x2, y2):
+    """
+    Returns the squared distance between the point (x, y) and the segment [(x1, y1), (x2, y2)]
+    """
+    dx = x2 - x1
+    dy = y2 - y1
+    squaredLength = dx * dx + dy * dy
+    if squaredLength > 0:
+        t = ((x - x1) * dx + (y - y1) * dy) / squaredLength
+        if t > 1:
+            t = 1
+        elif t < 0:
+            t = 0
+        x1 += t * dx
+        y1 += t * dy
+    return (x - x1) * (x - x1) + (y - y1) * (y - y1)
+
+
+def buildSpatialIndex(edgeIds, edgesShapes):
+    """
+    Returns the spatial index of edges shapes given as {Key=edgeId, Value=[lane shape 1 [(x1, y1), ..., (xN, yN)], ..., lane shape N]},
+    the segments being linked with the index of their edge in the edgeIds list (See idRegistry.py)
+    """
+    segmentsEdges = array('i')
+    xs1 = array('d')
+    ys1 = array('d')
+    xs2 = array('d')
+    ys2 = array('d')
+
+    for edgeIndex, edgeId in enumerate(edgeIds):
+        for shape in edgesShapes.get(edgeId, ()):
+            for i in xrange(len(shape) - 1):
+                segmentsEdges.append(edgeIndex)
+                xs1.append(shape[i][0])
+                ys1.append(shape[i][1])
+                xs2.append(shape[i + 1][0])
+                ys2.append(shape[i + 1][1])
+
+    cellSize = float(constants.SPATIAL_INDEX_CELL_SIZE)
+    if segmentsEdges:
+        minX = min(min(xs1), min(xs2))
+        minY = min(min(ys1), min(ys2))
+        columns = int((max(max(xs1), max(xs2)) - minX) / cellSize) + 1
+        rows = int((max(max(ys1), max(ys2)) - minY) / cellSize) + 1
+    else:
+        minX = minY = 0.0
+        columns = rows = 0
+
+    # Listing the segments of each cell, then storing these lists as CSR arrays
+    cells = dict()
+    for i in xrange(len(segmentsEdges)):
+        column1 = int((min(xs1[i], xs2[i]) - minX) / cellSize)
+        column2 = int((max(xs1[i], xs2[i]) - minX) / cellSize)
+        row1 = int((min(ys1[i], ys2[i]) - minY) / cellSize)
+        row2 = int((max(ys1[i], ys2[i]) - minY) / cellSize)
+        for row in xrange(row1, row2 + 1):
+            for column in xrange(column1, column2 + 1):
+                cells.setdefault(row * columns + column, []).append(i)
+
+    cellsOffsets = array('i', [0])
+    cellsSegments = array('i')
+    for cell in xrange(columns * rows):
+        cellsSegments.extend(cells.get(cell, ()))
+        cellsOffsets.append(len(cellsSegments))
+
+    grid = array('d', [minX, minY, cellSize, columns, rows])
+    return SpatialIndex(edgeIds, segmentsEdges, xs1, ys1, xs2, ys2, grid, cellsOffsets, cellsSegments)
+
+
+class SpatialIndex(object):
+    """
+    Uniform grid of the lanes segments (See file description)
+    """
+    def __init__(self, edgeIds, segmentsEdges, xs1, ys1, xs2, ys2, grid, cellsOffsets, cellsSegments):
+        self.edgeIds = edgeIds
+        self.segmentsEdges = segmentsEdges
+        self.xs1 = xs1
+        self.ys1 = ys1
+        self.xs2 = xs2
+        self.ys2 = ys2
+        self.grid = grid
+        self.minX = grid[0]
+        self.minY = grid[1]
+        self.cellSize = grid[2]
+        self.columns = int(grid[3])
+        self.rows = int(grid[4])
+        self.cellsOffsets = cellsOffsets
+        self.cellsSegments = cellsSegments
+        self.projection = None
+
+    def getArrays(self):
+        """
+        Returns the arrays of the index, in the order expected by the constructor
+        """
+        return [self.segmentsEdges, self.xs1, self.ys1, self.xs2, self.ys2, self.grid, self.cellsOffsets, self.cellsSegments]
+
+    def getNearestEdge(self, x, y):
+        """
+        Returns the ID of the edge nearest to the SUMO coordinates (x, y), None if the index is empty
+        """
+        if not self.segmentsEdges:
+            return None
+
+        cellSize = self.cellSize
+        column = min(max(int(floor((x - self.minX) / cellSize)), 0), self.columns - 1)
+        row = min(max(int(floor((y - self.minY) / cellSize)), 0), self.rows - 1)
+        bestDistance = float('inf')
+        bestSegment = -1
+        ring = 0
+
+        while True:
+            for r in xrange(max(row - ring, 0), min(row + ring, self.rows - 1) + 1):
+                onRowBorder = r == row - ring or r == row + ring
+                for c in xrange(max(column - ring, 0), min(column + ring, self.columns - 1) + 1):
+                    if not onRowBorder and c != column - ring and c != column + ring:
+                        continue
+                    cell = r * self.columns + c
+                    for j in xrange(self.cellsOffsets[cell], self.cellsOffsets[cell + 1]):
+                        i = self.cellsSegments[j]
+                        distance = getSquaredDistanceToSegment(x, y, self.xs1[i], self.ys1[i], self.xs2[i], self.ys2[i])
+                        if distance < bestDistance:
+                            bestDistance = distance
+                            bestSegment = i
+
+            if column - ring <= 0 and row - ring <= 0 and column + ring >= self.columns - 1 and row + ring >= self.rows - 1:
+                break
+
+            # Distance between the point and the cells outside of the visited square
+            left = self.minX + (column - ring) * cellSize
+            bottom = self.minY + (row - ring) * cellSize
+            right = self.minX + (column + ring + 1) * cellSize
+            top = self.minY + (row + ring + 1) * cellSize
+            margin = max(min(x - left, right - x, y - bottom, top - y), 0)
+            if bestSegment != -1 and sqrt(bestDistance) <= margin:
+                break
+            ring += 1
+
+        return self.edgeIds[self.segmentsEdges[bestSegment]]
+
+    def getNearestEdges(self, points):
+        """
+        Returns the IDs of the edges nearest to a list of SUMO coordinates [(x1, y1), ..., (xN, yN)]
+        """
+        return [self.getNearestEdge(x, y) for x, y in points]
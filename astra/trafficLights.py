@@ -57,9 +57,16 @@ import constants
 import traci
 import time
 import traceback
+from array import array
+from binaryDictionary import exportDictionary
+from binaryDictionary import importDictionary
+from binaryDictionary import getStringsTable
+from binaryDictionary import MappedStrings
 from sharedFunctions import isJunction
 from sharedFunctions import getEdgeFromLane
 from sharedFunctions import getFirstLaneFromEdge
+from sharedFunctions import getLaneIndexFromLane
+from sharedFunctions import getLinkedLane
 from sharedFunctions import isDictionaryOutOfDate
 from sharedFunctions import sendAck
 from logger import Logger
@@ -100,51 +107,40 @@ def buildTrafficLightsDictionary(mtraci):
 
 def exportTrafficLightsDictionary(tllDict):
     """
-    Writes the traffic lights dictionary in an output file 
+    Writes the traffic lights dictionary in an output binary file (See binaryDictionary.py)
     """
     Logger.info("{}Exporting traffic lights dictionary...".format(constants.PRINT_PREFIX_TLL))
-    tllFile = open(constants.SUMO_TLL_DICTIONARY_FILE, 'w')
+    strings, indexes = getStringsTable(set(tllDict) | set(tllDict.itervalues()))
     
-    for pair in tllDict.items():
-        tllFile.write(pair[0])
-        tllFile.write(constants.SEPARATOR)
-        tllFile.write(pair[1])
-        tllFile.write(constants.END_OF_LINE)
+    keys = array('i')
+    values = array('i')
+    for edgeId in sorted(tllDict):
+        keys.append(indexes[edgeId])
+        values.append(indexes[tllDict[edgeId]])
         
-    tllFile.close()
+    exportDictionary(constants.SUMO_TLL_DICTIONARY_FILE, strings, [keys, values])
     Logger.info("{}Done".format(constants.PRINT_PREFIX_TLL))
     
     
 def importTrafficLightsDictionary():
     """
-    Reads the traffic lights dictionary from an input file
+    Reads the traffic lights dictionary from an input binary file. The traffic lights ID are decoded when accessed
     """
     Logger.info("{}Importing traffic lights dictionary...".format(constants.PRINT_PREFIX_TLL))
-    tllFile = open(constants.SUMO_TLL_DICTIONARY_FILE, 'r')
-    tllDict = dict()
-    
-    line = tllFile.readline()[0:-1]
-    while line:
-        array = line.split(constants.SEPARATOR)
-        tllDict[array[0]] = array[1]
-        line = tllFile.readline()[0:-1]
-    
-    tllFile.close()
+    strings, arrays = importDictionary(constants.SUMO_TLL_DICTIONARY_FILE)
+    tllDict = MappedStrings(strings, *arrays)
     Logger.info("{}Done".format(constants.PRINT_PREFIX_TLL))
     return tllDict
 
 
 def getTrafficLightsDictionary(mtraci):
     """
-    Returns the traffic lights dictionary(*). This one is obtained from a text file, updated if new map data are detected
+    Returns the traffic lights dictionary(*). This one is obtained from a binary file, updated if new map data are detected
     """
     if isDictionaryOutOfDate(constants.SUMO_TLL_DICTIONARY_FILE, constants.SUMO_NETWORK_FILE):
         tllDict = buildTrafficLightsDictionary(mtraci)
         exportTrafficLightsDictionary(tllDict)
-    else:
-        tllDict = importTrafficLightsDictionary()
-    return tllDict
-
+    return importTrafficLightsDictionary()
 
 
 """
@@ -169,61 +165,17 @@ def getOrangeState(currentState, prioLaneIndex):
     return ''.join(orangeState)
 
 
-def removeDoubles(doubleList):
-    """
-    Returns a list containing each unique item of the list given in parameter. The order does not change
-    """
-    uniqueList = []
-    tmpItem = None
-    for item in doubleList:
-        if item != tmpItem:
-            uniqueList.append(item)
-            tmpItem = item
-    
-    return uniqueList
-
-
-def getUniqueInputLanes(mtraci, tllId):
-    """
-    Returns the unique ordered (according to the hidden lane index calculated from this order) lanes 
-    controlled by the traffic light given in parameter
-    """
-    mtraci.acquire()
-    inputLanes = traci.trafficlights.getControlledLanes(tllId)
-    mtraci.release()
-    
-    return removeDoubles(inputLanes)
-
-
-def getHiddenLaneIndex(mtraci, inputLanes, inLane, outLane):
+def getHiddenLaneIndex(lanesLinksDict, inLane, outLane):
     """
     Returns the index of the hidden lane defined by an inLane (going in the junction) and an outLane
-    (leaving from the junction). The unique controlled (in) lanes list is used for this purpose
+    (leaving from the junction), which is the link index read from the lanes links dictionary (See graph.py (28)).
+    Returns -1 if these lanes are not linked by a traffic light
     """
-    i = 0
-    hiddenLaneIndex = 0
-    found = False
-    
-    while i < len(inputLanes) and not found:
-        lane = inputLanes[i]
+    for linkedLane, linkIndex in lanesLinksDict.get((getEdgeFromLane(inLane), getLaneIndexFromLane(inLane)), ()):
+        if linkedLane == outLane:
+            return linkIndex
         
-        mtraci.acquire()
-        tmpLinks = traci.lane.getLinks(lane)
-        mtraci.release()
-        
-        if lane == inLane:
-            j = 0
-            tmpLinksLength = len(tmpLinks)
-            while j < tmpLinksLength and not found:
-                if tmpLinks[j][0] == outLane:
-                    hiddenLaneIndex += j
-                    found = True
-                j += 1
-        else:
-            hiddenLaneIndex += len(tmpLinks)
-        i += 1
-        
-    return hiddenLaneIndex
+    return constants.XML_CONNECTION_NO_LINK_INDEX
 
 
 def restorePreviousPhaseDefinition(mtraci, yellowTllDict, tllId, greenPhaseIndex):
@@ -255,41 +207,19 @@ def getGreenPhaseIndex(phasesDetails, hiddenLaneIndex):
     return phaseIndex
 
 
-def getOutLane(mtraci, inLane, outEdge):
+def getOutLane(lanesLinksDict, inLane, outEdge):
     """
     Returns the (out) lane linked with the (in) lane which match with the (out) edge received
-    If no lane match, the algorithm will use as inLane the next lane on the inEdge.
+    If no lane match, the algorithm will use as inLane the other lanes of the inEdge.
     If no lane match and if there is no other lane available on the inEdge, -1 will be returned
     """
-    found = False
-    laneIndex = 0
-    laneOutIndex = 0
-    
-    while not found:
-        try:
-            mtraci.acquire()
-            lanesOut = traci.lane.getLinks(inLane)
-            mtraci.release()
-        except:
-            mtraci.release()
-            return -1
-        
-        while laneOutIndex < len(lanesOut) and not found:
-            outLane = lanesOut[laneOutIndex][0]
-            if getEdgeFromLane(outLane) == outEdge:
-                found = True
-            else:
-                laneOutIndex += 1
-        
-        if not found:
-            laneIndex += 1
-            laneOutIndex = 0
-            inLane = inLane[:len(inLane) - 1] + str(laneIndex)
-            
+    outLane = getLinkedLane(lanesLinksDict, inLane, outEdge)
+    if outLane is None:
+        return -1
     return outLane
 
 
-def changeState(mtraci, tllId, inLane, outLane, setState, yellowTllDict):
+def changeState(mtraci, tllId, inLane, outLane, setState, yellowTllDict, lanesLinksDict):
     """
     Changes a traffic light current phase index in order to set it green for the priority lane
     or sets a global before-green state (See getOrangeState())
@@ -303,8 +233,10 @@ def changeState(mtraci, tllId, inLane, outLane, setState, yellowTllDict):
     if setState == constants.SET_YELLOW and isOrange:
         return
     
-    lanes = getUniqueInputLanes(mtraci, tllId)
-    hiddenLaneIndex = getHiddenLaneIndex(mtraci, lanes, inLane, outLane)
+    # If the traffic light does not control the link the vehicle will use
+    hiddenLaneIndex = getHiddenLaneIndex(lanesLinksDict, inLane, outLane)
+    if hiddenLaneIndex == constants.XML_CONNECTION_NO_LINK_INDEX:
+        return
     
     mtraci.acquire()
     completeDefinition = traci.trafficlights.getCompleteRedYellowGreenDefinition(tllId)
@@ -319,7 +251,7 @@ def changeState(mtraci, tllId, inLane, outLane, setState, yellowTllDict):
     currentState = phasesDetails[currentPhaseIndex * 2]
     
     # If the traffic light the given edge which ends with does not contain a signal for the lane the vehicle will go to 
-    if len(currentState) == hiddenLaneIndex:
+    if len(currentState) <= hiddenLaneIndex:
         return
     
     # The traffic light is gren for the priority lane, and the time but the time for the priority vehicle to reach the junction is unsufficient
@@ -361,7 +293,7 @@ def changeState(mtraci, tllId, inLane, outLane, setState, yellowTllDict):
     #    Logger.info(tllId + " is GREEN => nothing to do")
 
 
-def updateTllForPriorityVehicles(mtraci, priorityVehicles, mPriorityVehicles, tllDict, yellowTllDict, managedTllDict):
+def updateTllForPriorityVehicles(mtraci, vehicleRegistry, tllDict, yellowTllDict, managedTllDict, lanesLinksDict):
     """
     Determines for each priority vehicle which are the next traffic lights and the distance to these ones.
     Regarding to the vehicle current speed and the time elapsed during a SUMO simulation step,
@@ -371,17 +303,14 @@ def updateTllForPriorityVehicles(mtraci, priorityVehicles, mPriorityVehicles, tl
         at the beginning, but then only explore the edges which are now in the vehicle scope because of
         the last step progression. Two list, one for the orange look up and one for the green, would be used
         for this purpose.
-    Note 2: The main complexity of this algorithm resides in the lack of TraCI functionalities in order to get
-        retrieve the state of a hidden lane linking two lanes. This could also be highly improved by using a
-        dictionary built when starting the software.
+    Note 2: The hidden lane linking two lanes is read from the lanes links dictionary (See graph.py (28)), without any TraCI call.
+    Note 3: The vehicles registry is locked meanwhile, so that the priority vehicles cannot be removed from the simulation (See vehicleRegistry.py)
     """
-    mPriorityVehicles.acquire()
+    vehicleRegistry.lock.acquire()
     managedTlls = [];
-    length = len(priorityVehicles)
     
     # Checking if the next traffic light has to be changed for each priority vehicleId in the simulation
-    for prioVehIndex in range(0, length):
-        vehicleId = priorityVehicles[prioVehIndex]
+    for vehicleId in vehicleRegistry.getPriorityVehicles():
         
         # Getting route and position information for the current priority vehicleId
         mtraci.acquire()
@@ -420,7 +349,7 @@ def updateTllForPriorityVehicles(mtraci, priorityVehicles, mPriorityVehicles, tl
                     # Calculating the next lane the vehicleId will go to
                     outEdge = route[edgeIndex + 1]
                     
-                    outLane = getOutLane(mtraci, lane, outEdge)
+                    outLane = getOutLane(lanesLinksDict, lane, outEdge)
                     
                     # Calling for a traffic light change
                     if outLane != -1 and setState != constants.IGNORE:
@@ -428,7 +357,7 @@ def updateTllForPriorityVehicles(mtraci, priorityVehicles, mPriorityVehicles, tl
                         managedTlls.append(tllId)
                         if (tllId in managedTllDict and managedTllDict[tllId][1] > remainingLength) or not tllId in managedTllDict:
                                 managedTllDict[tllId] = (vehicleId, remainingLength)
-                                changeState(mtraci, tllId, lane, outLane, setState, yellowTllDict)
+                                changeState(mtraci, tllId, lane, outLane, setState, yellowTllDict, lanesLinksDict)
 
                 edgeIndex += 1
                 if edgeIndex < len(route):
@@ -448,7 +377,7 @@ def updateTllForPriorityVehicles(mtraci, priorityVehicles, mPriorityVehicles, tl
                     
             managedTlls[:] = []
     
-    mPriorityVehicles.release()
+    vehicleRegistry.lock.release()
 
 
 
@@ -494,10 +423,14 @@ def calculateTrafficLightCoordinates(trafficId, mtraci):
     return tllCoords
 
 
-def getTrafficLightCoordinates(trafficId, mtraci):
+def getTrafficLightCoordinates(trafficId, mtraci, junctionsGeoCoordsDict):
     """
-    Returns the geographic coordinates of a traffic light from its SUMO ID
+    Returns the geographic coordinates of a traffic light from its SUMO ID.
+    These ones are read from the junctions geographic coordinates dictionary (See graph.py (24)), or computed by SUMO if the junction is not found
     """
+    if junctionsGeoCoordsDict is not None and trafficId in junctionsGeoCoordsDict:
+        return junctionsGeoCoordsDict[trafficId]
+    
     try:
         mtraci.acquire()
         coords = traci.junction.getPosition(trafficId)
@@ -566,7 +499,7 @@ def setCompletePhasesDefinition(tllId, phasesDetails, currentPhaseIndex, mtraci)
     return constants.ACK_OK
     
 
-def sendTrafficLightsPosition(trafficLightsId, mtraci, outputSocket, uniqueMsg):
+def sendTrafficLightsPosition(trafficLightsId, mtraci, outputSocket, uniqueMsg, junctionsGeoCoordsDict):
     """
     Sends traffic lights position messages(*) to the remote client using an output socket
     """
@@ -576,7 +509,7 @@ def sendTrafficLightsPosition(trafficLightsId, mtraci, outputSocket, uniqueMsg):
     
     # Requires 32768 bytes buffer: sending traffic lights per packet of 500
     for trafficId in trafficLightsId:
-        tllCoords = getTrafficLightCoordinates(trafficId, mtraci)
+        tllCoords = getTrafficLightCoordinates(trafficId, mtraci, junctionsGeoCoordsDict)
         if tllCoords == -1:
             tllCoords = calculateTrafficLightCoordinates(trafficId, mtraci)
         
@@ -629,11 +562,12 @@ def sendTrafficLightsPosition(trafficLightsId, mtraci, outputSocket, uniqueMsg):
         Logger.infoFile("{} Message sent: {}".format(constants.PRINT_PREFIX_TLL, strmsg))
     
     
-def saveTrafficLightScreenshot(login, tllId, zoom, mtraci):
+def saveTrafficLightScreenshot(login, tllId, zoom, mtraci, junctionsGeoCoordsDict, projection):
     """
-    Saves a screenshot centered on the specified junction from SUMO GUI
+    Saves a screenshot centered on the specified junction from SUMO GUI.
+    The junction coordinates are converted by the network projection (See projection.py), or by SUMO if this one is not supported
     """
-    tllCoords = getTrafficLightCoordinates(tllId, mtraci)
+    tllCoords = getTrafficLightCoordinates(tllId, mtraci, junctionsGeoCoordsDict)
     if tllCoords == -1:
         tllCoords = calculateTrafficLightCoordinates(tllId, mtraci)
     
@@ -641,7 +575,10 @@ def saveTrafficLightScreenshot(login, tllId, zoom, mtraci):
     
     try:
         mtraci.acquire()
-        tll2DCoords = traci.simulation.convertGeo(tllCoords[0], tllCoords[1], True)
+        if projection is not None:
+            tll2DCoords = projection.convertXY(tllCoords[0], tllCoords[1])
+        else:
+            tll2DCoords = traci.simulation.convertGeo(tllCoords[0], tllCoords[1], True)
         viewList = traci.gui.getIDList()
         mtraci.release()
     except:
@@ -712,12 +649,12 @@ def sendTrafficLightsDetails(tllId, tmsLogin, screenshotPath, outputSocket, mtra
         raise constants.ClosedSocketException("The listening socket has been closed")
 
 
-def processGetDetailsRequest(tmsLogin, tllId, zoom, outputSocket, mtraci, detailsLevel):
+def processGetDetailsRequest(tmsLogin, tllId, zoom, outputSocket, mtraci, detailsLevel, junctionsGeoCoordsDict, projection):
     """
     Gets a traffic lights details information from SUMO, then sends them(***) to the remote client by an output socket
     """
     if not constants.POSIX_OS:
-        screenshotPath = saveTrafficLightScreenshot(tmsLogin, tllId, zoom, mtraci)
+        screenshotPath = saveTrafficLightScreenshot(tmsLogin, tllId, zoom, mtraci, junctionsGeoCoordsDict, projection)
     else:
         screenshotPath = 'null'
     sendTrafficLightsDetails(tllId, tmsLogin, screenshotPath, outputSocket, mtraci, detailsLevel)
@@ -763,16 +700,12 @@ def processSetDetailsRequest(command, commandSize, outputSocket, mtraci):
     sendAck(constants.PRINT_PREFIX_TLL, returnCode, outputSocket)
     
     
-def run(mtraci, inputSocket, outputSocket, eShutdown, eTrafficLightsReady, eManagerReady):
+def run(mtraci, inputSocket, outputSocket, eShutdown, eTrafficLightsReady, eManagerReady, trafficLightsId, junctionsGeoCoordsDict, projection):
     """
     See file description
     """
     bufferSize = 1024
     
-    mtraci.acquire()
-    trafficLightsId = traci.trafficlights.getIDList()
-    mtraci.release()
-    
     eTrafficLightsReady.set()
     while not eManagerReady.is_set():
         time.sleep(constants.SLEEP_SYNCHRONISATION)
@@ -809,18 +742,18 @@ def run(mtraci, inputSocket, outputSocket, eShutdown, eTrafficLightsReady, eMana
                     
                     # Send all traffic lights geographic coordinates to the client
                     if commandSize == 1 and command[0] == constants.ALL_TLL_COORDS_REQUEST_HEADER:
-                        sendTrafficLightsPosition(trafficLightsId, mtraci, outputSocket, False)
+                        sendTrafficLightsPosition(trafficLightsId, mtraci, outputSocket, False, junctionsGeoCoordsDict)
                     
                     
                     # Send the requested traffic lights geographic coordinates to the client    
                     elif commandSize > 1 and command[0] == constants.TLL_COORDS_REQUEST_HEADER:
                         command.pop(0)
-                        sendTrafficLightsPosition(command, mtraci, outputSocket, True)
+                        sendTrafficLightsPosition(command, mtraci, outputSocket, True, junctionsGeoCoordsDict)
                         
                         
                     # Process a GET details request (**)
                     elif commandSize == 5 and command[0] == constants.TLL_GET_DETAILS_REQUEST_HEADER:
-                        processGetDetailsRequest(command[1], command[2], int(command[3]), outputSocket, mtraci, int(command[4]))
+                        processGetDetailsRequest(command[1], command[2], int(command[3]), outputSocket, mtraci, int(command[4]), junctionsGeoCoordsDict, projection)
                         
                         
                     # Process a SET details request (**)
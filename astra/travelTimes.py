@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+
+"""
+@file    travelTimes.py
+@author  ASTra team
+@date    16/10/2026
+
+This file contains the live travel times of the edges, used as routing weights by the travel time routing mode (See route.py).
+
+Measures (simulation thread, See simulation.py):
+    Every edge is subscribed to its last step mean speed and occupancy. After each simulation step, every subscription
+    result is read at once and stored as a pending measure.
+
+Weights (router thread):
+    The travel time graph shares the vertices and arcs of the routing graph (See routingGraph.py), but has its own weights array.
+    The length of the arc linking a vertex to a successor is the expected travel time of the successor edge:
+        arc length in the routing graph (successor lane length) / max(successor mean speed, minimum speed)
+    the minimum speed being used on an edge whose occupancy reaches the jam occupancy (See constants).
+    Before a routing, only the arcs entering an edge whose speed changed are updated, using the index of the arcs entering each vertex.
+"""
+
+import constants
+import traci
+import traci.constants as tc
+from array import array
+from threading import Lock
+
+
+"""
+============================================================================================================================================
+===                                                            MEASURES COLLECTION                                                       ===
+============================================================================================================================================
+"""
+def subscribeEdges(mtraci, edges):
+    """
+    Subscribes every edge of the edges ID list (except internal ones) to its last step mean speed and occupancy
+    """
+    mtraci.acquire()
+    try:
+        for edge in edges:
+            if edge[0] != ':':
+                traci.edge.subscribe(edge, (tc.LAST_STEP_MEAN_SPEED, tc.LAST_STEP_OCCUPANCY))
+    finally:
+        mtraci.release()
+
+
+def collectMeasures(mtraci, travelTimes):
+    """
+    Reads the edges subscription results of the last simulation step, and gives them to the travel times
+    """
+    mtraci.acquire()
+    try:
+        results = traci.edge.getSubscriptionResults()
+    finally:
+        mtraci.release()
+
+    measures = dict()
+    for edge, variables in results.iteritems():
+        if tc.LAST_STEP_MEAN_SPEED in variables and tc.LAST_STEP_OCCUPANCY in variables:
+            measures[edge] = (variables[tc.LAST_STEP_MEAN_SPEED], variables[tc.LAST_STEP_OCCUPANCY])
+    travelTimes.setMeasures(measures)
+
+
+
+"""
+============================================================================================================================================
+===                                                            TRAVEL TIMES WEIGHTS                                                      ===
+============================================================================================================================================
+"""
+class TravelTimes(object):
+    """
+    Travel times of the edges, shared by the simulation thread (measures) and the router thread (weights)
+    """
+    def __init__(self):
+        self.lock = Lock()
+        self.measures = dict()
+        self.graph = None
+        self.lengths = None
+        self.speeds = None
+        self.incomingOffsets = None
+        self.incomingArcs = None
+
+    def setMeasures(self, measures):
+        """
+        Stores the last mean speed and occupancy measures, as {Key=edgeId, Value=(meanSpeed, occupancy)}
+        """
+        self.lock.acquire()
+        self.measures.update(measures)
+        self.lock.release()
+
+    def compile(self, routingGraph):
+        """
+        Builds the travel time graph of a routing graph, and the index of the arcs entering each vertex.
+        Every edge travels at the default speed until its first measure (See constants)
+        """
+        verticesNumber = routingGraph.getVerticesNumber()
+        offsets = routingGraph.offsets
+        targets = routingGraph.targets
+        weights = routingGraph.weights
+
+        self.graph = routingGraph.getVerticesCopy()
+        self.graph.offsets = offsets
+        self.graph.targets = targets
+        self.graph.weights = array('d', weights)
+        self.graph.xs = routingGraph.xs
+        self.graph.ys = routingGraph.ys
+
+        self.lengths = weights
+        incomingCounts = array('i', [0]) * (verticesNumber + 1)
+        for i in xrange(len(targets)):
+            incomingCounts[targets[i] + 1] += 1
+
+        self.incomingOffsets = array('i', [0]) * (verticesNumber + 1)
+        for v in xrange(verticesNumber):
+            self.incomingOffsets[v + 1] = self.incomingOffsets[v] + incomingCounts[v + 1]
+        self.incomingArcs = array('i', [0]) * len(targets)
+        positions = array('i', self.incomingOffsets)
+        for i in xrange(len(targets)):
+            self.incomingArcs[positions[targets[i]]] = i
+            positions[targets[i]] += 1
+
+        self.speeds = array('d', [0.0]) * verticesNumber
+        for v in xrange(verticesNumber):
+            self.setSpeed(v, constants.TRAVEL_TIME_DEFAULT_SPEED)
+
+    def setSpeed(self, v, speed):
+        """
+        Sets the speed of a vertex, and the travel time of every arc entering it
+        """
+        self.speeds[v] = speed
+        weights = self.graph.weights
+        lengths = self.lengths
+        incomingArcs = self.incomingArcs
+        for j in xrange(self.incomingOffsets[v], self.incomingOffsets[v + 1]):
+            i = incomingArcs[j]
+            weights[i] = lengths[i] / speed
+
+    def getSpeed(self, meanSpeed, occupancy):
+        """
+        Returns the expected speed on an edge from its last mean speed and occupancy
+        """
+        if occupancy >= constants.TRAVEL_TIME_JAM_OCCUPANCY:
+            return constants.TRAVEL_TIME_MIN_SPEED
+        return max(meanSpeed, constants.TRAVEL_TIME_MIN_SPEED)
+
+    def getRoutingGraph(self, routingGraph):
+        """
+        Returns the travel time graph of a routing graph, after updating the weights of the edges measured since the previous call
+        """
+        if self.graph is None:
+            self.compile(routingGraph)
+
+        self.lock.acquire()
+        measures = self.measures
+        self.measures = dict()
+        self.lock.release()
+
+        for edge, measure in measures.iteritems():
+            try:
+                v = self.graph.getIndex(edge)
+            except KeyError:
+                continue
+            speed = self.getSpeed(measure[0], measure[1])
+            if speed != self.speeds[v]:
+                self.setSpeed(v, speed)
+
+        return self.graph
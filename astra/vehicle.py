@@ -16,7 +16,10 @@ Requests must be sent on the port 180005, responses are sent on the port 18006.
         If NO VEHICLE is specified, every vehicle will be deleted
         Followed by (12)
 
-(4) Stress test request: MOC prefixId vehiclesNumber routeLength
+(4) Stress test request: MOC prefixId vehiclesNumber routeLength [seed]
+        The routes are random walks over the graph dictionary (See randomRoutes.py), always the same ones for a given seed (See constants for the default one)
+        The vehicles are added to SUMO by batches, each one under a single TraCI lock
+        The vehicles added before a failure (e.g. a prefixId already used) are kept, the failure being acknowledged
     Followed by (12)
 
 (5) Get vehicles speed request: SPE vehicleId1 vehicleId2 ... vehicleIdN
@@ -33,18 +36,33 @@ Requests must be sent on the port 180005, responses are sent on the port 18006.
 (11) ERROR response when an invalid request is received : ERR 40
 
 (12) Acknowledge response (14) : ACK returnCode
+
+(13) Batch add request: ADB vehicleId1 priority1 edgesNumber1 edge1 ... edgeN ... vehicleIdN priorityN edgesNumberN edge1 ... edgeN
+        The routes are validated by the lanes links dictionary (See graph.py (28)) and every vehicle is added under a single TraCI lock
+        The request must end with an end of message: it is only processed once this one is read, whatever the number of socket reads
+    Followed by (14) Batch acknowledge response: ADB ackCode1 ... ackCodeN, in the vehicles order of the request
+        If the request is malformed, (12) is sent instead
+
+Every added vehicle is saved in the vehicles registry (See vehicleRegistry.py), and subscribed to its position, speed and lane
+(See subscribeVehicles). The speed (6) and coordinates (8) responses are built from the subscription results of the last simulation step, read in a single TraCI call.
+The coordinates are converted to geographic ones by the network projection (See projection.py), or by SUMO if this one is not supported.
 """
 
 import sys
 import time
 import constants
 import traci
-from random import randint
+import traci.constants as tc
+from itertools import islice
 from sharedFunctions import getFirstLaneFromEdge
-from sharedFunctions import getEdgeFromLane
+from sharedFunctions import getLinkedLane
 from sharedFunctions import sendAck
 from logger import Logger
 
+""" Variables every vehicle is subscribed to """
+VEHICLE_SUBSCRIPTION_VARIABLES = (tc.VAR_POSITION, tc.VAR_SPEED, tc.VAR_LANE_ID)
+
+
 def getRouteIdFromVehicleId(vehicleId, cRouteId):
     """
     Returns a route ID from a user vehicle ID
@@ -52,27 +70,6 @@ def getRouteIdFromVehicleId(vehicleId, cRouteId):
     return (vehicleId + str(cRouteId)).encode()
 
 
-def appendEdge(route, edgesNumber, mtraci):
-    """
-    Appends edgesNumber random following edges to the route given in parameter
-    """
-    for i in range(0, edgesNumber):
-        edge = route[len(route) - 1]
-        lane = edge + "_0"
-        
-        mtraci.acquire()
-        links = traci.lane.getLinks(lane)
-        mtraci.release()
-        
-        if len(links) == 0:
-            return -1
-        
-        nextEdge = links[randint(0, len(links) - 1)][0].split('_')[0]
-        route.append(nextEdge)
-        
-    return route
-
-
 def sendIdentifiedAck(vehicleId, errorCode, outputSocket):
     """
     Sends an acknowledge(2) message to the remote client using an output socket
@@ -93,38 +90,14 @@ def sendIdentifiedAck(vehicleId, errorCode, outputSocket):
     Logger.infoFile("{} Message sent: {}".format(constants.PRINT_PREFIX_VEHICLE, strmsg))
 
 
-def isRouteValidForTraCI(mtraci, route):
+def isRouteValidForTraCI(lanesLinksDict, route):
     """
-    Returns true if the given route is linked by SUMO lanes, false else
+    Returns true if the given route is linked by SUMO lanes, false else.
+    The lanes links are read from the lanes links dictionary (See graph.py (28))
     """
     for i in range(0, len(route) - 1):
-        inEdge = route[i]
-        outEdge = route[i + 1]
-        inLaneIndex = 0
-        inLane = getFirstLaneFromEdge(inEdge)
-        found = False
-        
-        while not found:
-            try:
-                mtraci.acquire()
-                lanesOut = traci.lane.getLinks(inLane)
-                mtraci.release()
-            except:
-                mtraci.release()
-                return False
-            
-            laneOutIndex = 0
-            
-            while laneOutIndex < len(lanesOut) and not found:
-                outLane = lanesOut[laneOutIndex][0]
-                if getEdgeFromLane(outLane) == outEdge:
-                    found = True
-                else:
-                    laneOutIndex += 1
-            
-            if not found:
-                inLaneIndex += 1
-                inLane = inLane[:len(inLane) - 1] + str(inLaneIndex)
+        if getLinkedLane(lanesLinksDict, getFirstLaneFromEdge(route[i]), route[i + 1]) is None:
+            return False
                 
     return True
 
@@ -142,11 +115,11 @@ def isRouteValid(route, junctionsDict, edgesDict):
     return True
     
 
-def addRouteToSumo(vehicleId, routeId, route, mtraci, outputSocket):
+def addRouteToSumo(vehicleId, routeId, route, mtraci, lanesLinksDict, outputSocket):
     """
     Adds a vehicle and its route to the SUMO simulation. An error may be sent to the remote client
     """
-    if not isRouteValidForTraCI(mtraci, route):
+    if not isRouteValidForTraCI(lanesLinksDict, route):
         Logger.warning("{}Invalid route detected: {}".format(constants.PRINT_PREFIX_VEHICLE, route))
         return constants.VEHICLE_INVALID_ROUTE
     
@@ -160,6 +133,7 @@ def addRouteToSumo(vehicleId, routeId, route, mtraci, outputSocket):
             mtraci.release()
             return constants.VEHICLE_INVALID_ROUTE
         else:
+            traci.vehicle.subscribe(vehicleId, VEHICLE_SUBSCRIPTION_VARIABLES)
             mtraci.release()
             
     except:
@@ -170,54 +144,126 @@ def addRouteToSumo(vehicleId, routeId, route, mtraci, outputSocket):
     return constants.ACK_OK
     
     
-def savePriorityVehicles(mtraci, vehicleId, priority, priorityVehicles, mPriorityVehicles):
-    """
-    If the vehicle received is priority, this one is append in the priority vehicles shared list protected by a mutex
-    """
-    if priority == constants.PRIORITY_VEHICLE:
-        mPriorityVehicles.acquire()
-        priorityVehicles.append(vehicleId)
-        mPriorityVehicles.release()
-    
-    
-def addVehicle(vehicleId, priority, route, mtraci, cRouteId, outputSocket, priorityVehicles, mPriorityVehicles, vehicles, mVehicles):
+def addVehicle(vehicleId, priority, route, mtraci, lanesLinksDict, cRouteId, outputSocket, vehicleRegistry):
     """
     - Transforms the coordinates to SUMO edges ID
     - Adds a vehicle and its route to the SUMO simulation
-    - Saves this one as a priority vehicle if he is priority
+    - Saves this one in the vehicles registry, as a priority vehicle if he is priority
     """
     if not route:
         return sendIdentifiedAck(vehicleId, constants.VEHICLE_EMPTY_ROUTE, outputSocket)
     
     routeId = getRouteIdFromVehicleId(vehicleId, cRouteId)
-    returnCode = addRouteToSumo(vehicleId, routeId, route, mtraci, outputSocket)
+    returnCode = addRouteToSumo(vehicleId, routeId, route, mtraci, lanesLinksDict, outputSocket)
     
     if returnCode == constants.ACK_OK:
-        savePriorityVehicles(mtraci, vehicleId, priority, priorityVehicles, mPriorityVehicles)
-        
-		if not constants.IGNORED_VEHICLES_REGEXP.match(vehicleId):
-			mVehicles.acquire()
-			vehicles.append(vehicleId)
-			mVehicles.release()
+        vehicleRegistry.add(vehicleId, priority == constants.PRIORITY_VEHICLE, routeId)
         
     sendIdentifiedAck(vehicleId, returnCode, outputSocket)    
     
 
-def removeVehicles(vehiclesToDel, priorityVehicles, mPriorityVehicles, mtraci, outputSocket, vehicles, mVehicles):
-    """ Removes the specified vehicles from the simulation """
+def parseVehiclesBatch(command):
+    """
+    Returns the (vehicleId, priority, route) records of a batch add request(13), without its header.
+    None is returned if the request is malformed
+    """
+    records = []
+    i = 0
+    commandSize = len(command)
+    
+    while i < commandSize:
+        if i + 3 > commandSize or not command[i + 2].isdigit():
+            return None
+        routeEnd = i + 3 + int(command[i + 2])
+        if routeEnd > commandSize:
+            return None
+        records.append((command[i], command[i + 1], command[i + 3:routeEnd]))
+        i = routeEnd
+        
+    return records
+
+
+def sendBatchAck(returnCodes, outputSocket):
+    """
+    Sends a batch acknowledge(14) message to the remote client using an output socket
+    """
+    ackMsg = []
+    ackMsg.append(constants.VEHICLE_ADD_BATCH_RESPONSE_HEADER)
+    for returnCode in returnCodes:
+        ackMsg.append(constants.SEPARATOR)
+        ackMsg.append(str(returnCode))
+    ackMsg.append(constants.END_OF_MESSAGE)
+    
+    strmsg = ''.join(ackMsg)
+    try:
+        outputSocket.send(strmsg.encode())
+    except:
+        raise constants.ClosedSocketException("The listening socket has been closed")
+    Logger.infoFile("{} Message sent: {}".format(constants.PRINT_PREFIX_VEHICLE, strmsg))
+    
+    
+def addVehiclesBatch(records, mtraci, lanesLinksDict, cRouteId, outputSocket, vehicleRegistry):
+    """
+    - Validates the route of each (vehicleId, priority, route) record with the lanes links dictionary
+    - Adds every valid vehicle and its route to the SUMO simulation under a single TraCI lock.
+      A vehicle whose ID is already used is rejected before its route is added
+    - Saves the added vehicles in the vehicles registry, then sends a batch acknowledge(14)
+    Returns the number of route ID used. TraCI cannot remove a route, so the route of a vehicle which cannot be added
+    remains in SUMO: its ID is never reused since the route counter is incremented by the number of records
+    """
+    returnCodes = []
+    for vehicleId, priority, route in records:
+        if not route:
+            returnCodes.append(constants.VEHICLE_EMPTY_ROUTE)
+        elif not isRouteValidForTraCI(lanesLinksDict, route):
+            Logger.warning("{}Invalid route detected: {}".format(constants.PRINT_PREFIX_VEHICLE, route))
+            returnCodes.append(constants.VEHICLE_INVALID_ROUTE)
+        else:
+            returnCodes.append(constants.ACK_OK)
+    
+    addedVehicles = []
+    mtraci.acquire()
+    try:
+        usedVehiclesId = set(traci.vehicle.getIDList())
+        for i, record in enumerate(records):
+            if returnCodes[i] != constants.ACK_OK:
+                continue
+            vehicleId, priority, route = record
+            if vehicleId in usedVehiclesId or vehicleId in vehicleRegistry:
+                Logger.error("{}Vehicle {} cannot be added to SUMO Simulation: its ID is already used".format(constants.PRINT_PREFIX_VEHICLE, vehicleId))
+                returnCodes[i] = constants.VEHICLE_ADD_FAILED
+                continue
+            usedVehiclesId.add(vehicleId)
+            routeId = getRouteIdFromVehicleId(vehicleId, cRouteId + i)
+            try:
+                traci.route.add(routeId, route)
+                traci.vehicle.add(vehicleId, routeId, -2, 0, 0, 0, constants.DEFAULT_VEHICLE_TYPE)
+                traci.vehicle.subscribe(vehicleId, VEHICLE_SUBSCRIPTION_VARIABLES)
+                addedVehicles.append((vehicleId, priority == constants.PRIORITY_VEHICLE, routeId))
+            except Exception as e:
+                if e.__class__.__name__ == constants.TRACI_EXCEPTION:
+                    raise
+                Logger.error("{}Vehicle {} or its route cannot be added to SUMO Simulation".format(constants.PRINT_PREFIX_VEHICLE, vehicleId))
+                returnCodes[i] = constants.VEHICLE_ADD_FAILED
+    finally:
+        mtraci.release()
+    
+    vehicleRegistry.lock.acquire()
+    for vehicleId, priority, routeId in addedVehicles:
+        vehicleRegistry.add(vehicleId, priority, routeId)
+    vehicleRegistry.lock.release()
+    
+    sendBatchAck(returnCodes, outputSocket)
+    return len(records)
+    
+
+def removeVehicles(vehiclesToDel, mtraci, outputSocket, vehicleRegistry):
+    """ Removes the specified vehicles from the simulation and from the vehicles registry """
     returnCode = constants.ACK_OK
     
-    mVehicles.acquire()
+    vehicleRegistry.lock.acquire()
     for vehicleToDel in vehiclesToDel:
-        mPriorityVehicles.acquire()
-        if vehicleToDel in priorityVehicles:
-            priorityVehicles.remove(vehicleToDel)
-        mPriorityVehicles.release()
-        
-        try:
-            vehicles.remove(vehicleToDel)
-        except:
-            pass
+        vehicleRegistry.remove(vehicleToDel)
         
         try:
             mtraci.acquire()
@@ -226,73 +272,115 @@ def removeVehicles(vehiclesToDel, priorityVehicles, mPriorityVehicles, mtraci, o
         except:
             mtraci.release()
             returnCode = constants.VEHICLE_DELETE_FAILED_UNKNOWN
-    mVehicles.release()
+    vehicleRegistry.lock.release()
     
     sendAck(constants.PRINT_PREFIX_VEHICLE, returnCode, outputSocket)
     
 
-def addRandomVehicles(vehicleIdPrefix, vehiclesNumber, routeSize, mtraci, outputSocket, vehicles, mVehicles):
+def addRandomVehicles(vehicleIdPrefix, vehiclesNumber, routeSize, seed, mtraci, randomRoutes, outputSocket, vehicleRegistry):
     """
-    Adds vehiclesNumber vehicles to SUMO, linking each of these to a random route of routeSize edges
+    Adds vehiclesNumber vehicles to SUMO, linking each of these to a random route of routeSize edges (See randomRoutes.py).
+    The vehicles are added by batches, each one under a single TraCI lock (See constants).
+    The vehicles are added until SUMO refuses one (e.g. a vehicle ID already used by a previous request with the same prefix),
+    or if no random route can be generated, the failure being acknowledged
     """
     Logger.info("{}Adding {} vehicles to the simulation...".format(constants.PRINT_PREFIX_VEHICLE, vehiclesNumber))
     returnCode = constants.ACK_OK
+    routes = randomRoutes.getRoutes(vehiclesNumber, routeSize, seed)
     i = 0
-    route = []
-    mtraci.acquire()
-    edges = traci.edge.getIDList()
-    mtraci.release()
-    edgesNumber = len(edges)
     
-    while i < vehiclesNumber:
-        vehicleId = vehicleIdPrefix + str(i)
-        routeId = getRouteIdFromVehicleId(vehicleIdPrefix, i)
-        
-        # Building random route
-        edgeSrc = edges[randint(0, edgesNumber)]
-        route.append(edgeSrc)
-        route = appendEdge(route, routeSize, mtraci)
+    while i < vehiclesNumber and returnCode == constants.ACK_OK:
+        try:
+            batch = list(islice(routes, constants.VEHICLE_MOCK_BATCH_SIZE))
+        except ValueError as e:
+            Logger.error("{}{}".format(constants.PRINT_PREFIX_VEHICLE, e))
+            returnCode = constants.VEHICLE_MOCK_FAILED
+            continue
         
-        if route != -1:
-            # Adding route and vehicle to SUMO
-            mVehicles.acquire()
-			if not constants.IGNORED_VEHICLES_REGEXP.match(vehicle):
-				vehicles.append(vehicleId)
-            mtraci.acquire()
-            traci.route.add(routeId, route)
-            traci.vehicle.add(vehicleId, routeId, -2, 0, 0, 0, "DEFAULT_VEHTYPE")
+        # Adding routes and vehicles to SUMO
+        vehicleRegistry.lock.acquire()
+        mtraci.acquire()
+        try:
+            for route in batch:
+                vehicleId = vehicleIdPrefix + str(i)
+                routeId = getRouteIdFromVehicleId(vehicleIdPrefix, i)
+                traci.route.add(routeId, route)
+                traci.vehicle.add(vehicleId, routeId, -2, 0, 0, 0, constants.DEFAULT_VEHICLE_TYPE)
+                traci.vehicle.subscribe(vehicleId, VEHICLE_SUBSCRIPTION_VARIABLES)
+                vehicleRegistry.add(vehicleId, False, routeId)
+                i += 1
+        except traci.TraCIException:
+            Logger.error("{}Vehicle {} or its route cannot be added to SUMO Simulation".format(constants.PRINT_PREFIX_VEHICLE, vehicleId))
+            returnCode = constants.VEHICLE_MOCK_FAILED
+        finally:
             mtraci.release()
-            mVehicles.release()
-            route[:] = []
-            i += 1
-        else:
-            route = []
+            vehicleRegistry.lock.release()
             
-    Logger.info("{}Done".format(constants.PRINT_PREFIX_VEHICLE))
+    Logger.info("{}{} vehicles added".format(constants.PRINT_PREFIX_VEHICLE, i))
     sendAck(constants.PRINT_PREFIX_VEHICLE, returnCode, outputSocket)
     
 
-def sendVehiclesSpeed(vehiclesId, outputSocket, mtraci, mVehicles):
+def subscribeVehicles(mtraci, vehiclesId):
+    """
+    Subscribes every vehicle of the vehicles ID list to its position, speed and lane
+    """
+    mtraci.acquire()
+    try:
+        for vehicleId in vehiclesId:
+            traci.vehicle.subscribe(vehicleId, VEHICLE_SUBSCRIPTION_VARIABLES)
+    finally:
+        mtraci.release()
+
+
+def getVehiclesSubscriptionResults(mtraci):
+    """
+    Returns the vehicles subscription results of the last simulation step, as {Key=vehicleId, Value={Key=variable, Value=value}}
+    """
+    mtraci.acquire()
+    try:
+        results = traci.vehicle.getSubscriptionResults()
+    finally:
+        mtraci.release()
+    if results is None:
+        return dict()
+    return results
+
+
+def sendVehiclesSpeed(vehiclesId, outputSocket, mtraci):
     """
-    Sends the speed of the given vehicles to the distant client
+    Sends the speed of the given vehicles (e.g. a snapshot of the vehicles registry) to the distant client.
+    The speeds are read from the vehicles subscription results, TraCI is only called for the vehicles not subscribed
     """
     speedMsg = []
     speedMsg.append(constants.VEHICLE_SPEED_RESPONSE_HEADER)
+    results = getVehiclesSubscriptionResults(mtraci)
+    speeds = []
+    traciVehicles = []
     
-    mVehicles.acquire()
     for vehicleId in vehiclesId:
+        variables = results.get(vehicleId)
+        if variables is not None and tc.VAR_SPEED in variables:
+            speeds.append((vehicleId, variables[tc.VAR_SPEED]))
+        else:
+            traciVehicles.append(vehicleId)
+    
+    # The TraCI lock is taken once for every vehicle needing a TraCI call
+    if traciVehicles:
+        mtraci.acquire()
         try:
-            mtraci.acquire()
-            speed = traci.vehicle.getSpeed(vehicleId)
-            mtraci.release()
-        
-            speedMsg.append(constants.SEPARATOR)
-            speedMsg.append(vehicleId)
-            speedMsg.append(constants.SEPARATOR)
-            speedMsg.append(str(speed))
-        except:
+            for vehicleId in traciVehicles:
+                try:
+                    speeds.append((vehicleId, traci.vehicle.getSpeed(vehicleId)))
+                except traci.TraCIException:
+                    continue
+        finally:
             mtraci.release()
-    mVehicles.release()
+    
+    for vehicleId, speed in speeds:
+        speedMsg.append(constants.SEPARATOR)
+        speedMsg.append(vehicleId)
+        speedMsg.append(constants.SEPARATOR)
+        speedMsg.append(str(speed))
         
     speedMsg.append(constants.END_OF_MESSAGE)
         
@@ -315,33 +403,71 @@ def getRegularVehicles(vehicles):
     return regularVehicles
     
 
-def sendVehiclesCoordinates(vehiclesId, mtraci, outputSocket, mVehicles):
+def getVehiclesGeographicCoordinates(vehiclesId, mtraci, projection):
     """
-    Gets every vehicles position from SUMO and send then these ones to the remote client by an output socket
+    Returns the (vehicleId, (lon, lat)) pairs of the given vehicles.
+    The positions are read from the vehicles subscription results, and converted at once by the network projection if this one is not None.
+    TraCI is only called for the vehicles not subscribed, and for the conversion if there is no projection
     """
-    # If the simulated vehicles number we have to take into account is not 0
-    vehiclesPos = []
-    vehiclesPos.append(constants.VEHICLE_COORDS_RESPONSE_HEADER)
+    results = getVehiclesSubscriptionResults(mtraci)
+    positionedVehicles = []
+    xs = []
+    ys = []
+    traciVehicles = []
     
-    mVehicles.acquire()
     for vehicleId in vehiclesId:
-        try:
-            mtraci.acquire()
-            coords = traci.vehicle.getPosition(vehicleId)
-            coordsGeo = traci.simulation.convertGeo(coords[0], coords[1], False)
-            mtraci.release()
+        variables = results.get(vehicleId)
+        if variables is not None and tc.VAR_POSITION in variables and projection is not None:
+            coords = variables[tc.VAR_POSITION]
+            positionedVehicles.append(vehicleId)
+            xs.append(coords[0])
+            ys.append(coords[1])
+        else:
+            traciVehicles.append((vehicleId, variables))
     
-            # Build the message to send by the output socket
-            vehiclesPos.append(constants.SEPARATOR)
-            vehiclesPos.append(vehicleId)
-            vehiclesPos.append(constants.SEPARATOR)
-            vehiclesPos.append(str(coordsGeo[0]))
-            vehiclesPos.append(constants.SEPARATOR)
-            vehiclesPos.append(str(coordsGeo[1]))
-        except:
+    # The TraCI lock is taken once for every vehicle needing a TraCI call
+    if traciVehicles:
+        mtraci.acquire()
+        try:
+            for vehicleId, variables in traciVehicles:
+                try:
+                    if variables is not None and tc.VAR_POSITION in variables:
+                        coords = variables[tc.VAR_POSITION]
+                    else:
+                        coords = traci.vehicle.getPosition(vehicleId)
+                    if projection is None:
+                        coords = traci.simulation.convertGeo(coords[0], coords[1], False)
+                except traci.TraCIException:
+                    continue
+                
+                positionedVehicles.append(vehicleId)
+                xs.append(coords[0])
+                ys.append(coords[1])
+        finally:
             mtraci.release()
         
-    mVehicles.release()
+    if projection is not None:
+        xs, ys = projection.convertGeoArrays(xs, ys)
+    return zip(positionedVehicles, zip(xs, ys))
+    
+
+def sendVehiclesCoordinates(vehiclesId, mtraci, outputSocket, projection):
+    """
+    Gets the given vehicles (e.g. a snapshot of the vehicles registry) position from the last simulation step
+    and send then these ones to the remote client by an output socket
+    """
+    # If the simulated vehicles number we have to take into account is not 0
+    vehiclesPos = []
+    vehiclesPos.append(constants.VEHICLE_COORDS_RESPONSE_HEADER)
+    
+    for vehicleId, coordsGeo in getVehiclesGeographicCoordinates(vehiclesId, mtraci, projection):
+        # Build the message to send by the output socket
+        vehiclesPos.append(constants.SEPARATOR)
+        vehiclesPos.append(vehicleId)
+        vehiclesPos.append(constants.SEPARATOR)
+        vehiclesPos.append(str(coordsGeo[0]))
+        vehiclesPos.append(constants.SEPARATOR)
+        vehiclesPos.append(str(coordsGeo[1]))
     
     # Send the position of each vehicle by the output socket
     vehiclesPos.append(constants.END_OF_MESSAGE)
@@ -373,12 +499,13 @@ def sendArrivedVehicles(arrivedVehicles, mtraci, outputSocket):
     Logger.infoFile("{} Message sent: {}".format(constants.PRINT_PREFIX_SIMULATOR, strmsg))
     
 
-def run(mtraci, inputSocket, outputSocket, eShutdown, priorityVehicles, mPriorityVehicles, eVehicleReady, eManagerReady, vehicles, mVehicles):
+def run(mtraci, inputSocket, outputSocket, eShutdown, eVehicleReady, eManagerReady, vehicleRegistry, lanesLinksDict, randomRoutes, projection):
     """
     See file description
     """
     bufferSize = 32768
     cRouteId = 0
+    pending = ''
     
     eVehicleReady.set()
     while not eManagerReady.is_set():
@@ -395,7 +522,14 @@ def run(mtraci, inputSocket, outputSocket, eShutdown, priorityVehicles, mPriorit
             if len(buff) == 0:
                     raise constants.ClosedSocketException("The distant socket has been closed")
                 
-            listCommands = buff.decode().split(constants.MESSAGES_SEPARATOR)
+            listCommands = (pending + buff.decode()).split(constants.MESSAGES_SEPARATOR)
+            
+            # A batch add request may span several reads: its last read part is kept until its end of message is read
+            pending = listCommands[-1]
+            if pending and (pending.startswith(constants.VEHICLE_ADD_BATCH_REQUEST_HEADER) or constants.VEHICLE_ADD_BATCH_REQUEST_HEADER.startswith(pending)):
+                listCommands.pop()
+            else:
+                pending = ''
             
             for cmd in listCommands:
                 if len(cmd) != 0:
@@ -421,26 +555,37 @@ def run(mtraci, inputSocket, outputSocket, eShutdown, priorityVehicles, mPriorit
                             command.pop(0)
                             priority = command[0]
                             command.pop(0)
-                            addVehicle(vehicleId, priority, command, mtraci, cRouteId, outputSocket, priorityVehicles, mPriorityVehicles, vehicles, mVehicles)
+                            addVehicle(vehicleId, priority, command, mtraci, lanesLinksDict, cRouteId, outputSocket, vehicleRegistry)
                         except Exception as e:
                             sendIdentifiedAck(command[1], constants.VEHICLE_INVALID_ROUTE, outputSocket)
                             raise
                         cRouteId += 1
                         
                         
+                    # Add a batch of vehicles and their routes to the map
+                    elif commandSize > 1 and command[0] == constants.VEHICLE_ADD_BATCH_REQUEST_HEADER:
+                        records = parseVehiclesBatch(command[1:])
+                        if records is None:
+                            Logger.warning("{}Invalid batch add request received".format(constants.PRINT_PREFIX_VEHICLE))
+                            sendAck(constants.PRINT_PREFIX_VEHICLE, constants.INVALID_MESSAGE, outputSocket)
+                        else:
+                            cRouteId += addVehiclesBatch(records, mtraci, lanesLinksDict, cRouteId, outputSocket, vehicleRegistry)
+                        
+                        
                     # Remove the specified vehicles from the simulation
                     elif commandSize >= 1 and command[0] == constants.VEHICLE_DELETE_REQUEST_HEADER:
                         if commandSize == 1:
-                            removeVehicles(list(vehicles), priorityVehicles, mPriorityVehicles, mtraci, outputSocket, vehicles, mVehicles)
+                            removeVehicles(vehicleRegistry.getVehicles(), mtraci, outputSocket, vehicleRegistry)
                         else:
                             command.pop(0)
-                            removeVehicles(command, priorityVehicles, mPriorityVehicles, mtraci, outputSocket, vehicles, mVehicles)
+                            removeVehicles(command, mtraci, outputSocket, vehicleRegistry)
                         
                         
                     # Stress test, add random vehicles to the simulation
-                    elif commandSize == 4 and command[0] == constants.VEHICLE_ADD_RAND_REQUEST_HEADER:
+                    elif (commandSize == 4 or commandSize == 5) and command[0] == constants.VEHICLE_ADD_RAND_REQUEST_HEADER:
                         try:
-                            addRandomVehicles(command[1], int(command[2]), int(command[3]), mtraci, outputSocket, vehicles, mVehicles)
+                            seed = int(command[4]) if commandSize == 5 else constants.VEHICLE_MOCK_DEFAULT_SEED
+                            addRandomVehicles(command[1], int(command[2]), int(command[3]), seed, mtraci, randomRoutes, outputSocket, vehicleRegistry)
                         except:
                             sendAck(constants.PRINT_PREFIX_VEHICLE, constants.VEHICLE_MOCK_FAILED, outputSocket)
                             raise
@@ -449,19 +594,19 @@ def run(mtraci, inputSocket, outputSocket, eShutdown, priorityVehicles, mPriorit
                     # Send vehicles speed to the remote client
                     elif commandSize >= 1 and command[0] == constants.VEHICLE_SPEED_REQUEST_HEADER:
                         if commandSize == 1:
-                            sendVehiclesSpeed(vehicles, outputSocket, mtraci, mVehicles)
+                            sendVehiclesSpeed(vehicleRegistry.getVehicles(), outputSocket, mtraci)
                         else:
                             command.pop(0)
-                            sendVehiclesSpeed(command, outputSocket, mtraci, mVehicles)
+                            sendVehiclesSpeed(command, outputSocket, mtraci)
                         
                         
                     # Send vehicles geographic coordinates to the remote client
                     elif commandSize >= 1 and command[0] == constants.VEHICLE_COORDS_REQUEST_HEADER:
                         if commandSize == 1:
-                            sendVehiclesCoordinates(vehicles, mtraci, outputSocket, mVehicles)
+                            sendVehiclesCoordinates(vehicleRegistry.getVehicles(), mtraci, outputSocket, projection)
                         else:
                             command.pop(0)
-                            sendVehiclesCoordinates(command, mtraci, outputSocket, mVehicles)
+                            sendVehiclesCoordinates(command, mtraci, outputSocket, projection)
                         
                         
                     # Send arrived vehicles ID to the remote client
@@ -470,7 +615,7 @@ def run(mtraci, inputSocket, outputSocket, eShutdown, priorityVehicles, mPriorit
                         arrivedVehicles = traci.simulation.getArrivedIDList()
                         mtraci.release()
                         arrivedVehicles = getRegularVehicles(arrivedVehicles)
-                        sendArrivedVehicles(vehicles, outputSocket, mtraci)
+                        sendArrivedVehicles(arrivedVehicles, mtraci, outputSocket)
                         
                         
                     # Error
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+
+"""
+@file    vehicleRegistry.py
+@author  ASTra team
+@date    16/10/2026
+
+This file contains the registry of the vehicles managed by ASTra, shared by the vehicle thread, which adds and removes vehicles (See vehicle.py),
+the simulation thread, which removes the arrived ones (See simulation.py), and the traffic lights management of the priority vehicles (See trafficLights.py).
+
+Registry:
+    The vehicles are kept in insertion order, with a record holding the priority flag, the route ID (None for the vehicles of the SUMO
+    configuration) and the insertion time of the vehicle. Adding, removing and looking for a vehicle take O(1).
+    The ignored vehicles (See constants) are never registered, hence cannot be priority.
+
+Snapshots:
+    The vehicles and priority vehicles ID are returned as tuples, built on the first call following a change of the registry, then shared
+    until the next change. A snapshot is never modified, so it can be read without any lock.
+
+Lock:
+    Every method changing the registry or building a snapshot takes the registry lock. The lookups (get, in, len) are lock-free by design:
+    each one is a single read of the records dictionary, atomic under the GIL, which returns the state before or after a concurrent change.
+    The registry lock is reentrant, so that a thread can hold it over several calls when these ones
+    must be consistent with the simulation (e.g. a simulation step and the removal of its arrived vehicles).
+    The registry lock must always be taken before the TraCI one.
+"""
+
+import constants
+import time
+from collections import OrderedDict
+from threading import RLock
+
+
+class VehicleRecord(object):
+    """
+    Priority flag, route ID and insertion time of a registered vehicle
+    """
+    __slots__ = ('priority', 'routeId', 'insertionTime')
+
+    def __init__(self, priority, routeId, insertionTime):
+        self.priority = priority
+        self.routeId = routeId
+        self.insertionTime = insertionTime
+
+
+class VehicleRegistry(object):
+    """
+    Vehicles managed by ASTra (See file description)
+    """
+    def __init__(self):
+        self.lock = RLock()
+        self.records = OrderedDict()
+        self.priorityVehicles = OrderedDict()
+        self.vehiclesSnapshot = ()
+        self.prioritySnapshot = ()
+
+    def add(self, vehicleId, priority=False, routeId=None):
+        """
+        Registers a vehicle, unless this one is ignored (See constants). Returns True if the vehicle is registered
+        """
+        if constants.IGNORED_VEHICLES_REGEXP.match(vehicleId):
+            return False
+
+        self.lock.acquire()
+        try:
+            self.records[vehicleId] = VehicleRecord(priority, routeId, time.time())
+            self.vehiclesSnapshot = None
+            if priority:
+                self.priorityVehicles[vehicleId] = None
+                self.prioritySnapshot = None
+            elif vehicleId in self.priorityVehicles:
+                del self.priorityVehicles[vehicleId]
+                self.prioritySnapshot = None
+        finally:
+            self.lock.release()
+        return True
+
+    def remove(self, vehicleId):
+        """
+        Unregisters a vehicle. Returns its record, None if the vehicle is not registered
+        """
+        self.lock.acquire()
+        try:
+            record = self.records.pop(vehicleId, None)
+            if record is not None:
+                self.vehiclesSnapshot = None
+                if record.priority:
+                    del self.priorityVehicles[vehicleId]
+                    self.prioritySnapshot = None
+        finally:
+            self.lock.release()
+        return record
+
+    def get(self, vehicleId):
+        """
+        Returns the record of a vehicle, None if this one is not registered. Lock-free (See file description)
+        """
+        return self.records.get(vehicleId)
+
+    def __contains__(self, vehicleId):
+        return vehicleId in self.records
+
+    def __len__(self):
+        return len(self.records)
+
+    def getVehicles(self):
+        """
+        Returns a snapshot of the registered vehicles ID, in insertion order
+        """
+        self.lock.acquire()
+        try:
+            if self.vehiclesSnapshot is None:
+                self.vehiclesSnapshot = tuple(self.records)
+            return self.vehiclesSnapshot
+        finally:
+            self.lock.release()
+
+    def getPriorityVehicles(self):
+        """
+        Returns a snapshot of the registered priority vehicles ID, in insertion order
+        """
+        self.lock.acquire()
+        try:
+            if self.prioritySnapshot is None:
+                self.prioritySnapshot = tuple(self.priorityVehicles)
+            return self.prioritySnapshot
+        finally:
+            self.lock.release()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+
+"""
+@file    gridNetwork.py
+@author  ASTra team
+@date    16/10/2026
+
+Synthetic network shared by the regression tests: a square grid of junctions linked by two opposite edges.
+
+Network:
+    - The junction "jX_Y" is located at (X * GRID_SPACING, Y * GRID_SPACING)
+    - The edge "jA_jB" goes from the junction A to the junction B, its opposite edge is "-jA_jB" (See sharedFunctions.getOppositeEdge)
+    - The length of an edge is its straight line length multiplied by a seeded random factor in [1, 1.5]
+    - The successors of an edge are the edges leaving its end junction, except its opposite edge,
+      the arc length being the length of the successor (See graph.py (21))
+    - Each edge has a single lane, shifted to the right of the junctions line
+
+Other networks are described by their streets (See getStreetsNetwork), so that each test builds the shapes it is about
+(one-way streets, dead ends, parallel streets...).
+
+The routing engines are checked against a reference Dijkstra over the graph dictionary (See getReferenceDistances).
+The tests writing dictionaries use a temporary dictionaries directory and network file (See DictionariesTestCase).
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from heapq import heappush
+from heapq import heappop
+from random import Random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'astra'))
+
+import constants
+
+GRID_SIZE = 4
+GRID_SPACING = 100.0
+LANE_SHIFT = 1.6
+
+
+def getJunctionId(x, y):
+    return "j{}_{}".format(x, y)
+
+
+def getGridNetwork(size=GRID_SIZE, seed=0):
+    """
+    Returns the graph dictionary, the edges dictionary, the junctions coordinates dictionary
+    and the edges shapes of a size x size grid (See file description)
+    """
+    generator = Random(seed)
+    junctionsCoordsDict = dict()
+    for x in xrange(size):
+        for y in xrange(size):
+            junctionsCoordsDict[getJunctionId(x, y)] = (x * GRID_SPACING, y * GRID_SPACING)
+
+    edgesDict = dict()
+    edgesShapes = dict()
+    lengths = dict()
+    for x in xrange(size):
+        for y in xrange(size):
+            for dx, dy in ((1, 0), (0, 1)):
+                if x + dx < size and y + dy < size:
+                    junctionFrom = getJunctionId(x, y)
+                    junctionTo = getJunctionId(x + dx, y + dy)
+                    edgeId = "{}_{}".format(junctionFrom, junctionTo)
+                    for edge, start, end in ((edgeId, junctionFrom, junctionTo), ('-' + edgeId, junctionTo, junctionFrom)):
+                        edgesDict[edge] = [start, end]
+                        lengths[edge] = GRID_SPACING * generator.uniform(1.0, 1.5)
+                        (x1, y1), (x2, y2) = junctionsCoordsDict[start], junctionsCoordsDict[end]
+                        shiftX = (y2 - y1) / GRID_SPACING * LANE_SHIFT
+                        shiftY = (x1 - x2) / GRID_SPACING * LANE_SHIFT
+                        edgesShapes[edge] = [[(x1 + shiftX, y1 + shiftY), (x2 + shiftX, y2 + shiftY)]]
+
+    leavingEdges = dict()
+    for edgeId, junctions in edgesDict.iteritems():
+        leavingEdges.setdefault(junctions[0], []).append(edgeId)
+
+    graphDict = dict()
+    for edgeId, junctions in edgesDict.iteritems():
+        graphDict[edgeId] = dict((successor, lengths[successor]) for successor in leavingEdges[junctions[1]]
+                                 if edgesDict[successor][1] != junctions[0])
+
+    return graphDict, edgesDict, junctionsCoordsDict, edgesShapes
+
+
+def getStreetsNetwork(streets):
+    """
+    Returns the graph dictionary of a network given as a list of streets (edgeId, junctionFrom, junctionTo, length, twoWay).
+    A two-way street is also driven through its opposite edge "-edgeId". The successors of an edge are the edges
+    leaving its end junction, except its opposite edge (See file description)
+    """
+    edges = []
+    for edgeId, junctionFrom, junctionTo, length, twoWay in streets:
+        edges.append((edgeId, junctionFrom, junctionTo, length))
+        if twoWay:
+            edges.append(('-' + edgeId, junctionTo, junctionFrom, length))
+
+    leavingEdges = dict()
+    for edgeId, junctionFrom, junctionTo, length in edges:
+        leavingEdges.setdefault(junctionFrom, []).append((edgeId, length))
+
+    graphDict = dict()
+    for edgeId, junctionFrom, junctionTo, length in edges:
+        oppositeEdge = edgeId[1:] if edgeId.startswith('-') else '-' + edgeId
+        graphDict[edgeId] = dict((successor, successorLength) for successor, successorLength in leavingEdges.get(junctionTo, [])
+                                 if successor != oppositeEdge)
+    return graphDict
+
+
+def getReferenceDistances(graphDict, start, closed=()):
+    """
+    Returns the shortest path length from the start edge to every reachable edge as {Key=edgeId, Value=length},
+    computed by a textbook Dijkstra over the graph dictionary without entering the closed edges
+    """
+    distances = dict()
+    heap = [(0.0, start)]
+    while heap:
+        distance, edgeId = heappop(heap)
+        if edgeId in distances:
+            continue
+        distances[edgeId] = distance
+        for successor, length in graphDict[edgeId].iteritems():
+            if successor not in distances and successor not in closed:
+                heappush(heap, (distance + length, successor))
+    return distances
+
+
+def getPathLength(graphDict, path):
+    """
+    Returns the length of a path given as a list of edges ID, checking that each edge is a successor of the previous one
+    """
+    length = 0.0
+    for i in xrange(len(path) - 1):
+        length += graphDict[path[i]][path[i + 1]]
+    return length
+
+
+class DictionariesTestCase(unittest.TestCase):
+    """
+    Test case writing its dictionaries in a temporary directory, with a temporary network file.
+    The constants changed by setConstant are restored after each test
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.savedConstants = dict()
+        self.networkFile = self.getPath("grid.net.xml")
+        self.writeNetworkFile("<net/>")
+        self.setConstant('SUMO_NETWORK_FILE', self.networkFile)
+
+    def tearDown(self):
+        for name, value in self.savedConstants.iteritems():
+            setattr(constants, name, value)
+        shutil.rmtree(self.directory)
+
+    def getPath(self, fileName):
+        return os.path.join(self.directory, fileName)
+
+    def setConstant(self, name, value):
+        if name not in self.savedConstants:
+            self.savedConstants[name] = getattr(constants, name)
+        setattr(constants, name, value)
+
+    def writeNetworkFile(self, content):
+        networkFile = open(self.networkFile, 'w')
+        networkFile.write(content)
+        networkFile.close()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+
+"""
+@file    testAStar.py
+@author  ASTra team
+@date    16/10/2026
+
+Regression tests of the A* engine and of its heuristic scale over the synthetic grid (See gridNetwork.py),
+and over a larger grid whose lanes stop at the junctions border like the SUMO ones
+"""
+
+import unittest
+import gridNetwork
+import astar
+import constants
+import dijkstra
+from math import hypot
+from random import Random
+from dijkstra import INFINITY
+from logger import Logger
+from routingGraph import RoutingGraph
+
+""" Size of the larger grid, and radius range of its junctions """
+LARGE_GRID_SIZE = 25
+JUNCTION_RADIUS = (2.0, 12.0)
+QUERIES_NUMBER = 50
+
+
+def getShortenedLanesNetwork(size=LARGE_GRID_SIZE, seed=0):
+    """
+    Returns the graph dictionary, the edges dictionary and the junctions coordinates dictionary of a size x size grid
+    whose edges length is the straight line length minus the radius of both junctions, as in a SUMO network where the lanes
+    stop at the junctions border: the edges are shorter than the straight line between their junctions
+    """
+    graphDict, edgesDict, junctionsCoordsDict = gridNetwork.getGridNetwork(size, seed)[0:3]
+    generator = Random(seed)
+    radius = dict((junctionId, generator.uniform(*JUNCTION_RADIUS)) for junctionId in sorted(junctionsCoordsDict))
+    lengths = dict()
+    for edgeId, (junctionFrom, junctionTo) in edgesDict.iteritems():
+        (x1, y1), (x2, y2) = junctionsCoordsDict[junctionFrom], junctionsCoordsDict[junctionTo]
+        lengths[edgeId] = hypot(x2 - x1, y2 - y1) - radius[junctionFrom] - radius[junctionTo]
+    for successors in graphDict.itervalues():
+        for successor in successors:
+            successors[successor] = lengths[successor]
+    return graphDict, edgesDict, junctionsCoordsDict
+
+
+def getMedianRatio(graph):
+    """
+    Returns the median arc weight per straight line unit of a located routing graph
+    """
+    ratios = []
+    for v in xrange(graph.getVerticesNumber()):
+        for i in xrange(graph.offsets[v], graph.offsets[v + 1]):
+            w = graph.targets[i]
+            ratios.append(graph.weights[i] / hypot(graph.xs[w] - graph.xs[v], graph.ys[w] - graph.ys[v]))
+    return sorted(ratios)[len(ratios) // 2]
+
+
+def getReachedNumber(D):
+    return sum(1 for distance in D if distance != INFINITY)
+
+
+class AStarTest(unittest.TestCase):
+
+    def setUp(self):
+        self.graphDict, self.edgesDict, self.junctionsCoordsDict = gridNetwork.getGridNetwork()[0:3]
+        self.routingGraph = RoutingGraph(self.graphDict)
+        self.routingGraph.setCoordinates(self.edgesDict, self.junctionsCoordsDict)
+
+    def testHeuristicScale(self):
+        # The lengths are the straight line lengths multiplied by at least 1, the scale is the smallest factor
+        graph = self.routingGraph
+        self.assertTrue(1.0 <= graph.heuristicScale <= 1.5)
+        for start in self.graphDict:
+            reference = gridNetwork.getReferenceDistances(self.graphDict, start)
+            v = graph.getIndex(start)
+            for end, distance in reference.iteritems():
+                w = graph.getIndex(end)
+                self.assertTrue(graph.heuristicScale * hypot(graph.xs[w] - graph.xs[v], graph.ys[w] - graph.ys[v]) <= distance + 1e-9)
+
+    def testHeuristicScaleFollowsWeights(self):
+        # Travel time weights (lengths / speed) give a heuristic scale divided by the speed
+        speed = 13.9
+        travelTimesDict = dict((edgeId, dict((successor, length / speed) for successor, length in successors.iteritems()))
+                               for edgeId, successors in self.graphDict.iteritems())
+        graph = RoutingGraph(travelTimesDict)
+        graph.setCoordinates(self.edgesDict, self.junctionsCoordsDict)
+        self.assertAlmostEqual(graph.heuristicScale, self.routingGraph.heuristicScale / speed)
+
+    def testNoHeuristicWithoutCoordinates(self):
+        junctionsCoordsDict = dict(self.junctionsCoordsDict)
+        del junctionsCoordsDict[gridNetwork.getJunctionId(0, 0)]
+        graph = RoutingGraph(self.graphDict)
+        graph.setCoordinates(self.edgesDict, junctionsCoordsDict)
+        self.assertEqual(graph.heuristicScale, 0.0)
+
+    def testShortestPathLengths(self):
+        graph = self.routingGraph
+        for start in self.graphDict:
+            reference = gridNetwork.getReferenceDistances(self.graphDict, start)
+            for end in self.graphDict:
+                path = [graph.getEdgeId(v) for v in astar.shortestPath(graph, graph.getIndex(start), graph.getIndex(end))]
+                self.assertEqual(path[0], start)
+                self.assertEqual(path[-1], end)
+                self.assertAlmostEqual(gridNetwork.getPathLength(self.graphDict, path), reference[end])
+
+
+
+class ShortenedLanesAStarTest(unittest.TestCase):
+
+    def setUp(self):
+        self.graphDict, self.edgesDict, self.junctionsCoordsDict = getShortenedLanesNetwork()
+        self.routingGraph = RoutingGraph(self.graphDict)
+        self.routingGraph.setCoordinates(self.edgesDict, self.junctionsCoordsDict)
+        self.warnings = []
+        self.warning = Logger.warning
+        Logger.warning = staticmethod(self.warnings.append)
+
+    def tearDown(self):
+        Logger.warning = self.warning
+
+    def testHeuristicScale(self):
+        # The lanes are shorter than the straight line between their junctions, but the scale does not collapse
+        graph = self.routingGraph
+        self.assertTrue(graph.heuristicScale < 1.0)
+        self.assertTrue(graph.heuristicScale >= constants.ASTAR_HEURISTIC_SCALE_WARNING_RATIO * getMedianRatio(graph))
+        self.assertEqual(self.warnings, [])
+
+    def testFewerReachedVertices(self):
+        # A* reaches fewer vertices than Dijkstra, and finds paths of the same length
+        graph = self.routingGraph
+        generator = Random(0)
+        edgeIds = sorted(self.graphDict)
+        astarReached = 0
+        dijkstraReached = 0
+        for i in xrange(QUERIES_NUMBER):
+            start = graph.getIndex(generator.choice(edgeIds))
+            end = graph.getIndex(generator.choice(edgeIds))
+            astarD = astar.AStar(graph, start, end)[0]
+            dijkstraD = dijkstra.Dijkstra(graph, start, end)[0]
+            self.assertAlmostEqual(astarD[end], dijkstraD[end])
+            astarReached += getReachedNumber(astarD)
+            dijkstraReached += getReachedNumber(dijkstraD)
+        self.assertTrue(astarReached < 0.5 * dijkstraReached)
+
+    def testCollapsedHeuristicScale(self):
+        # A short edge between two large junctions lowers the scale of the whole graph, which is reported
+        junctionFrom = gridNetwork.getJunctionId(0, 0)
+        self.junctionsCoordsDict["jShort"] = (-20.0, 0.0)
+        self.edgesDict["short"] = [junctionFrom, "jShort"]
+        self.graphDict["short"] = dict()
+        for edgeId, junctions in self.edgesDict.iteritems():
+            if junctions[1] == junctionFrom:
+                self.graphDict[edgeId]["short"] = 1.0
+        graph = RoutingGraph(self.graphDict)
+        graph.setCoordinates(self.edgesDict, self.junctionsCoordsDict)
+        self.assertAlmostEqual(graph.heuristicScale, 1.0 / 20.0)
+        self.assertEqual(len(self.warnings), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+
+"""
+@file    testBidirectionalDijkstra.py
+@author  ASTra team
+@date    16/10/2026
+
+Regression tests of the bidirectional Dijkstra engine over the synthetic grid (See gridNetwork.py)
+"""
+
+import unittest
+import gridNetwork
+import bidirectionalDijkstra
+from routingGraph import RoutingGraph
+
+
+class BidirectionalDijkstraTest(unittest.TestCase):
+
+    def setUp(self):
+        self.graphDict = gridNetwork.getGridNetwork()[0]
+
+    def checkShortestPaths(self, graph):
+        for start in self.graphDict:
+            reference = gridNetwork.getReferenceDistances(self.graphDict, start)
+            for end in self.graphDict:
+                path = [graph.getEdgeId(v) for v in bidirectionalDijkstra.shortestPath(graph, graph.getIndex(start), graph.getIndex(end))]
+                self.assertEqual(path[0], start)
+                self.assertEqual(path[-1], end)
+                self.assertAlmostEqual(gridNetwork.getPathLength(self.graphDict, path), reference[end])
+
+    def testShortestPathLengths(self):
+        # The reverse graph is the transposed graph
+        self.checkShortestPaths(RoutingGraph(self.graphDict))
+
+    def testShortestPathLengthsWithReverseGraph(self):
+        # The reverse graph is compiled from a reverse graph dictionary (See graph.py (23))
+        reverseGraphDict = dict((edgeId, dict()) for edgeId in self.graphDict)
+        for edgeId, successors in self.graphDict.iteritems():
+            for successor, length in successors.iteritems():
+                reverseGraphDict[successor][edgeId] = length
+        self.checkShortestPaths(RoutingGraph(self.graphDict, reverseGraphDict))
+
+    def testNoPath(self):
+        graph = RoutingGraph({'a': {'b': 1.0}, 'b': dict(), 'c': {'a': 2.0}})
+        self.assertRaises(ValueError, bidirectionalDijkstra.shortestPath, graph, graph.getIndex('a'), graph.getIndex('c'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+
+"""
+@file    testBinaryDictionary.py
+@author  ASTra team
+@date    16/10/2026
+
+Regression tests of the binary dictionaries format (See binaryDictionary.py), written from the synthetic grid (See gridNetwork.py)
+"""
+
+import unittest
+import gridNetwork
+import constants
+from array import array
+from binaryDictionary import exportDictionary
+from binaryDictionary import importDictionary
+from binaryDictionary import MappedDictionary
+from binaryDictionary import MappedEdges
+from binaryDictionary import MappedGraph
+from idRegistry import buildIdRegistry
+from idRegistry import IdRegistry
+from routingGraph import RoutingGraph
+
+
+class BinaryDictionaryTest(gridNetwork.DictionariesTestCase):
+
+    def setUp(self):
+        gridNetwork.DictionariesTestCase.setUp(self)
+        self.graphDict, self.edgesDict, self.junctionsCoordsDict = gridNetwork.getGridNetwork()[0:3]
+        edgeIds, junctionIds, self.edgeIndexes, self.junctionIndexes, oppositeEdges = buildIdRegistry(self.edgesDict, self.junctionsCoordsDict)
+
+        # ID registry and graph, written as graph.py (27) and (21) do
+        exportDictionary(self.getPath("ids"), edgeIds + junctionIds, [array('i', [len(edgeIds)]), oppositeEdges])
+        strings, arrays = importDictionary(self.getPath("ids"))
+        edgesNumber = arrays[0][0]
+        self.registry = IdRegistry(strings.getSlice(0, edgesNumber), strings.getSlice(edgesNumber, len(strings)), arrays[1])
+
+        offsets = array('i', [0])
+        targets = array('i')
+        weights = array('d')
+        for edgeId in edgeIds:
+            for successor, length in sorted(self.graphDict[edgeId].iteritems()):
+                targets.append(self.edgeIndexes[successor])
+                weights.append(length)
+            offsets.append(len(targets))
+        exportDictionary(self.getPath("graph"), [], [offsets, targets, weights])
+        self.mappedGraph = MappedGraph(self.registry, *importDictionary(self.getPath("graph"))[1])
+
+    def testRegistry(self):
+        self.assertEqual(list(self.registry.edgeIds), sorted(self.edgesDict))
+        self.assertEqual(list(self.registry.junctionIds), sorted(self.junctionsCoordsDict))
+        for edgeId, index in self.edgeIndexes.iteritems():
+            self.assertEqual(self.registry.getEdgeIndex(edgeId), index)
+            opposite = edgeId[1:] if edgeId.startswith('-') else '-' + edgeId
+            self.assertEqual(self.registry.getEdgeId(self.registry.getOppositeEdgeIndex(index)), opposite)
+        self.assertRaises(KeyError, self.registry.getEdgeIndex, "unknown")
+
+    def testGraph(self):
+        # The weights are stored as float64, hence decoded without any rounding
+        self.assertEqual(self.mappedGraph.weights.typecode, 'd')
+        self.assertEqual(dict(self.mappedGraph.iteritems()), self.graphDict)
+        self.assertTrue("unknown" not in self.mappedGraph)
+        self.assertRaises(KeyError, self.mappedGraph.__getitem__, "unknown")
+
+    def testRoutingGraph(self):
+        # The routing graph uses the stored arrays of the binary graph
+        routingGraph = RoutingGraph(self.mappedGraph)
+        self.assertTrue(routingGraph.weights is self.mappedGraph.weights)
+        self.assertEqual(routingGraph.getVerticesNumber(), len(self.edgesDict))
+
+    def testEdges(self):
+        junctionsFrom = array('i', [self.junctionIndexes[self.edgesDict[edgeId][0]] for edgeId in self.registry.edgeIds])
+        junctionsTo = array('i', [self.junctionIndexes[self.edgesDict[edgeId][1]] for edgeId in self.registry.edgeIds])
+        exportDictionary(self.getPath("edges"), [], [junctionsFrom, junctionsTo])
+        self.assertEqual(dict(MappedEdges(self.registry, *importDictionary(self.getPath("edges"))[1]).iteritems()), self.edgesDict)
+
+    def testOtherByteOrder(self):
+        # A dictionary written on a machine of the other byte order is swapped when read
+        dictionaryFile = open(self.getPath("graph"), 'rb')
+        header = dictionaryFile.readline()
+        data = dictionaryFile.read()
+        dictionaryFile.close()
+        fields = header[0:-1].split(constants.SEPARATOR)
+        fields[2] = 'big' if fields[2] == 'little' else 'little'
+        position = 4 * (int(fields[3]) + 1) + int(fields[4])
+        swapped = [data[0:position]]
+        for field in fields[5:]:
+            typecode, length = field.split(':')
+            values = array(typecode)
+            values.fromstring(data[position:position + int(length) * values.itemsize])
+            values.byteswap()
+            swapped.append(values.tostring())
+            position += int(length) * values.itemsize
+
+        dictionaryFile = open(self.getPath("swapped"), 'wb')
+        dictionaryFile.write(constants.SEPARATOR.join(fields) + constants.END_OF_LINE + ''.join(swapped))
+        dictionaryFile.close()
+        self.assertEqual(importDictionary(self.getPath("swapped"))[1], importDictionary(self.getPath("graph"))[1])
+
+    def testOtherVersion(self):
+        self.setConstant('DICTIONARY_FORMAT_VERSION', constants.DICTIONARY_FORMAT_VERSION + 1)
+        self.assertRaises(ValueError, importDictionary, self.getPath("graph"))
+
+    def testAbstractDictionary(self):
+        self.assertRaises(TypeError, MappedDictionary, self.registry.edgeIds, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+
+"""
+@file    testContractionHierarchy.py
+@author  ASTra team
+@date    16/10/2026
+
+Regression tests of the contraction hierarchy engine (See contractionHierarchy.py) over a town network:
+a grid of alternating one-way streets with a one-way avenue, a dead end street, a one-way bypass parallel to a street
+and a street out of reach of the others (See getTownNetwork)
+"""
+
+import unittest
+import gridNetwork
+import constants
+import contractionHierarchy
+from random import Random
+from contractionHierarchy import ContractionHierarchy
+from routingGraph import RoutingGraph
+from sharedFunctions import isDictionaryOutOfDate
+
+TOWN_SIZE = 5
+
+
+def getTownNetwork(size=TOWN_SIZE, seed=0):
+    """
+    Returns the graph dictionary of the town network (See file description)
+    """
+    generator = Random(seed)
+    streets = []
+    for y in xrange(size):
+        for x in xrange(size - 1):
+            # The first street of the town is a two-way street, the other ones go alternately east and west
+            junctionFrom, junctionTo = gridNetwork.getJunctionId(x, y), gridNetwork.getJunctionId(x + 1, y)
+            if y % 2 == 0 and y != 0:
+                junctionFrom, junctionTo = junctionTo, junctionFrom
+            streets.append(("h{}_{}".format(x, y), junctionFrom, junctionTo, 100.0 * generator.uniform(1.0, 1.5), y == 0))
+    for x in xrange(size):
+        for y in xrange(size - 1):
+            # The last avenue goes north only
+            streets.append(("v{}_{}".format(x, y), gridNetwork.getJunctionId(x, y), gridNetwork.getJunctionId(x, y + 1),
+                            100.0 * generator.uniform(1.0, 1.5), x != size - 1))
+
+    streets.append(("deadEnd", gridNetwork.getJunctionId(size // 2, size // 2), "jDeadEnd", 60.0, True))
+    streets.append(("bypass", gridNetwork.getJunctionId(0, 0), gridNetwork.getJunctionId(0, 1), 180.0, False))
+    streets.append(("isolated", "jIsolatedA", "jIsolatedB", 80.0, True))
+    return gridNetwork.getStreetsNetwork(streets)
+
+
+class ContractionHierarchyTest(gridNetwork.DictionariesTestCase):
+
+    def setUp(self):
+        gridNetwork.DictionariesTestCase.setUp(self)
+        self.setConstant('SUMO_CONTRACTION_HIERARCHY_FILE', self.getPath("townContractionHierarchyDictionary"))
+        self.graphDict = getTownNetwork()
+        self.routingGraph = RoutingGraph(self.graphDict)
+        self.ranks, self.arcs = contractionHierarchy.buildContractionHierarchy(self.routingGraph)
+
+    def checkShortestPaths(self, hierarchy):
+        graph = self.routingGraph
+        graph.hierarchy = hierarchy
+        for start in self.graphDict:
+            reference = gridNetwork.getReferenceDistances(self.graphDict, start)
+            for end in self.graphDict:
+                if end not in reference:
+                    self.assertRaises(ValueError, contractionHierarchy.shortestPath, graph, graph.getIndex(start), graph.getIndex(end))
+                    continue
+                path = [graph.getEdgeId(v) for v in contractionHierarchy.shortestPath(graph, graph.getIndex(start), graph.getIndex(end))]
+                self.assertEqual(path[0], start)
+                self.assertEqual(path[-1], end)
+                self.assertAlmostEqual(gridNetwork.getPathLength(self.graphDict, path), reference[end])
+
+    def testRanks(self):
+        self.assertEqual(sorted(self.ranks), range(self.routingGraph.getVerticesNumber()))
+
+    def testShortcuts(self):
+        # A shortcut bypasses a lower ranked vertex, its weight being the sum of the two arcs it replaces
+        shortcutsNumber = 0
+        for u in xrange(self.routingGraph.getVerticesNumber()):
+            for v, (weight, middle) in self.arcs[u].iteritems():
+                if middle != -1:
+                    shortcutsNumber += 1
+                    self.assertTrue(self.ranks[middle] < min(self.ranks[u], self.ranks[v]))
+                    self.assertAlmostEqual(weight, self.arcs[u][middle][0] + self.arcs[middle][v][0])
+        self.assertTrue(shortcutsNumber > 0)
+
+        # Every original arc is kept, unless a shorter shortcut replaces it
+        graph = self.routingGraph
+        for u in xrange(graph.getVerticesNumber()):
+            for i in xrange(graph.offsets[u], graph.offsets[u + 1]):
+                self.assertTrue(self.arcs[u][graph.targets[i]][0] <= graph.weights[i])
+
+    def testWitness(self):
+        # Contracting v: u->v->w needs a shortcut, unless u->x->w is not longer
+        u, v, w, x = 0, 1, 2, 3
+        for uxwLength, shortcuts in ((2.0, []), (2.5, [(u, w, 2.0)])):
+            outArcs = [{v: (1.0, -1), x: (1.0, -1)}, {w: (1.0, -1)}, dict(), {w: (uxwLength - 1.0, -1)}]
+            inArcs = [dict(), {u: (1.0, -1)}, {v: (1.0, -1), x: (uxwLength - 1.0, -1)}, {u: (1.0, -1)}]
+            self.assertEqual(contractionHierarchy.getShortcuts(outArcs, inArcs, v), shortcuts)
+
+    def testShortestPathLengths(self):
+        self.checkShortestPaths(ContractionHierarchy(self.ranks, self.arcs))
+
+    def testExportImport(self):
+        contractionHierarchy.exportContractionHierarchy(self.ranks, self.arcs)
+        self.assertFalse(isDictionaryOutOfDate(constants.SUMO_CONTRACTION_HIERARCHY_FILE, self.networkFile, (constants.CH_WITNESS_SETTLED_LIMIT,)))
+        self.assertTrue(isDictionaryOutOfDate(constants.SUMO_CONTRACTION_HIERARCHY_FILE, self.networkFile, (constants.CH_WITNESS_SETTLED_LIMIT + 1,)))
+        ranks, arcs = contractionHierarchy.importContractionHierarchy()
+        self.assertEqual(list(ranks), list(self.ranks))
+        self.assertEqual(arcs, self.arcs)
+        self.checkShortestPaths(ContractionHierarchy(ranks, arcs))
+
+    def testNoPath(self):
+        graph = RoutingGraph({'a': {'b': 1.0}, 'b': dict(), 'c': {'a': 2.0}})
+        graph.hierarchy = ContractionHierarchy(*contractionHierarchy.buildContractionHierarchy(graph))
+        self.assertRaises(ValueError, contractionHierarchy.shortestPath, graph, graph.getIndex('a'), graph.getIndex('c'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+
+"""
+@file    testDictionaryManifest.py
+@author  ASTra team
+@date    16/10/2026
+
+Regression tests of the dictionaries manifests and atomic writes (See sharedFunctions.py)
+"""
+
+import os
+import unittest
+import gridNetwork
+import constants
+from array import array
+from binaryDictionary import exportDictionary
+from sharedFunctions import getTemporaryDictionaryFile
+from sharedFunctions import isDictionaryOutOfDate
+
+SETTINGS = (16,)
+
+
+class DictionaryManifestTest(gridNetwork.DictionariesTestCase):
+
+    def setUp(self):
+        gridNetwork.DictionariesTestCase.setUp(self)
+        self.dictionaryFile = self.getPath("dictionary")
+        exportDictionary(self.dictionaryFile, ["a", "b"], [array('d', [1.5, 2.5])], SETTINGS)
+
+    def testUpToDate(self):
+        self.assertFalse(isDictionaryOutOfDate(self.dictionaryFile, self.networkFile, SETTINGS))
+        self.assertFalse(os.path.exists(getTemporaryDictionaryFile(self.dictionaryFile)))
+
+    def testMissing(self):
+        self.assertTrue(isDictionaryOutOfDate(self.getPath("missing"), self.networkFile, SETTINGS))
+        os.remove(self.dictionaryFile + constants.DICTIONARY_MANIFEST_EXTENSION)
+        self.assertTrue(isDictionaryOutOfDate(self.dictionaryFile, self.networkFile, SETTINGS))
+
+    def testNetworkContentChanged(self):
+        self.writeNetworkFile("<net version=\"1\"/>")
+        self.assertTrue(isDictionaryOutOfDate(self.dictionaryFile, self.networkFile, SETTINGS))
+
+    def testSettingsChanged(self):
+        self.assertTrue(isDictionaryOutOfDate(self.dictionaryFile, self.networkFile, (8,)))
+
+    def testFormatVersionChanged(self):
+        self.setConstant('DICTIONARY_FORMAT_VERSION', constants.DICTIONARY_FORMAT_VERSION + 1)
+        self.assertTrue(isDictionaryOutOfDate(self.dictionaryFile, self.networkFile, SETTINGS))
+
+    def testDamaged(self):
+        dictionaryFile = open(self.dictionaryFile, 'ab')
+        dictionaryFile.write('\0')
+        dictionaryFile.close()
+        self.assertTrue(isDictionaryOutOfDate(self.dictionaryFile, self.networkFile, SETTINGS))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+
+"""
+@file    testDijkstra.py
+@author  ASTra team
+@date    16/10/2026
+
+Regression tests of the Dijkstra engine over the synthetic grid (See gridNetwork.py)
+"""
+
+import unittest
+import gridNetwork
+import dijkstra
+from routingGraph import RoutingGraph
+
+
+class DijkstraTest(unittest.TestCase):
+
+    def setUp(self):
+        self.graphDict = gridNetwork.getGridNetwork()[0]
+        self.routingGraph = RoutingGraph(self.graphDict)
+
+    def testShortestPathLengths(self):
+        graph = self.routingGraph
+        for start in self.graphDict:
+            reference = gridNetwork.getReferenceDistances(self.graphDict, start)
+            D = dijkstra.Dijkstra(graph, graph.getIndex(start))[0]
+            for end in self.graphDict:
+                self.assertAlmostEqual(D[graph.getIndex(end)], reference[end])
+                path = [graph.getEdgeId(v) for v in dijkstra.shortestPath(graph, graph.getIndex(start), graph.getIndex(end))]
+                self.assertEqual(path[0], start)
+                self.assertEqual(path[-1], end)
+                self.assertAlmostEqual(gridNetwork.getPathLength(self.graphDict, path), reference[end])
+
+    def testNoPath(self):
+        graph = RoutingGraph({'a': {'b': 1.0}, 'b': dict(), 'c': {'a': 2.0}})
+        self.assertRaises(ValueError, dijkstra.shortestPath, graph, graph.getIndex('a'), graph.getIndex('c'))
+
+
+if __name__ == '__main__':
+    unittest.main()
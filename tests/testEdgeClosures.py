@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+
+"""
+@file    testEdgeClosures.py
+@author  ASTra team
+@date    16/10/2026
+
+Regression tests of the edges closures overlay (See edgeClosures.py), and of the routing engines avoiding the closed edges
+of the synthetic grid (See gridNetwork.py)
+"""
+
+import unittest
+import gridNetwork
+import astar
+import bidirectionalDijkstra
+import contractionHierarchy
+import dijkstra
+import landmarks
+from contractionHierarchy import ContractionHierarchy
+from edgeClosures import EdgeClosures
+from landmarks import Landmarks
+from routingGraph import RoutingGraph
+
+
+class EdgeClosuresTest(unittest.TestCase):
+
+    def testLanes(self):
+        edgeClosures = EdgeClosures(2)
+        self.assertEqual(edgeClosures.getClosed(), None)
+
+        # An edge is closed once its lanes are all blocked, whatever the number of requests
+        edgeClosures.blockLane(1, 0, "BLO1", 2)
+        self.assertFalse(edgeClosures.isClosed(1))
+        edgeClosures.blockLane(1, 1, "BLO2", 2)
+        self.assertTrue(edgeClosures.isClosed(1))
+        self.assertEqual(edgeClosures.getBlockedLanes(1), [0, 1])
+        self.assertEqual(edgeClosures.getClosed(), bytearray([0, 1]))
+
+        # Unblocking a single lane opens the edge
+        self.assertEqual(edgeClosures.unblockLane(1, 1), "BLO2")
+        self.assertFalse(edgeClosures.isClosed(1))
+        self.assertEqual(edgeClosures.getClosed(), None)
+        self.assertEqual(edgeClosures.getBlockedLanes(1), [0])
+        self.assertEqual(edgeClosures.unblockLane(1, 1), None)
+        self.assertEqual(edgeClosures.unblockLane(1, 0), "BLO1")
+        self.assertEqual(edgeClosures.getBlockedLanes(1), [])
+
+    def testCloseOpen(self):
+        edgeClosures = EdgeClosures(3)
+        edgeClosures.close(2)
+        edgeClosures.close(2)
+        self.assertEqual(edgeClosures.closedNumber, 1)
+        edgeClosures.open(2)
+        edgeClosures.open(2)
+        self.assertEqual(edgeClosures.closedNumber, 0)
+        self.assertEqual(edgeClosures.getClosed(), None)
+
+    def testEnginesAvoidClosedEdges(self):
+        graphDict, edgesDict, junctionsCoordsDict = gridNetwork.getGridNetwork()[0:3]
+        graph = RoutingGraph(graphDict)
+        graph.setCoordinates(edgesDict, junctionsCoordsDict)
+        graph.landmarks = Landmarks(*landmarks.buildLandmarks(graph, 4))
+        graph.hierarchy = ContractionHierarchy(*contractionHierarchy.buildContractionHierarchy(graph))
+
+        # Closing both directions of the vertical edges leaving the first row
+        closedEdges = set()
+        edgeClosures = EdgeClosures(graph.getVerticesNumber())
+        for x in xrange(gridNetwork.GRID_SIZE - 1):
+            edgeId = "{}_{}".format(gridNetwork.getJunctionId(x, 0), gridNetwork.getJunctionId(x, 1))
+            for edge in (edgeId, '-' + edgeId):
+                closedEdges.add(edge)
+                edgeClosures.close(graph.getIndex(edge))
+        closed = edgeClosures.getClosed()
+
+        engines = (dijkstra.shortestPath, astar.shortestPath, bidirectionalDijkstra.shortestPath, landmarks.shortestPath, contractionHierarchy.shortestPath)
+        for start in graphDict:
+            if start in closedEdges:
+                continue
+            reference = gridNetwork.getReferenceDistances(graphDict, start, closedEdges)
+            for end in graphDict:
+                for shortestPath in engines:
+                    if end not in reference:
+                        self.assertRaises(ValueError, shortestPath, graph, graph.getIndex(start), graph.getIndex(end), closed)
+                        continue
+                    path = [graph.getEdgeId(v) for v in shortestPath(graph, graph.getIndex(start), graph.getIndex(end), closed)]
+                    self.assertFalse(closedEdges.intersection(path))
+                    self.assertAlmostEqual(gridNetwork.getPathLength(graphDict, path), reference[end])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+
+"""
+@file    testLandmarks.py
+@author  ASTra team
+@date    16/10/2026
+
+Regression tests of the landmarks distance oracle and of the ALT engine (See landmarks.py) over a suburbs network:
+a small grid town center, with arms of different lengths leading to one-way loops, a dead end street
+and a street out of reach of the others (See getSuburbsNetwork)
+"""
+
+import unittest
+import gridNetwork
+import constants
+import landmarks
+from dijkstra import INFINITY
+from landmarks import Landmarks
+from routingGraph import RoutingGraph
+from sharedFunctions import isDictionaryOutOfDate
+
+CENTER_SIZE = 3
+""" Length of each arm, the one-way loop at the end of an arm being made of LOOP_STREETS_NUMBER streets """
+ARMS_LENGTH = (800.0, 600.0, 400.0)
+LOOP_STREETS_NUMBER = 3
+LANDMARKS_NUMBER = 4
+
+
+def getArm(edgeId):
+    """
+    Returns the arm of an edge ("arm0", "arm1"...) if this one is on an arm or on its loop, None otherwise
+    """
+    if edgeId.lstrip('-').startswith("arm"):
+        return edgeId.lstrip('-')[0:4]
+    return None
+
+
+def getSuburbsNetwork():
+    """
+    Returns the graph dictionary of the suburbs network (See file description)
+    """
+    streets = []
+    for x in xrange(CENTER_SIZE):
+        for y in xrange(CENTER_SIZE):
+            if x + 1 < CENTER_SIZE:
+                streets.append(("h{}_{}".format(x, y), gridNetwork.getJunctionId(x, y), gridNetwork.getJunctionId(x + 1, y), 100.0, True))
+            if y + 1 < CENTER_SIZE:
+                streets.append(("v{}_{}".format(x, y), gridNetwork.getJunctionId(x, y), gridNetwork.getJunctionId(x, y + 1), 100.0, True))
+
+    # The arms leave the corners of the center, the loops turning the vehicles back to the center
+    corners = ((0, 0), (CENTER_SIZE - 1, 0), (0, CENTER_SIZE - 1))
+    for arm, length in enumerate(ARMS_LENGTH):
+        loopJunctions = ["jLoop{}_{}".format(arm, k) for k in xrange(LOOP_STREETS_NUMBER)]
+        streets.append(("arm{}".format(arm), gridNetwork.getJunctionId(*corners[arm]), loopJunctions[0], length, True))
+        for k in xrange(LOOP_STREETS_NUMBER):
+            streets.append(("arm{}loop{}".format(arm, k), loopJunctions[k], loopJunctions[(k + 1) % LOOP_STREETS_NUMBER], 50.0, False))
+
+    streets.append(("deadEnd", gridNetwork.getJunctionId(CENTER_SIZE - 1, CENTER_SIZE - 1), "jDeadEnd", 60.0, True))
+    streets.append(("isolated", "jIsolatedA", "jIsolatedB", 80.0, True))
+    return gridNetwork.getStreetsNetwork(streets)
+
+
+class LandmarksTest(gridNetwork.DictionariesTestCase):
+
+    def setUp(self):
+        gridNetwork.DictionariesTestCase.setUp(self)
+        self.setConstant('SUMO_LANDMARKS_FILE', self.getPath("suburbsLandmarksDictionary"))
+        self.setConstant('LANDMARKS_NUMBER', LANDMARKS_NUMBER)
+        self.graphDict = getSuburbsNetwork()
+        self.routingGraph = RoutingGraph(self.graphDict)
+        self.landmarks, self.fromTables, self.toTables = landmarks.buildLandmarks(self.routingGraph, LANDMARKS_NUMBER)
+        self.routingGraph.landmarks = Landmarks(self.landmarks, self.fromTables, self.toTables)
+
+    def testFarthestPointSelection(self):
+        # Each landmark maximizes its round trip distance to the closest vertex among the previous landmarks (the vertex 0 for the first one)
+        graph = self.routingGraph
+        fromDistances = dict((edgeId, gridNetwork.getReferenceDistances(self.graphDict, edgeId)) for edgeId in self.graphDict)
+
+        def getRoundTrip(edgeId, otherEdgeId):
+            return fromDistances[edgeId].get(otherEdgeId, INFINITY) + fromDistances[otherEdgeId].get(edgeId, INFINITY)
+
+        for i, landmark in enumerate(self.landmarks):
+            previous = [graph.getEdgeId(v) for v in self.landmarks[0:i]] or [graph.getEdgeId(0)]
+            roundTrips = dict((edgeId, min(getRoundTrip(edgeId, other) for other in previous)) for edgeId in self.graphDict)
+            self.assertAlmostEqual(roundTrips[graph.getEdgeId(landmark)], max(roundTrip for roundTrip in roundTrips.itervalues() if roundTrip != INFINITY))
+
+        # The first landmarks are at the end of the arms, one per arm
+        self.assertEqual(set(getArm(graph.getEdgeId(landmark)) for landmark in self.landmarks[0:len(ARMS_LENGTH)]),
+                         set("arm{}".format(arm) for arm in xrange(len(ARMS_LENGTH))))
+
+    def testLowerBounds(self):
+        # The distances are not symmetric (one-way loops), the lower bounds remain valid both ways
+        graph = self.routingGraph
+        for start in self.graphDict:
+            reference = gridNetwork.getReferenceDistances(self.graphDict, start)
+            for end in self.graphDict:
+                if end in reference:
+                    self.assertTrue(graph.landmarks.getLowerBound(graph.getIndex(start), graph.getIndex(end)) <= reference[end])
+        self.assertEqual(graph.landmarks.getLowerBound(graph.getIndex("h0_0"), graph.getIndex("isolated")), INFINITY)
+
+        # Between the ends of two arms, the bound is close to the distance
+        start = graph.getIndex("arm0loop0")
+        end = graph.getIndex("arm1loop0")
+        distance = gridNetwork.getReferenceDistances(self.graphDict, "arm0loop0")["arm1loop0"]
+        self.assertTrue(graph.landmarks.getLowerBound(start, end) >= 0.9 * distance)
+
+    def testShortestPathLengths(self):
+        graph = self.routingGraph
+        for start in self.graphDict:
+            reference = gridNetwork.getReferenceDistances(self.graphDict, start)
+            for end in self.graphDict:
+                if end not in reference:
+                    self.assertRaises(ValueError, landmarks.shortestPath, graph, graph.getIndex(start), graph.getIndex(end))
+                    continue
+                path = [graph.getEdgeId(v) for v in landmarks.shortestPath(graph, graph.getIndex(start), graph.getIndex(end))]
+                self.assertEqual(path[0], start)
+                self.assertEqual(path[-1], end)
+                self.assertAlmostEqual(gridNetwork.getPathLength(self.graphDict, path), reference[end])
+
+    def testExportImport(self):
+        landmarks.exportLandmarks(self.landmarks, self.fromTables, self.toTables)
+        self.assertEqual(landmarks.importLandmarks(), (self.landmarks, self.fromTables, self.toTables))
+        self.assertFalse(isDictionaryOutOfDate(constants.SUMO_LANDMARKS_FILE, self.networkFile, (LANDMARKS_NUMBER,)))
+
+    def testOutOfDate(self):
+        # The landmarks dictionary is rebuilt for another network, landmarks number or dictionaries format
+        landmarks.exportLandmarks(self.landmarks, self.fromTables, self.toTables)
+        self.assertTrue(isDictionaryOutOfDate(constants.SUMO_LANDMARKS_FILE, self.networkFile, (LANDMARKS_NUMBER + 1,)))
+        self.setConstant('DICTIONARY_FORMAT_VERSION', constants.DICTIONARY_FORMAT_VERSION + 1)
+        self.assertTrue(isDictionaryOutOfDate(constants.SUMO_LANDMARKS_FILE, self.networkFile, (LANDMARKS_NUMBER,)))
+        self.assertRaises(ValueError, landmarks.importLandmarks)
+
+    def testNetworkChanged(self):
+        landmarks.exportLandmarks(self.landmarks, self.fromTables, self.toTables)
+        self.writeNetworkFile("<net version=\"1\"/>")
+        self.assertTrue(isDictionaryOutOfDate(constants.SUMO_LANDMARKS_FILE, self.networkFile, (LANDMARKS_NUMBER,)))
+
+    def testUnreachable(self):
+        graph = RoutingGraph({'a': {'b': 1.0}, 'b': {'a': 1.0}, 'c': {'a': 2.0}})
+        graph.landmarks = Landmarks(*landmarks.buildLandmarks(graph, 2))
+        self.assertEqual(graph.landmarks.getLowerBound(graph.getIndex('a'), graph.getIndex('c')), INFINITY)
+        self.assertRaises(ValueError, landmarks.shortestPath, graph, graph.getIndex('a'), graph.getIndex('c'))
+
+
+if __name__ == '__main__':
+    unittest.main()
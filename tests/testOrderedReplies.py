@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+"""
+@file    testOrderedReplies.py
+@author  ASTra team
+@date    16/10/2026
+
+Regression tests of the router replies order (See orderedReplies.py)
+"""
+
+import unittest
+import gridNetwork  # Adds the ASTra directory to the modules path
+from orderedReplies import OrderedReplies
+
+
+class SentMessages(object):
+    """
+    Output socket recording the sent messages
+    """
+    def __init__(self):
+        self.messages = []
+
+    def send(self, data):
+        self.messages.append(data)
+
+
+class OrderedRepliesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.outputSocket = SentMessages()
+        self.replies = OrderedReplies(self.outputSocket)
+
+    def testRequestOrder(self):
+        # The first request is answered last (e.g. by a Duarouter worker)
+        first = self.replies.reserve()
+        second = self.replies.reserve()
+        third = self.replies.reserve()
+        second.send("ROU 2")
+        second.close()
+        third.send("ERR 3")
+        self.assertEqual(self.outputSocket.messages, [])
+
+        first.send("ROU 1a")
+        self.assertEqual(self.outputSocket.messages, ["ROU 1a"])
+        first.send("ROU 1b")
+        first.close()
+        self.assertEqual(self.outputSocket.messages, ["ROU 1a", "ROU 1b", "ROU 2", "ERR 3"])
+
+        # The messages of the first reply not closed are sent at once
+        third.send("ERR 3b")
+        self.assertEqual(self.outputSocket.messages[-1], "ERR 3b")
+        third.close()
+        self.assertEqual(len(self.replies.pending), 0)
+
+    def testEmptyReply(self):
+        first = self.replies.reserve()
+        second = self.replies.reserve()
+        second.send("ACK")
+        first.close()
+        self.assertEqual(self.outputSocket.messages, ["ACK"])
+
+    def testTaggedReply(self):
+        # A tagged reply (e.g. a DUA request) is neither held back by the previous replies nor holds back the next ones
+        first = self.replies.reserve()
+        tagged = self.replies.reserve("42")
+        third = self.replies.reserve()
+        tagged.send("ROU 2")
+        self.assertEqual(self.outputSocket.messages, ["TAG 42 ROU 2"])
+
+        first.send("ROU 1")
+        first.close()
+        third.send("ROU 3")
+        third.close()
+        self.assertEqual(self.outputSocket.messages, ["TAG 42 ROU 2", "ROU 1", "ROU 3"])
+        tagged.close()
+        self.assertEqual(len(self.replies.pending), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+
+"""
+@file    testProjection.py
+@author  ASTra team
+@date    16/10/2026
+
+Regression tests of the network projection (See projection.py) against reference UTM coordinates
+"""
+
+import unittest
+import gridNetwork
+from projection import Projection
+from projection import readProjection
+
+""" (lon, lat) and their (easting, northing) in the UTM zone 31 """
+UTM_ZONE_31_POINTS = (
+    ((3.0, 0.0), (500000.0, 0.0)),
+    ((0.0, 0.0), (166021.443, 0.0)),
+    ((3.0, 45.0), (500000.0, 4982950.400)),
+)
+NET_OFFSET = (-450000.0, -5000000.0)
+
+
+class ProjectionTest(gridNetwork.DictionariesTestCase):
+
+    def setUp(self):
+        gridNetwork.DictionariesTestCase.setUp(self)
+        self.projection = Projection("{},{}".format(*NET_OFFSET), "+proj=utm +zone=31 +ellps=WGS84 +datum=WGS84 +units=m +no_defs")
+
+    def testReferencePoints(self):
+        for (lon, lat), (easting, northing) in UTM_ZONE_31_POINTS:
+            x, y = self.projection.convertXY(lon, lat)
+            self.assertAlmostEqual(x - NET_OFFSET[0], easting, places=3)
+            self.assertAlmostEqual(y - NET_OFFSET[1], northing, places=3)
+            geo = self.projection.convertGeo(easting + NET_OFFSET[0], northing + NET_OFFSET[1])
+            self.assertAlmostEqual(geo[0], lon, places=8)
+            self.assertAlmostEqual(geo[1], lat, places=8)
+
+    def testSouthernHemisphere(self):
+        projection = Projection("0.00,0.00", "+proj=utm +zone=31 +south +ellps=WGS84")
+        x, y = projection.convertXY(3.0, -45.0)
+        self.assertAlmostEqual(x, 500000.0, places=3)
+        self.assertAlmostEqual(y, 10000000.0 - 4982950.400, places=3)
+        lon, lat = projection.convertGeo(x, y)
+        self.assertAlmostEqual(lon, 3.0, places=8)
+        self.assertAlmostEqual(lat, -45.0, places=8)
+
+    def testRoundTrip(self):
+        # Sub-millimetre round trips inside the zone
+        for lon in (0.5, 2.0, 3.0, 4.5, 5.5):
+            for lat in (-60.0, -10.0, 0.0, 35.5, 53.35, 70.0):
+                projection = self.projection if lat >= 0 else Projection("0,0", "+proj=utm +zone=31 +south")
+                x, y = projection.convertXY(lon, lat)
+                backX, backY = projection.convertXY(*projection.convertGeo(x, y))
+                self.assertAlmostEqual(backX, x, places=3)
+                self.assertAlmostEqual(backY, y, places=3)
+
+    def testArrays(self):
+        # The batch conversions give the same coordinates as the single ones
+        lons = [0.5, 2.0, 3.0, 4.5]
+        lats = [10.0, 35.5, 53.35, 60.0]
+        xs, ys = self.projection.convertXYArrays(lons, lats)
+        for i in xrange(len(lons)):
+            x, y = self.projection.convertXY(lons[i], lats[i])
+            self.assertAlmostEqual(xs[i], x, places=6)
+            self.assertAlmostEqual(ys[i], y, places=6)
+        backLons, backLats = self.projection.convertGeoArrays(xs, ys)
+        for i in xrange(len(lons)):
+            self.assertAlmostEqual(backLons[i], lons[i], places=8)
+            self.assertAlmostEqual(backLats[i], lats[i], places=8)
+        self.assertEqual(self.projection.convertGeoArrays([], []), ([], []))
+
+    def testNoProjection(self):
+        projection = Projection("10.0,20.0", "!")
+        self.assertTrue(projection.isSupported())
+        self.assertEqual(projection.convertGeo(15.0, 27.0), (5.0, 7.0))
+        self.assertEqual(projection.convertXY(5.0, 7.0), (15.0, 27.0))
+
+    def testUnsupportedProjection(self):
+        self.assertFalse(Projection("0,0", "+proj=lcc +lat_1=45 +lat_2=50").isSupported())
+        self.assertFalse(Projection("0,0", "+proj=utm +zone=31 +ellps=intl").isSupported())
+
+    def testReadProjection(self):
+        self.writeNetworkFile('<net><location netOffset="-450000.00,-5000000.00" convBoundary="0,0,1,1" origBoundary="0,0,1,1" '
+                              'projParameter="+proj=utm +zone=31 +ellps=WGS84"/><edge id="e"/></net>')
+        projection = readProjection(self.networkFile)
+        self.assertTrue(projection.isSupported())
+        self.assertEqual((projection.xOffset, projection.yOffset), NET_OFFSET)
+        self.assertEqual(projection.zone, 31)
+
+        self.writeNetworkFile('<net><edge id="e"/></net>')
+        self.assertEqual(readProjection(self.networkFile), None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+
+"""
+@file    testRandomRoutes.py
+@author  ASTra team
+@date    16/10/2026
+
+Regression tests of the strongly connected components and of the random routes (See randomRoutes.py),
+over random graphs and a district network whose one-way streets and dead ends are out of its largest component (See getDistrictNetwork)
+"""
+
+import unittest
+import gridNetwork
+from array import array
+from random import Random
+from binaryDictionary import MappedGraph
+from idRegistry import IdRegistry
+from randomRoutes import getLargestStronglyConnectedComponent
+from randomRoutes import RandomRoutes
+from routingGraph import RoutingGraph
+
+DISTRICT_SIZE = 3
+""" Streets of the district out of its largest strongly connected component, and the streets of a smaller one-way ring """
+OUT_OF_COMPONENT_EDGES = ("entrance", "exit", "deadEnd", "-deadEnd", "ring0", "ring1", "ring2")
+
+
+def getDistrictNetwork():
+    """
+    Returns the graph dictionary of a district: a two-way grid entered by a one-way street from nowhere, left by a one-way street
+    to nowhere, with a two-way dead end street and a one-way detour leaving and joining the grid, and a one-way ring out of reach
+    """
+    streets = []
+    for x in xrange(DISTRICT_SIZE):
+        for y in xrange(DISTRICT_SIZE):
+            if x + 1 < DISTRICT_SIZE:
+                streets.append(("h{}_{}".format(x, y), gridNetwork.getJunctionId(x, y), gridNetwork.getJunctionId(x + 1, y), 100.0, True))
+            if y + 1 < DISTRICT_SIZE:
+                streets.append(("v{}_{}".format(x, y), gridNetwork.getJunctionId(x, y), gridNetwork.getJunctionId(x, y + 1), 100.0, True))
+
+    last = DISTRICT_SIZE - 1
+    streets.append(("entrance", "jSource", gridNetwork.getJunctionId(0, 0), 100.0, False))
+    streets.append(("exit", gridNetwork.getJunctionId(last, last), "jSink", 100.0, False))
+    streets.append(("deadEnd", gridNetwork.getJunctionId(1, 1), "jDeadEnd", 50.0, True))
+    streets.append(("detourOut", gridNetwork.getJunctionId(last, 0), "jDetour", 70.0, False))
+    streets.append(("detourIn", "jDetour", gridNetwork.getJunctionId(last, 1), 70.0, False))
+    for k in xrange(3):
+        streets.append(("ring{}".format(k), "jRing{}".format(k), "jRing{}".format((k + 1) % 3), 40.0, False))
+    return gridNetwork.getStreetsNetwork(streets)
+
+
+def getSuccessorsArrays(successors):
+    """
+    Returns the offsets and targets arrays of a graph given as a list of successors lists
+    """
+    offsets = array('i', [0])
+    targets = array('i')
+    for vertexSuccessors in successors:
+        targets.extend(vertexSuccessors)
+        offsets.append(len(targets))
+    return offsets, targets
+
+
+def getReachable(successors, start):
+    """
+    Returns the set of vertices reachable from the start vertex, the start vertex included
+    """
+    reachable = set([start])
+    stack = [start]
+    while stack:
+        for w in successors[stack.pop()]:
+            if w not in reachable:
+                reachable.add(w)
+                stack.append(w)
+    return reachable
+
+
+def getMappedGraph(graphDict):
+    """
+    Returns a graph dictionary as a binary graph (See binaryDictionary.py), without writing it
+    """
+    routingGraph = RoutingGraph(graphDict)
+    registry = IdRegistry(routingGraph.edgeIds, [], array('i'))
+    return MappedGraph(registry, routingGraph.offsets, routingGraph.targets, routingGraph.weights)
+
+
+class StronglyConnectedComponentTest(unittest.TestCase):
+
+    def testRandomGraphs(self):
+        # The largest component is checked against the mutual reachability of the vertices
+        generator = Random(0)
+        for i in xrange(50):
+            verticesNumber = generator.randint(1, 30)
+            successors = [[generator.randrange(verticesNumber) for j in xrange(generator.randint(0, 3))] for v in xrange(verticesNumber)]
+            reachable = [getReachable(successors, v) for v in xrange(verticesNumber)]
+            components = set(frozenset(w for w in reachable[v] if v in reachable[w]) for v in xrange(verticesNumber))
+            largest = max(len(component) for component in components)
+
+            component = getLargestStronglyConnectedComponent(*getSuccessorsArrays(successors))
+            self.assertEqual(len(component), largest)
+            self.assertTrue(frozenset(component) in components)
+
+    def testLongPath(self):
+        # The iterative algorithm does not reach the recursion limit
+        verticesNumber = 5000
+        successors = [[(v + 1) % verticesNumber] for v in xrange(verticesNumber)]
+        self.assertEqual(len(getLargestStronglyConnectedComponent(*getSuccessorsArrays(successors))), verticesNumber)
+
+
+class RandomRoutesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.graphDict = getDistrictNetwork()
+        self.randomRoutes = RandomRoutes(getMappedGraph(self.graphDict))
+
+    def testComponent(self):
+        # The one-way detour is in the component, unlike the streets only driven one way and the smaller ring
+        component = set(self.randomRoutes.edgeIds[v] for v in self.randomRoutes.component)
+        self.assertEqual(component, set(self.graphDict).difference(OUT_OF_COMPONENT_EDGES))
+        self.assertTrue("detourOut" in component and "detourIn" in component)
+
+    def testRoutes(self):
+        routes = list(self.randomRoutes.getRoutes(100, 10, 0))
+        self.assertEqual(len(routes), 100)
+        for route in routes:
+            self.assertEqual(len(route), 11)
+            self.assertFalse(set(OUT_OF_COMPONENT_EDGES).intersection(route))
+            for i in xrange(len(route) - 1):
+                self.assertTrue(route[i + 1] in self.graphDict[route[i]])
+
+    def testSeed(self):
+        self.assertEqual(list(self.randomRoutes.getRoutes(20, 10, 1)), list(self.randomRoutes.getRoutes(20, 10, 1)))
+        self.assertNotEqual(list(self.randomRoutes.getRoutes(20, 10, 1)), list(self.randomRoutes.getRoutes(20, 10, 2)))
+
+    def testSingleEdgeComponent(self):
+        randomRoutes = RandomRoutes(getMappedGraph({'a': {'b': 1.0}, 'b': dict()}))
+        self.assertRaises(ValueError, list, randomRoutes.getRoutes(1, 5, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+"""
+@file    testSpatialIndex.py
+@author  ASTra team
+@date    16/10/2026
+
+Regression tests of the spatial index over the lanes shapes of the synthetic grid (See gridNetwork.py),
+checked against a brute force nearest edge search
+"""
+
+import unittest
+import gridNetwork
+import constants
+from random import Random
+from spatialIndex import buildSpatialIndex
+from spatialIndex import getSquaredDistanceToSegment
+
+""" Cell sizes smaller than, equal to and larger than the grid spacing """
+CELL_SIZES = (30.0, gridNetwork.GRID_SPACING, 1000.0)
+POINTS_NUMBER = 500
+
+
+def getEdgeDistance(edgesShapes, edgeId, x, y):
+    """
+    Returns the squared distance between a point and the lanes shapes of an edge
+    """
+    return min(getSquaredDistanceToSegment(x, y, shape[i][0], shape[i][1], shape[i + 1][0], shape[i + 1][1])
+               for shape in edgesShapes[edgeId] for i in xrange(len(shape) - 1))
+
+
+class SpatialIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.edgesShapes = gridNetwork.getGridNetwork()[3]
+        self.edgeIds = sorted(self.edgesShapes)
+        self.cellSize = constants.SPATIAL_INDEX_CELL_SIZE
+
+    def tearDown(self):
+        constants.SPATIAL_INDEX_CELL_SIZE = self.cellSize
+
+    def testSquaredDistanceToSegment(self):
+        self.assertAlmostEqual(getSquaredDistanceToSegment(5.0, 3.0, 0.0, 0.0, 10.0, 0.0), 9.0)
+        self.assertAlmostEqual(getSquaredDistanceToSegment(-3.0, 4.0, 0.0, 0.0, 10.0, 0.0), 25.0)
+        self.assertAlmostEqual(getSquaredDistanceToSegment(1.0, 1.0, 0.0, 0.0, 0.0, 0.0), 2.0)
+
+    def testNearestEdge(self):
+        generator = Random(0)
+        extent = (gridNetwork.GRID_SIZE - 1) * gridNetwork.GRID_SPACING
+        points = [(generator.uniform(-200.0, extent + 200.0), generator.uniform(-200.0, extent + 200.0)) for i in xrange(POINTS_NUMBER)]
+
+        for cellSize in CELL_SIZES:
+            constants.SPATIAL_INDEX_CELL_SIZE = cellSize
+            spatialIndex = buildSpatialIndex(self.edgeIds, self.edgesShapes)
+            for (x, y), edgeId in zip(points, spatialIndex.getNearestEdges(points)):
+                nearestDistance = min(getEdgeDistance(self.edgesShapes, candidate, x, y) for candidate in self.edgeIds)
+                self.assertAlmostEqual(getEdgeDistance(self.edgesShapes, edgeId, x, y), nearestDistance)
+
+    def testLaneSide(self):
+        # A point on the right of the junctions line is on the lane of the edge driving this way
+        spatialIndex = buildSpatialIndex(self.edgeIds, self.edgesShapes)
+        junctionFrom = gridNetwork.getJunctionId(0, 0)
+        junctionTo = gridNetwork.getJunctionId(1, 0)
+        edgeId = "{}_{}".format(junctionFrom, junctionTo)
+        self.assertEqual(spatialIndex.getNearestEdge(50.0, -1.0), edgeId)
+        self.assertEqual(spatialIndex.getNearestEdge(50.0, 1.0), '-' + edgeId)
+
+    def testEmptyIndex(self):
+        self.assertEqual(buildSpatialIndex([], dict()).getNearestEdge(0.0, 0.0), None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+
+"""
+@file    testVehicleRegistry.py
+@author  ASTra team
+@date    16/10/2026
+
+Regression tests of the vehicles registry (See vehicleRegistry.py)
+"""
+
+import unittest
+import gridNetwork  # Adds the ASTra directory to the modules path
+from threading import Thread
+from vehicleRegistry import VehicleRegistry
+
+
+class VehicleRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = VehicleRegistry()
+
+    def testAddRemove(self):
+        self.assertTrue(self.registry.add("v1", False, "v10"))
+        self.assertTrue(self.registry.add("v2", True, "v21"))
+        self.assertTrue(self.registry.add("v3"))
+        self.assertEqual(len(self.registry), 3)
+        self.assertTrue("v2" in self.registry)
+        self.assertEqual(self.registry.get("v1").routeId, "v10")
+        self.assertEqual(self.registry.get("v3").routeId, None)
+        self.assertEqual(self.registry.get("unknown"), None)
+
+        record = self.registry.remove("v2")
+        self.assertTrue(record.priority)
+        self.assertEqual(self.registry.remove("v2"), None)
+        self.assertFalse("v2" in self.registry)
+        self.assertEqual(self.registry.getPriorityVehicles(), ())
+
+    def testInsertionOrder(self):
+        for vehicleId in ("c", "a", "b"):
+            self.registry.add(vehicleId, vehicleId != "a")
+        self.assertEqual(self.registry.getVehicles(), ("c", "a", "b"))
+        self.assertEqual(self.registry.getPriorityVehicles(), ("c", "b"))
+
+    def testPriorityChange(self):
+        self.registry.add("v1", True)
+        self.registry.add("v1", False)
+        self.assertEqual(self.registry.getPriorityVehicles(), ())
+        self.assertFalse(self.registry.get("v1").priority)
+
+    def testIgnoredVehicles(self):
+        # The ignored vehicles (See constants) are never registered
+        self.assertFalse(self.registry.add("MOC", True))
+        self.assertEqual(len(self.registry), 0)
+        self.assertEqual(self.registry.getPriorityVehicles(), ())
+
+    def testSnapshots(self):
+        self.registry.add("v1", True)
+        vehicles = self.registry.getVehicles()
+        priorityVehicles = self.registry.getPriorityVehicles()
+
+        # A snapshot is shared until the registry changes, and never modified
+        self.assertTrue(self.registry.getVehicles() is vehicles)
+        self.assertTrue(self.registry.getPriorityVehicles() is priorityVehicles)
+        self.registry.add("v2")
+        self.assertEqual(vehicles, ("v1",))
+        self.assertEqual(self.registry.getVehicles(), ("v1", "v2"))
+        self.assertTrue(self.registry.getPriorityVehicles() is priorityVehicles)
+
+    def testConcurrentAccess(self):
+        def addRemove(prefix):
+            for i in xrange(1000):
+                self.registry.add(prefix + str(i), i % 2 == 0)
+                self.registry.getVehicles()
+                if i % 3 == 0:
+                    self.registry.remove(prefix + str(i))
+
+        threads = [Thread(target=addRemove, args=("t{}_".format(t),)) for t in xrange(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        expected = set("t{}_{}".format(t, i) for t in xrange(4) for i in xrange(1000) if i % 3 != 0)
+        self.assertEqual(set(self.registry.getVehicles()), expected)
+        self.assertEqual(set(self.registry.getPriorityVehicles()), set(vehicleId for vehicleId in expected if int(vehicleId.split('_')[1]) % 2 == 0))
+
+
+if __name__ == '__main__':
+    unittest.main()